@@ -5,7 +5,7 @@ a = Analysis(
     ['src/paprwall/gui/wallpaper_manager_gui.py'],
     pathex=[],
     binaries=[],
-    datas=[('README.md', '.'), ('LICENSE', '.')],
+    datas=[('README.md', '.'), ('LICENSE', '.'), ('src/paprwall/data/quotes.json', 'paprwall/data')],
     hiddenimports=['PIL', 'PIL.Image', 'PIL.ImageDraw', 'PIL.ImageFont', 'PIL.ImageTk', 'requests', 'tkinter', 'tkinter.ttk', 'tkinter.filedialog', 'tkinter.messagebox', 'paprwall', 'paprwall.core', 'paprwall.gui', 'paprwall.gui.wallpaper_manager_gui', 'paprwall.cli', 'paprwall.installer'],
     hookspath=[],
     hooksconfig={},
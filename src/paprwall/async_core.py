@@ -0,0 +1,188 @@
+"""
+Asyncio API over WallpaperCore.
+
+AsyncWallpaperCore exposes awaitable fetch, render and set operations so an
+embedding application or a daemon can drive many of them from one event
+loop. The blocking work runs in an executor; every coroutine accepts a
+timeout and can be cancelled. Cancelling a download also aborts the
+transfer itself, not just the await.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, TypeVar
+
+from . import http_client
+from .core import WallpaperCore
+
+T = TypeVar("T")
+
+# Default time limit (seconds) for a single operation; None disables it
+DEFAULT_TIMEOUT: Optional[float] = 120.0
+
+
+class Applied(NamedTuple):
+    """Outcome of setting a wallpaper."""
+
+    path: str
+    quote: Dict[str, str]
+    success: bool
+
+
+class AsyncWallpaperCore:
+    """Awaitable wallpaper operations backed by a WallpaperCore."""
+
+    def __init__(
+        self,
+        core: Optional[WallpaperCore] = None,
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Wrap *core* (a new WallpaperCore by default).
+
+        Blocking calls run in *executor*, or the event loop's default
+        executor when None. *timeout* is the default per-operation limit.
+        """
+        self.core = core if core is not None else WallpaperCore()
+        self.executor = executor
+        self.timeout = timeout
+
+    async def _call(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run a blocking call in the executor with a timeout."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+        limit = timeout if timeout is not None else self.timeout
+        return await asyncio.wait_for(future, limit)
+
+    # ----- Single operations -----
+
+    async def get_quote(
+        self, category: str = "motivational", timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """Fetch a quote for *category*."""
+        return await self._call(self.core.get_quote, category, timeout=timeout)
+
+    async def download_image(
+        self,
+        url: Optional[str] = None,
+        directory: Optional[Path] = None,
+        progress: Optional[http_client.ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """Download an image and return its path, or None on failure.
+
+        On cancellation or timeout the transfer is aborted as well.
+        """
+        cancel = threading.Event()
+        try:
+            return await self._call(
+                self.core.download_image,
+                url,
+                progress=progress,
+                directory=directory,
+                cancel_event=cancel,
+                timeout=timeout,
+            )
+        except BaseException:
+            cancel.set()
+            raise
+
+    async def render(
+        self,
+        image_path: str,
+        quote_data: Dict[str, str],
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Render *quote_data* onto *image_path* and return the output path."""
+        return await self._call(
+            self.core.add_quote_to_image, image_path, quote_data, timeout=timeout
+        )
+
+    async def apply(
+        self,
+        image_path: str,
+        quote_data: Dict[str, str],
+        timeout: Optional[float] = None,
+    ) -> Applied:
+        """Set *image_path* as the wallpaper and record it in the history."""
+        success = await self._call(
+            self.core.set_wallpaper, image_path, timeout=timeout
+        )
+        if success:
+            await self._call(
+                self.core.save_to_history, image_path, quote_data, timeout=timeout
+            )
+        return Applied(image_path, quote_data, bool(success))
+
+    # ----- Composite operations -----
+
+    async def fetch(
+        self,
+        category: str = "motivational",
+        add_quote: bool = True,
+        directory: Optional[Path] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Optional[str], Dict[str, str]]:
+        """Download an image and fetch a quote concurrently.
+
+        Returns ``(image_path, quote_data)``; the quote is empty when
+        *add_quote* is False and the path is None if the download failed.
+        """
+        quote_data = {"text": "", "author": ""}
+        if not add_quote:
+            image_path = await self.download_image(
+                directory=directory, timeout=timeout
+            )
+            return image_path, quote_data
+
+        image_path, quote_data = await asyncio.gather(
+            self.download_image(directory=directory, timeout=timeout),
+            self.get_quote(category, timeout=timeout),
+        )
+        return image_path, quote_data
+
+    async def fetch_and_set(
+        self,
+        category: str = "motivational",
+        add_quote: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Optional[Applied]:
+        """Fetch, render and set a new wallpaper.
+
+        Returns None if no image could be downloaded.
+        """
+        image_path, quote_data = await self.fetch(
+            category, add_quote, timeout=timeout
+        )
+        if not image_path:
+            return None
+        final_path = image_path
+        if add_quote:
+            final_path = await self.render(image_path, quote_data, timeout=timeout)
+        return await self.apply(final_path, quote_data, timeout=timeout)
+
+    async def set_from_file(
+        self,
+        file_path: str,
+        add_quote: bool = True,
+        category: str = "motivational",
+        timeout: Optional[float] = None,
+    ) -> Applied:
+        """Render a quote onto a local image and set it as the wallpaper."""
+        final_path = file_path
+        quote_data = {"text": "", "author": ""}
+        if add_quote:
+            quote_data = await self.get_quote(category, timeout=timeout)
+            final_path = await self.render(file_path, quote_data, timeout=timeout)
+        return await self.apply(final_path, quote_data, timeout=timeout)
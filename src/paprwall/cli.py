@@ -14,7 +14,13 @@ from .installer import install_system, uninstall_system  # noqa: F401
 from .core import (
     set_wallpaper_from_file,
     fetch_and_set_wallpaper,
+    prefetch_wallpapers,
+    import_quotes,
+    set_quote_source,
 )  # noqa: F401
+from .imaging import configure_limits
+from .prefetch import REFILL_POLICIES
+from .quote_store import QUOTE_SOURCES
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -55,12 +61,43 @@ def create_parser() -> argparse.ArgumentParser:
         help="Set wallpaper from local file path"
     )
 
-    parser.add_argument(
+    # --prefetch only fills the spool; it cannot also set a wallpaper
+    fetch_mode = parser.add_mutually_exclusive_group()
+
+    fetch_mode.add_argument(
         "--fetch",
         action="store_true",
         help="Fetch and set a random wallpaper"
     )
 
+    fetch_mode.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Fill the prefetch spool with ready-to-apply wallpapers "
+        "(later --fetch calls pop from it)"
+    )
+
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        metavar="N",
+        help="Number of wallpapers to keep prefetched (0 disables)"
+    )
+
+    parser.add_argument(
+        "--prefetch-max-mb",
+        type=int,
+        metavar="MB",
+        help="Maximum disk space used by the prefetch spool"
+    )
+
+    parser.add_argument(
+        "--prefetch-policy",
+        choices=REFILL_POLICIES,
+        help="When to refill the spool: eager (after every fetch), "
+        "low-water (when nearly empty) or off"
+    )
+
     parser.add_argument(
         "--category",
         choices=["motivational", "mathematics", "science", "famous", "technology", "philosophy"],
@@ -68,6 +105,36 @@ def create_parser() -> argparse.ArgumentParser:
         help="Quote category for wallpaper (default: motivational)"
     )
 
+    parser.add_argument(
+        "--import-quotes",
+        metavar="FILE",
+        help="Import a CSV or JSON quote collection into the local quote store "
+        "(rows without a category use --category)"
+    )
+
+    parser.add_argument(
+        "--quote-source",
+        choices=QUOTE_SOURCES,
+        help="Where quotes come from: auto (buffered online quotes when ready, "
+        "else the local store), local (never the network) or online (network "
+        "first)"
+    )
+
+    parser.add_argument(
+        "--max-image-mp",
+        type=int,
+        metavar="MP",
+        help="Reject images larger than this many megapixels"
+    )
+
+    parser.add_argument(
+        "--max-decode-mb",
+        type=int,
+        metavar="MB",
+        help="Maximum memory a decoded image may use (larger JPEGs are "
+        "decoded at reduced scale, others rejected)"
+    )
+
     parser.add_argument(
         "--no-quote",
         action="store_true",
@@ -94,6 +161,21 @@ def main(args: Optional[list] = None) -> int:
     parser = create_parser()
     parsed_args = parser.parse_args(args)
 
+    # The spool settings imply --prefetch, which cannot also set a wallpaper
+    prefetch_tuning = any(
+        value is not None
+        for value in (
+            parsed_args.prefetch_depth,
+            parsed_args.prefetch_max_mb,
+            parsed_args.prefetch_policy,
+        )
+    )
+    if parsed_args.fetch and prefetch_tuning:
+        parser.error(
+            "--prefetch-depth, --prefetch-max-mb and --prefetch-policy "
+            "imply --prefetch and cannot be combined with --fetch"
+        )
+
     try:
         # Handle installation/uninstallation
         if parsed_args.install:
@@ -102,6 +184,28 @@ def main(args: Optional[list] = None) -> int:
         if parsed_args.uninstall:
             return uninstall_system()
 
+        # Handle quote store management
+        if parsed_args.import_quotes:
+            return import_quotes(
+                parsed_args.import_quotes, category=parsed_args.category
+            )
+
+        if parsed_args.quote_source:
+            result = set_quote_source(parsed_args.quote_source)
+            # The setting is saved; carry on only if a wallpaper was requested
+            if result != 0 or not (
+                parsed_args.set_wallpaper or parsed_args.fetch or parsed_args.prefetch
+            ):
+                return result
+
+        # Image memory budget for this run
+        if parsed_args.max_image_mp or parsed_args.max_decode_mb:
+            configure_limits(
+                max_pixels=(parsed_args.max_image_mp or 0) * 1_000_000 or None,
+                max_decoded_bytes=(parsed_args.max_decode_mb or 0) * 1024 * 1024
+                or None,
+            )
+
         # Handle wallpaper operations
         if parsed_args.set_wallpaper:
             return set_wallpaper_from_file(
@@ -110,6 +214,15 @@ def main(args: Optional[list] = None) -> int:
                 category=parsed_args.category,
             )
 
+        if parsed_args.prefetch or prefetch_tuning:
+            return prefetch_wallpapers(
+                category=parsed_args.category,
+                add_quote=not parsed_args.no_quote,
+                depth=parsed_args.prefetch_depth,
+                max_mb=parsed_args.prefetch_max_mb,
+                policy=parsed_args.prefetch_policy,
+            )
+
         if parsed_args.fetch:
             return fetch_and_set_wallpaper(
                 category=parsed_args.category,
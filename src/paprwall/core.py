@@ -5,25 +5,50 @@ This module provides the backend functionality that can be used by both CLI and
 
 import os
 import sys
-import json
 import platform
 import subprocess
-import requests
-import random
+import threading
 import time
-from datetime import datetime
+import asyncio
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple, Union
-from PIL import Image, ImageDraw, ImageFont
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple, Union, Callable
+from PIL import ImageFont
 
 from . import DATA_DIR, IMAGES_DIR, CONFIG_DIR
+from . import display, http_client, imaging, layout, render
+from .history import HistoryStore
+from .prefetch import PrefetchQueue
+from .quote_buffer import QuoteBuffer
+from .quote_store import DEFAULT_CATEGORY, QuoteStore
+from .sources import SourceHealth
+
+if TYPE_CHECKING:
+    from .async_core import Applied
+
+# Spool of pre-rendered wallpapers used by --prefetch / --fetch
+SPOOL_DIR = DATA_DIR / "spool"
+# Provider success rates, latencies and circuit breaker state
+HEALTH_FILE = DATA_DIR / "source_health.json"
+# Local quote corpus (bundled quotes plus user imports)
+QUOTES_DB = DATA_DIR / "quotes.db"
+# Quotes fetched in bulk and not used yet, per category
+QUOTE_BUFFER_FILE = DATA_DIR / "quote_buffer.json"
+QUOTE_BATCH_SIZE = 50
 
 
 class WallpaperCore:
     """Core wallpaper management functionality."""
 
-    def __init__(self) -> None:
-        """Initialize the wallpaper core."""
+    def __init__(
+        self,
+        health: Optional[SourceHealth] = None,
+        quotes: Optional[QuoteStore] = None,
+    ) -> None:
+        """Initialize the wallpaper core.
+
+        *health* tracks provider reliability and *quotes* is the local quote
+        corpus; by default both are kept in the data directory.
+        """
         self.quote_categories = {
             "motivational": "motivational",
             "mathematics": "mathematics",
@@ -33,73 +58,192 @@ class WallpaperCore:
             "philosophy": "philosophy",
         }
 
+        # Bulk endpoints; quotes are buffered per category (see quote_buffer)
         self.quote_apis = [
-            "https://api.quotable.io/random",
-            "https://zenquotes.io/api/random",
+            "https://api.quotable.io/quotes/random",
+            "https://zenquotes.io/api/quotes",
         ]
 
+        # In order of preference; reordered by observed provider health.
+        # {width}/{height} are filled with the detected screen resolution.
         self.image_sources = [
-            "https://picsum.photos/1920/1080",
-            "https://source.unsplash.com/1920x1080/nature",
+            "https://picsum.photos/{width}/{height}",
+            "https://source.unsplash.com/{width}x{height}/nature",
         ]
 
+        self.health = health if health is not None else SourceHealth(HEALTH_FILE)
+        self.quote_store = quotes if quotes is not None else QuoteStore(QUOTES_DB)
+        self.quote_buffer = QuoteBuffer(self._fetch_quote_batch, QUOTE_BUFFER_FILE)
+
+        # Downloads larger than this are aborted mid-stream
+        self.max_download_bytes = http_client.DEFAULT_MAX_DOWNLOAD_BYTES
+
+        # Hedge image downloads with an alternate source once the
+        # preferred one is slower than its p90 (or hedge_after seconds)
+        self.hedge_requests = True
+        self.hedge_after: Optional[float] = None
+
+        # Shared quote renderer; swap the encoder for WebP/PNG output
+        self.renderer = render.QuoteRenderer(render.JpegEncoder(quality=95))
+
+    def source_order(self) -> List[str]:
+        """Return the image sources to try, healthiest first.
+
+        Sources whose circuit breaker is open are left out unless every
+        source is open. URLs are sized for the screen.
+        """
+        sources = [
+            display.source_url(template)
+            for template in dict.fromkeys(self.image_sources)
+        ]
+        return self.health.order(sources) or sources
+
+    def _record_attempt(self, url: str, succeeded: bool, seconds: float) -> None:
+        """Feed the outcome of a provider request into the health tracker."""
+        if succeeded:
+            self.health.record_success(url, seconds)
+        else:
+            self.health.record_failure(url)
+
     def get_quote(self, category: str = "motivational") -> Dict[str, str]:
-        """Fetch a quote from available APIs."""
-        quote_data = {"text": "Stay motivated!", "author": "PaprWall"}
+        """Return a quote for *category* according to the quote source mode.
+
+        Online quotes come from the bulk-refilled quote buffer, so the
+        network is only hit about once per batch. In ``auto`` mode (the
+        default) a buffered quote is used when one is ready and the local
+        corpus answers while the buffer refills in the background; ``local``
+        never uses the network and ``online`` waits for the APIs, falling
+        back to the corpus.
+        """
+        default_quote = {"text": "Stay motivated!", "author": "PaprWall"}
 
-        for api_url in self.quote_apis:
+        try:
+            mode = self.quote_store.source()
+            local = self.quote_store.random_quote(category)
+        except Exception as e:
+            print(f"Quote store unavailable: {e}")
+            mode, local = "online", None
+
+        if mode == "local":
+            return local or default_quote
+        if local is not None and mode != "online":
+            return self.quote_buffer.pop(category, wait=False) or local
+
+        return self.quote_buffer.pop(category) or local or default_quote
+
+    def _fetch_quote_batch(self, category: str) -> List[Dict[str, str]]:
+        """Fetch a batch of quotes from the bulk APIs, healthiest first.
+
+        zenquotes has no categories, so it only fills the general
+        (motivational) buffer; other categories that quotable cannot serve
+        get nothing and ``get_quote`` falls back to the local store.
+        """
+        for api_url in self.health.order(self.quote_apis):
+            started = time.monotonic()
+            items: List[Dict[str, Any]] = []
+            quotes: List[Dict[str, str]] = []
             try:
                 if "quotable.io" in api_url:
                     params = {
-                        "tags": self.quote_categories.get(category, "motivational")
+                        "limit": QUOTE_BATCH_SIZE,
+                        "tags": self.quote_categories.get(category, "motivational"),
                     }
-                    response = requests.get(api_url, params=params, timeout=5)
+                    response = http_client.get(api_url, params=params)
                 elif "zenquotes.io" in api_url:
-                    response = requests.get(api_url, timeout=5)
+                    if category != DEFAULT_CATEGORY:
+                        continue
+                    response = http_client.get(api_url)
                 else:
                     continue
 
                 if response.status_code == 200:
                     data = response.json()
+                    items = data if isinstance(data, list) else [data]
                     if "quotable.io" in api_url:
-                        quote_data = {
-                            "text": data.get("content", "Stay motivated!"),
-                            "author": data.get("author", "Unknown"),
-                        }
-                    elif (
-                        "zenquotes.io" in api_url
-                        and isinstance(data, list)
-                        and len(data) > 0
-                    ):
-                        quote_data = {
-                            "text": data[0].get("q", "Stay motivated!"),
-                            "author": data[0].get("a", "Unknown"),
-                        }
-                    break
+                        quotes = [
+                            {
+                                "text": item.get("content", ""),
+                                "author": item.get("author", "Unknown"),
+                            }
+                            for item in items
+                            if isinstance(item, dict) and item.get("content")
+                        ]
+                    else:
+                        quotes = [
+                            {
+                                "text": item.get("q", ""),
+                                "author": item.get("a", "Unknown"),
+                            }
+                            for item in items
+                            if isinstance(item, dict) and item.get("q")
+                        ]
             except Exception:
-                continue
-
-        return quote_data
-
-    def download_image(self, url: Optional[str] = None) -> Optional[str]:
-        """Download an image and return the local path."""
-        if url is None:
-            url = random.choice(self.image_sources)
+                pass
 
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                # Create unique filename
-                import hashlib
-                import time
+            # A malformed payload counts as a failure and moves on
+            elapsed = time.monotonic() - started
+            self._record_attempt(api_url, bool(quotes), elapsed)
+            if quotes:
+                return quotes
 
-                filename = f"wallpaper_{int(time.time())}_{hashlib.md5(url.encode()).hexdigest()[:8]}.jpg"
-                filepath = IMAGES_DIR / filename
+        return []
 
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
+    def download_image(
+        self,
+        url: Optional[str] = None,
+        progress: Optional[http_client.ProgressCallback] = None,
+        directory: Optional[Path] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Optional[str]:
+        """Stream an image to disk and return the local path.
+
+        Without an explicit *url* the healthiest source is used, hedged with
+        the other sources when ``hedge_requests`` is enabled. Setting
+        *cancel_event* aborts the transfer.
+        """
+        sources = [url] if url is not None else self.source_order()
 
-                return str(filepath)
+        try:
+            # Create unique filename
+            import hashlib
+
+            filename = f"wallpaper_{int(time.time())}_{hashlib.md5(sources[0].encode()).hexdigest()[:8]}.jpg"
+            dest = (directory or IMAGES_DIR) / filename
+            observer = self._record_attempt if url is None else None
+            if len(sources) > 1 and self.hedge_requests:
+                result = http_client.hedged_download(
+                    sources,
+                    dest,
+                    hedge_after=self.hedge_after,
+                    max_bytes=self.max_download_bytes,
+                    progress=progress,
+                    cancel_event=cancel_event,
+                    observer=observer,
+                )
+            else:
+                started = time.monotonic()
+                try:
+                    result = http_client.download(
+                        sources[0],
+                        dest,
+                        max_bytes=self.max_download_bytes,
+                        progress=progress,
+                        cancel_event=cancel_event,
+                    )
+                except http_client.DownloadCancelled:
+                    raise
+                except Exception:
+                    if observer is not None:
+                        observer(sources[0], False, time.monotonic() - started)
+                    raise
+                if observer is not None:
+                    observer(sources[0], True, time.monotonic() - started)
+
+            # Keep the extension in line with the actual content type
+            ext = http_client.extension_for(result.content_type)
+            if ext != "jpg":
+                return str(Path(result.path).rename(dest.with_suffix(f".{ext}")))
+            return result.path
         except Exception as e:
             print(f"Failed to download image: {e}")
 
@@ -108,94 +252,11 @@ class WallpaperCore:
     def add_quote_to_image(self, image_path: str, quote_data: Dict[str, str]) -> str:
         """Add quote overlay to image and return new image path."""
         try:
-            # Open image
-            image: Image.Image = Image.open(image_path)
-            draw = ImageDraw.Draw(image)
-
-            # Quote text
-            quote_text = f'"{quote_data["text"]}"'
-            author_text = f"— {quote_data['author']}"
-
-            # Try to load a nice font
-            font_size = 32
-            author_font_size = 24
-            try:
-                font: Union[ImageFont.FreeTypeFont, ImageFont.ImageFont] = (
-                    ImageFont.truetype("arial.ttf", font_size)
-                )
-                author_font: Union[ImageFont.FreeTypeFont, ImageFont.ImageFont] = (
-                    ImageFont.truetype("arial.ttf", author_font_size)
-                )
-            except Exception:
-                try:
-                    font = ImageFont.truetype(
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                        font_size,
-                    )
-                    author_font = ImageFont.truetype(
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                        author_font_size,
-                    )
-                except Exception:
-                    font = ImageFont.load_default()
-                    author_font = ImageFont.load_default()
-
-            # Calculate text dimensions and position (top-right corner)
-            img_width, img_height = image.size
-
-            # Wrap text if too long
-            max_width = img_width // 3
-            quote_lines = self._wrap_text(quote_text, font, max_width)
-
-            # Calculate total text height
-            line_height = font_size + 5
-            total_height = len(quote_lines) * line_height + author_font_size + 10
-
-            # Position in top-right with padding
-            padding = 50
-            start_x = img_width - max_width - padding
-            start_y = padding
-
-            # Draw semi-transparent background
-            bg_padding = 20
-            bg_x1 = start_x - bg_padding
-            bg_y1 = start_y - bg_padding
-            bg_x2 = img_width - padding + bg_padding
-            bg_y2 = start_y + total_height + bg_padding
-
-            # Create overlay for semi-transparent background
-            overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            overlay_draw.rectangle([bg_x1, bg_y1, bg_x2, bg_y2], fill=(0, 0, 0, 128))
-
-            # Composite overlay onto image
-            image = image.convert("RGBA")
-            image = Image.alpha_composite(image, overlay)
-            image = image.convert("RGB")
-            draw = ImageDraw.Draw(image)
-
-            # Draw quote text
-            y_offset = start_y
-            for line in quote_lines:
-                draw.text((start_x, y_offset), line, font=font, fill="white")
-                y_offset += line_height
-
-            # Draw author
-            draw.text(
-                (start_x, y_offset + 10),
-                author_text,
-                font=author_font,
-                fill="lightgray",
+            source = Path(image_path)
+            output_path = source.with_name(
+                f"{source.stem}_with_quote{self.renderer.encoder.extension}"
             )
-
-            # Save the modified image
-            output_path = image_path.replace(".jpg", "_with_quote.jpg").replace(
-                ".png", "_with_quote.jpg"
-            )
-            image.save(output_path, "JPEG", quality=95)
-
-            return output_path
-
+            return self.renderer.render(image_path, quote_data, output_path)
         except Exception as e:
             print(f"Failed to add quote to image: {e}")
             return image_path
@@ -207,23 +268,7 @@ class WallpaperCore:
         max_width: int,
     ) -> List[str]:
         """Wrap text to fit within max_width."""
-        words = text.split()
-        lines: List[str] = []
-        current_line: List[str] = []
-
-        for word in words:
-            test_line = " ".join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            if bbox[2] - bbox[0] <= max_width or not current_line:
-                current_line.append(word)
-            else:
-                lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        return lines
+        return layout.wrap_text(text, font, max_width)
 
     def set_wallpaper(self, image_path: str) -> bool:
         """Set the wallpaper on the system."""
@@ -323,40 +368,24 @@ class WallpaperCore:
             return False
 
     def save_to_history(self, image_path: str, quote_data: Dict[str, str]) -> None:
-        """Save wallpaper to history."""
-        history_file = DATA_DIR / "history.json"
-
+        """Save wallpaper to history (see paprwall.history.HistoryStore)."""
+        store = HistoryStore(
+            DATA_DIR / "history.db", legacy_json=DATA_DIR / "history.json"
+        )
         try:
-            if history_file.exists():
-                with open(history_file, "r") as f:
-                    history = json.load(f)
-            else:
-                history = []
-
-            # Add new entry
-            entry = {
-                "timestamp": str(int(time.time())),
-                "image_path": image_path,
-                "quote": quote_data,
-                "datetime": str(datetime.now()),
-            }
-
-            history.insert(0, entry)  # Add to beginning
-
-            # Keep only last 50 entries
-            history = history[:50]
-
-            with open(history_file, "w") as f:
-                json.dump(history, f, indent=2)
-
+            store.add(image_path, quote_data)
         except Exception as e:
             print(f"Failed to save to history: {e}")
+        finally:
+            store.close()
 
 
 def set_wallpaper_from_file(
     file_path: str, add_quote: bool = True, category: str = "motivational"
 ) -> int:
     """Set wallpaper from a local file."""
+    from .async_core import AsyncWallpaperCore
+
     try:
         core = WallpaperCore()
 
@@ -364,17 +393,20 @@ def set_wallpaper_from_file(
             print(f"File not found: {file_path}")
             return 1
 
-        final_path = file_path
-        quote_data = {"text": "", "author": ""}
-
-        if add_quote:
-            quote_data = core.get_quote(category)
-            final_path = core.add_quote_to_image(file_path, quote_data)
+        try:
+            imaging.check_image(file_path, display.screen_resolution())
+        except imaging.ImageTooLarge as e:
+            print(f"Image rejected: {e}")
+            return 1
+        except OSError:
+            # Not readable as an image here; setting it reports the error
+            pass
 
-        success = core.set_wallpaper(final_path)
-        if success:
-            core.save_to_history(final_path, quote_data)
-            print(f"Wallpaper set successfully: {final_path}")
+        result = asyncio.run(
+            AsyncWallpaperCore(core).set_from_file(file_path, add_quote, category)
+        )
+        if result.success:
+            print(f"Wallpaper set successfully: {result.path}")
             return 0
         else:
             print("Failed to set wallpaper")
@@ -385,34 +417,143 @@ def set_wallpaper_from_file(
         return 1
 
 
-def fetch_and_set_wallpaper(
-    category: str = "motivational", add_quote: bool = True
+def import_quotes(file_path: str, category: str = "motivational") -> int:
+    """Import a CSV or JSON quote collection into the local corpus."""
+    try:
+        store = QuoteStore(QUOTES_DB)
+        added = store.import_file(file_path, category=category)
+        print(f"Imported {added} new quote(s) from {file_path}")
+        for name, count in store.categories().items():
+            print(f"  {name}: {count}")
+        return 0
+    except Exception as e:
+        print(f"Error importing quotes: {e}")
+        return 1
+
+
+def set_quote_source(mode: str) -> int:
+    """Save where quotes come from: auto, local or online."""
+    try:
+        QuoteStore(QUOTES_DB).set_source(mode)
+        print(f"Quote source set to {mode}")
+        return 0
+    except Exception as e:
+        print(f"Error setting quote source: {e}")
+        return 1
+
+
+def _spool_tag(category: str, add_quote: bool) -> str:
+    """Return the prefetch spool tag for a category/quote combination."""
+    return category if add_quote else "plain"
+
+
+def _wallpaper_producer(
+    core: WallpaperCore, category: str, add_quote: bool
+) -> Callable[[Path, str], Optional[Dict[str, Any]]]:
+    """Build a PrefetchQueue producer that renders wallpapers with *core*."""
+    from .async_core import AsyncWallpaperCore
+
+    async_core = AsyncWallpaperCore(core)
+
+    def produce(spool_dir: Path, tag: str) -> Optional[Dict[str, Any]]:
+        image_path, quote_data = asyncio.run(
+            async_core.fetch(category, add_quote, directory=spool_dir)
+        )
+        if not image_path:
+            return None
+        if not add_quote:
+            return {"path": image_path, "source": None, "quote": {}}
+
+        final_path = core.add_quote_to_image(image_path, quote_data)
+        if final_path == image_path:
+            # Rendering failed; don't spool an image without its quote
+            os.remove(image_path)
+            return None
+        return {"path": final_path, "source": image_path, "quote": quote_data}
+
+    return produce
+
+
+def prefetch_wallpapers(
+    category: str = "motivational",
+    add_quote: bool = True,
+    depth: Optional[int] = None,
+    max_mb: Optional[int] = None,
+    policy: Optional[str] = None,
 ) -> int:
-    """Fetch a new wallpaper and set it."""
+    """Fill the prefetch spool so later fetches are a pop-and-set."""
     try:
         core = WallpaperCore()
+        tag = _spool_tag(category, add_quote)
+        queue = PrefetchQueue.from_settings(
+            SPOOL_DIR, _wallpaper_producer(core, category, add_quote)
+        )
+        queue.configure(
+            depth=depth,
+            max_bytes=max_mb * 1024 * 1024 if max_mb is not None else None,
+            policy=policy,
+        )
+        queue.save_settings()
+        queue.prune(keep_tag=tag)
+
+        print(f"Prefetching up to {queue.depth} wallpapers ({category})...")
+        added = queue.fill(tag)
+        status = queue.status(tag)
+        print(
+            f"Prefetched {added} new; {status['ready']}/{status['depth']} ready, "
+            f"{status['bytes'] / 1048576:.1f}/{status['max_bytes'] / 1048576:.0f} MB, "
+            f"policy {status['policy']}"
+        )
+        return 0
 
-        print(f"Fetching wallpaper with {category} quote...")
+    except Exception as e:
+        print(f"Error prefetching wallpapers: {e}")
+        return 1
 
-        # Download image
-        image_path = core.download_image()
-        if not image_path:
-            print("Failed to download wallpaper")
-            return 1
 
-        final_path = image_path
-        quote_data = {"text": "", "author": ""}
+def fetch_and_set_wallpaper(
+    category: str = "motivational", add_quote: bool = True
+) -> int:
+    """Fetch a new wallpaper and set it.
+
+    If the prefetch spool has been set up (``paprwall --prefetch``) a ready
+    wallpaper is popped from it and the spool is refilled after setting.
+    """
+    from .async_core import AsyncWallpaperCore
 
-        if add_quote:
-            quote_data = core.get_quote(category)
-            final_path = core.add_quote_to_image(image_path, quote_data)
+    try:
+        core = WallpaperCore()
+        tag = _spool_tag(category, add_quote)
+
+        queue = None
+        entry = None
+        if PrefetchQueue.is_configured(SPOOL_DIR):
+            queue = PrefetchQueue.from_settings(
+                SPOOL_DIR, _wallpaper_producer(core, category, add_quote)
+            )
+            entry = queue.pop(tag, dest_dir=IMAGES_DIR)
+
+        async_core = AsyncWallpaperCore(core)
+        result: Optional[Applied]
+        if entry:
+            print(f"Using prefetched wallpaper with {category} quote...")
+            quote_data = entry.get("quote") or {"text": "", "author": ""}
+            result = asyncio.run(async_core.apply(entry["path"], quote_data))
+        else:
+            print(f"Fetching wallpaper with {category} quote...")
+            result = asyncio.run(async_core.fetch_and_set(category, add_quote))
+            if result is None:
+                print("Failed to download wallpaper")
+                return 1
 
-        success = core.set_wallpaper(final_path)
-        if success:
-            core.save_to_history(final_path, quote_data)
+        if result.success:
             print(f"Wallpaper set successfully!")
             if add_quote:
+                quote_data = result.quote
                 print(f'Quote: "{quote_data["text"]}" — {quote_data["author"]}')
+            if queue is not None and queue.refill_due(tag):
+                added = queue.fill(tag)
+                print(f"Prefetched {added} wallpaper(s) for next time")
             return 0
         else:
             print("Failed to set wallpaper")
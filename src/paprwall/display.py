@@ -0,0 +1,152 @@
+"""
+Screen resolution detection.
+
+The output resolution is detected once per process (xrandr on Linux,
+GetDeviceCaps on Windows, system_profiler on macOS) and cached, so
+image providers can be asked for exactly the pixels the screen shows and
+renders can be composited at that size instead of being rescaled again
+by the desktop.
+"""
+
+import platform
+import re
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+Resolution = Tuple[int, int]
+
+DEFAULT_RESOLUTION: Resolution = (1920, 1080)
+# Ignore obviously bogus readings
+MIN_DIMENSION = 320
+MAX_DIMENSION = 16384
+
+# GetDeviceCaps indexes for the physical desktop size, unaffected by DPI scaling
+DESKTOPVERTRES = 117
+DESKTOPHORZRES = 118
+
+_XRANDR_OUTPUT = re.compile(r"\bconnected\b.*?(\d+)x(\d+)\+\d+\+\d+")
+_MACOS_RESOLUTION = re.compile(r"Resolution:\s*(\d+)\s*x\s*(\d+)")
+
+_cached: Optional[List[Resolution]] = None
+_lock = threading.Lock()
+
+
+def _valid(size: Resolution) -> bool:
+    return all(MIN_DIMENSION <= d <= MAX_DIMENSION for d in size)
+
+
+def _detect_linux() -> List[Resolution]:
+    """Return the active outputs reported by xrandr."""
+    result = subprocess.run(
+        ["xrandr", "--current"], capture_output=True, text=True, timeout=5
+    )
+    return [
+        (int(w), int(h))
+        for w, h in _XRANDR_OUTPUT.findall(result.stdout)
+    ]
+
+
+def _detect_windows() -> List[Resolution]:
+    """Return the primary screen size in physical pixels."""
+    import ctypes
+
+    windll = ctypes.windll  # type: ignore[attr-defined]
+    user32, gdi32 = windll.user32, windll.gdi32
+    # GetSystemMetrics reports scaled sizes unless the process is DPI aware;
+    # asking the screen DC for the desktop resolution leaves that state alone
+    hdc = user32.GetDC(0)
+    try:
+        size = (
+            int(gdi32.GetDeviceCaps(hdc, DESKTOPHORZRES)),
+            int(gdi32.GetDeviceCaps(hdc, DESKTOPVERTRES)),
+        )
+    finally:
+        user32.ReleaseDC(0, hdc)
+    if not _valid(size):
+        size = (int(user32.GetSystemMetrics(0)), int(user32.GetSystemMetrics(1)))
+    return [size]
+
+
+def _detect_macos() -> List[Resolution]:
+    """Return the displays reported by system_profiler."""
+    result = subprocess.run(
+        ["system_profiler", "SPDisplaysDataType"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+    return [
+        (int(w), int(h))
+        for w, h in _MACOS_RESOLUTION.findall(result.stdout)
+    ]
+
+
+def detect_outputs(
+    refresh: bool = False, fallback: Optional[Resolution] = None
+) -> List[Resolution]:
+    """Return the resolution of every active output, detected once.
+
+    When nothing can be detected *fallback* (e.g. Tk's screen size) is
+    used, or ``DEFAULT_RESOLUTION`` without one.
+    """
+    global _cached
+    with _lock:
+        if _cached is not None and not refresh:
+            return list(_cached)
+
+        system = platform.system()
+        outputs: List[Resolution] = []
+        try:
+            if system == "Windows":
+                outputs = _detect_windows()
+            elif system == "Darwin":
+                outputs = _detect_macos()
+            else:
+                outputs = _detect_linux()
+        except Exception as e:
+            print(f"Screen resolution detection failed: {e}")
+
+        outputs = [size for size in outputs if _valid(size)]
+        if not outputs and fallback is not None and _valid(fallback):
+            outputs = [fallback]
+        _cached = outputs or [DEFAULT_RESOLUTION]
+        return list(_cached)
+
+
+def set_outputs(outputs: List[Resolution]) -> None:
+    """Override the detected outputs (e.g. from a user setting)."""
+    global _cached
+    valid = [size for size in outputs if _valid(size)]
+    if valid:
+        with _lock:
+            _cached = valid
+
+
+def screen_resolution() -> Resolution:
+    """Return the render target: the largest active output.
+
+    Using the largest output means no screen has to upscale the wallpaper.
+    """
+    return max(detect_outputs(), key=lambda size: size[0] * size[1])
+
+
+def source_url(template: str, size: Optional[Resolution] = None) -> str:
+    """Fill ``{width}`` and ``{height}`` in an image source URL template."""
+    width, height = size or screen_resolution()
+    return template.format(width=width, height=height)
+
+
+def fit_to_screen(
+    image: Image.Image, size: Optional[Resolution] = None
+) -> Image.Image:
+    """Scale and center-crop *image* to exactly fill *size* (the screen).
+
+    Images that already match are returned unchanged.
+    """
+    size = size or screen_resolution()
+    if image.size == size:
+        return image
+    return ImageOps.fit(image, size, Image.Resampling.LANCZOS)
@@ -0,0 +1,129 @@
+"""
+Font discovery and caching for quote rendering.
+
+Rendering a quote used to try a chain of font paths with
+``ImageFont.truetype`` on every call (and on every step of the GUI's
+shrink-to-fit loop), parsing the same TTF files over and over. The
+FontManager finds a usable font pair once per process, remembers it, and
+keeps loaded fonts in an LRU cache keyed by (path, size).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+
+from PIL import ImageFont
+
+Font = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+# (quote font, author font) pairs in order of preference
+FONT_CANDIDATES: List[Tuple[str, str]] = [
+    ("arial.ttf", "arial.ttf"),
+    (
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    ),
+    ("/System/Library/Fonts/Helvetica.ttc", "/System/Library/Fonts/Helvetica.ttc"),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arial.ttf"),
+]
+
+DEFAULT_CACHE_SIZE = 64
+
+
+class FontManager:
+    """Discovers quote fonts once and caches loaded fonts by (path, size)."""
+
+    def __init__(
+        self,
+        candidates: Optional[List[Tuple[str, str]]] = None,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Create a manager trying *candidates* in order."""
+        self.candidates = list(FONT_CANDIDATES if candidates is None else candidates)
+        self.maxsize = maxsize
+        self._pair: Optional[Tuple[str, str]] = None
+        self._discovered = False
+        self._fonts: "OrderedDict[Tuple[str, int], ImageFont.FreeTypeFont]" = (
+            OrderedDict()
+        )
+        self._fallback: Optional[Font] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def discover(self) -> Optional[Tuple[str, str]]:
+        """Return the first loadable (quote, author) font pair, found once."""
+        with self._lock:
+            if self._discovered:
+                return self._pair
+        pair = None
+        for quote_path, author_path in self.candidates:
+            try:
+                ImageFont.truetype(quote_path, 12)
+                if author_path != quote_path:
+                    ImageFont.truetype(author_path, 12)
+            except Exception:
+                continue
+            pair = (quote_path, author_path)
+            break
+        if pair is None:
+            print("No TrueType font found, using the default font")
+        with self._lock:
+            self._pair = pair
+            self._discovered = True
+        return pair
+
+    def font(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        """Return the font at *path* in *size*, loading it on first use."""
+        key = (path, size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+        font = ImageFont.truetype(path, size)
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.maxsize:
+                self._fonts.popitem(last=False)
+        return font
+
+    def _default(self) -> Font:
+        if self._fallback is None:
+            self._fallback = ImageFont.load_default()
+        return self._fallback
+
+    def quote_font(self, size: int) -> Font:
+        """Return the quote font in *size* (the default font if none found)."""
+        pair = self.discover()
+        return self.font(pair[0], size) if pair else self._default()
+
+    def author_font(self, size: int) -> Font:
+        """Return the author font in *size* (the default font if none found)."""
+        pair = self.discover()
+        return self.font(pair[1], size) if pair else self._default()
+
+    def fonts(self, quote_size: int, author_size: int) -> Tuple[Font, Font]:
+        """Return the quote and author fonts in the given sizes."""
+        return self.quote_font(quote_size), self.author_font(author_size)
+
+    def cache_size(self) -> int:
+        """Return the number of fonts currently cached."""
+        with self._lock:
+            return len(self._fonts)
+
+
+_manager: Optional[FontManager] = None
+_manager_lock = threading.Lock()
+
+
+def font_manager() -> FontManager:
+    """Return the process-wide FontManager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = FontManager()
+        return _manager
@@ -8,17 +8,33 @@ import sys
 import json
 import platform
 import subprocess
-import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk
 import requests
 
+from paprwall import display, http_client, imaging, render, render_pool
+from paprwall.history import HistoryPages, HistoryStore, visible_range
+from paprwall.jobs import JobExecutor, Priority
+from paprwall.prefetch import PrefetchQueue, REFILL_POLICIES
+from paprwall.quote_buffer import QuoteBuffer
+from paprwall.quote_store import DEFAULT_CATEGORY, QuoteStore
+from paprwall.sources import SourceHealth
+from paprwall.thumbnails import DEFAULT_MAX_ENTRIES, ThumbnailCache
+
 # Removed tray support - using systemd/Windows service instead
 
+# History browser: width of one thumbnail slot, thumbnails kept in memory
+HISTORY_SLOT_WIDTH = 140
+HISTORY_PHOTO_CACHE = 64
+# Seconds to wait for a render worker before rendering in-process instead
+RENDER_TIMEOUT = 60
+
 
 class ModernWallpaperGUI:
     """Modern wallpaper manager with clean UI and enhanced features."""
@@ -55,6 +71,8 @@ class ModernWallpaperGUI:
         # Start auto-rotation if enabled
         self.root.after(1000, self.start_auto_rotate_if_enabled)
 
+        self.root.after(2000, self.update_prefetch_label)
+
     def set_window_icon(self):
         """Set the window icon."""
         try:
@@ -122,9 +140,26 @@ class ModernWallpaperGUI:
         self.current_quote = {"text": "Transform your desktop", "author": "PaprWall"}
         self.preview_image = None
         self.preview_path = None  # Track which file is shown in preview
+        # Previews are decoded off the Tk thread; only the newest request is shown
+        self.preview_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paprwall-preview")
+        self.preview_generation = 0
         self.applied_wallpaper = None  # Track last successfully applied wallpaper
-        self.is_fetching = False  # Prevent concurrent fetches
-        self.fetch_lock = threading.Lock()
+        # History browser: a virtual strip over the whole history. Widgets
+        # exist only for visible slots and are reused while scrolling;
+        # thumbnails are loaded on a worker and kept in a small LRU.
+        self.history_slots = {}  # history index -> slot widgets
+        self.history_free_slots = []
+        self.history_photos = OrderedDict()  # path -> PhotoImage
+        self.history_loading = set()
+        self.history_wanted = frozenset()  # paths of visible slots
+        self.history_extent = None
+        self.history_refresh_pending = False
+        self.thumbnail_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="paprwall-thumbs")
+        # Background actions run here by priority; a newer action of the same
+        # kind supersedes an older one (see paprwall.jobs)
+        self.jobs = JobExecutor(workers=2)
+        # Worker for network calls that run alongside an image download
+        self.io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="paprwall-io")
 
         # Auto-rotation
         self.auto_rotate = tk.BooleanVar(value=True)
@@ -154,34 +189,52 @@ class ModernWallpaperGUI:
             "type.fit": "https://type.fit/api/quotes",
         }
 
-        # Multiple image sources for reliability (95% picsum, 5% loremflickr as fallback)
+        # Image sources in order of preference; reordered by source health.
+        # {width}/{height} are filled with the detected screen resolution.
         self.image_sources = [
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://picsum.photos/1920/1080",
-            "https://loremflickr.com/1920/1080/nature",
+            "https://picsum.photos/{width}/{height}",
+            "https://loremflickr.com/{width}/{height}/nature",
         ]
 
         # Retry configuration
         self.max_retries = 3
         self.retry_delay = 2  # seconds
 
+        # Shared HTTP client options (pool sizes, per-host timeouts), see
+        # paprwall.http_client.HttpClient for the accepted keys
+        self.http_settings = {}
+
+        # Downloads larger than this are aborted mid-stream
+        self.max_download_mb = 25
+        self._last_progress_pct = None
+
+        # Hedged downloads: start an alternate image source when the preferred
+        # one has not answered within hedge_after seconds (None = its p90)
+        self.hedge_requests = True
+        self.hedge_after = None
+
+        # Output encoding of rendered wallpapers: "format" (jpeg, webp, png)
+        # plus encoder options, see paprwall.render.make_encoder
+        self.render_settings = {"format": "jpeg", "quality": 98, "subsampling": 0}
+        # Pixel and memory budget for decoding images (see paprwall.imaging)
+        self.image_limits = {
+            "max_megapixels": imaging.DEFAULT_MAX_PIXELS // 1_000_000,
+            "max_decoded_mb": imaging.DEFAULT_MAX_DECODED_BYTES // (1024 * 1024),
+        }
+        # Render in this many worker processes; opt-in, as each one is a
+        # separate Python process with its own font and tile caches
+        # (0 = on GUI worker threads)
+        self.render_workers = 0
+        self.render_pool = None
+
+        # Prefetch spool of ready-to-apply wallpapers for auto-rotation
+        self.prefetch_queue = None
+        self.prefetch_depth = tk.IntVar(value=3)
+        self.prefetch_max_mb = tk.IntVar(value=200)
+        self.prefetch_policy = tk.StringVar(value="eager")
+        # Plain copy of the quote category for worker threads (quotes, prefetch)
+        self._current_category = "motivational"
+
     def setup_directories(self):
         """Setup data directories."""
         if platform.system() == "Windows":
@@ -191,12 +244,27 @@ class ModernWallpaperGUI:
 
         self.data_dir = base_dir / "paprwall"
         self.wallpapers_dir = self.data_dir / "wallpapers"
+        # Separate from the CLI spool (DATA_DIR/spool) so neither prunes the other
+        self.spool_dir = self.data_dir / "gui_spool"
         self.config_file = self.data_dir / "config.json"
         self.history_file = self.data_dir / "history.json"
 
         # Create directories
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.wallpapers_dir.mkdir(exist_ok=True)
+        # History gallery thumbnails (CACHE_DIR/thumbnails on Linux)
+        self.thumbnails = ThumbnailCache(self.data_dir / "cache" / "thumbnails")
+        self.apply_render_settings()
+
+        # Provider success rates and circuit breakers, kept across restarts
+        self.source_health = SourceHealth(self.data_dir / "source_health.json")
+
+        # Local quote corpus (bundled quotes plus imports via --import-quotes)
+        self.quote_store = QuoteStore(self.data_dir / "quotes.db")
+        # Quotes fetched in bulk, handed out one per rotation
+        self.quote_buffer = QuoteBuffer(
+            self.fetch_quote_batch, self.data_dir / "quote_buffer.json"
+        )
 
     def load_config(self):
         """Load user configuration."""
@@ -205,8 +273,37 @@ class ModernWallpaperGUI:
                 with open(self.config_file, "r") as f:
                     config = json.load(f)
                     self.quote_category.set(config.get("category", "motivational"))
+                    self._current_category = self.quote_category.get()
                     self.rotate_interval.set(config.get("interval", 60))
                     self.auto_rotate.set(config.get("auto_rotate", False))
+                    self.http_settings = config.get("http", {}) or {}
+                    self.max_download_mb = config.get(
+                        "max_download_mb", self.max_download_mb
+                    )
+                    hedge = config.get("hedge", {})
+                    self.hedge_requests = hedge.get("enabled", True)
+                    self.hedge_after = hedge.get("after")
+                    if config.get("image_limits"):
+                        self.image_limits.update(config["image_limits"])
+                        imaging.configure_limits(
+                            max_pixels=int(self.image_limits["max_megapixels"] * 1_000_000),
+                            max_decoded_bytes=int(
+                                self.image_limits["max_decoded_mb"] * 1024 * 1024
+                            ),
+                        )
+                    if config.get("render"):
+                        self.render_settings = config["render"]
+                    self.render_workers = config.get(
+                        "render_workers", self.render_workers
+                    )
+                    self.apply_render_settings()
+                    prefetch = config.get("prefetch", {})
+                    self.prefetch_depth.set(prefetch.get("depth", 3))
+                    self.prefetch_max_mb.set(prefetch.get("max_mb", 200))
+                    if prefetch.get("policy") in REFILL_POLICIES:
+                        self.prefetch_policy.set(prefetch["policy"])
+                if self.http_settings:
+                    http_client.configure(**self.http_settings)
             except Exception as e:
                 print(f"Failed to load config: {e}")
 
@@ -218,51 +315,65 @@ class ModernWallpaperGUI:
                 "interval": self.rotate_interval.get(),
                 "auto_rotate": self.auto_rotate.get(),
             }
+            if self.http_settings:
+                config["http"] = self.http_settings
+            config["max_download_mb"] = self.max_download_mb
+            config["hedge"] = {
+                "enabled": self.hedge_requests,
+                "after": self.hedge_after,
+            }
+            config["prefetch"] = {
+                "depth": self.prefetch_depth.get(),
+                "max_mb": self.prefetch_max_mb.get(),
+                "policy": self.prefetch_policy.get(),
+            }
+            config["render"] = self.render_settings
+            config["render_workers"] = self.render_workers
+            config["image_limits"] = self.image_limits
             with open(self.config_file, "w") as f:
                 json.dump(config, f, indent=2)
         except Exception as e:
             print(f"Failed to save config: {e}")
 
+    def apply_render_settings(self):
+        """Build the quote renderer and render cache from render_settings."""
+        try:
+            encoder = render.make_encoder(**self.render_settings)
+        except (TypeError, ValueError) as e:
+            print(f"[WARN] Invalid render settings ({e}), using JPEG")
+            encoder = render.JpegEncoder(quality=98, subsampling=0)
+        self.renderer = render.QuoteRenderer(encoder, thumbnails=self.thumbnails)
+        self.render_cache = self.renderer.cache_for(self.wallpapers_dir)
+
+        # Worker processes start on the first render and keep fonts loaded
+        if self.render_pool is not None:
+            self.render_pool.shutdown(wait=False)
+        self.render_pool = (
+            render_pool.RenderPool(self.renderer, self.render_workers)
+            if self.render_workers
+            else None
+        )
+
     def load_history(self):
-        """Load wallpaper history."""
-        self.history = []
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, "r") as f:
-                    data = json.load(f)
-                    # Ensure it's a list
-                    if isinstance(data, list):
-                        self.history = data
-                    else:
-                        self.history = []
-            except Exception as e:
-                print(f"Failed to load history: {e}")
-                self.history = []
+        """Open wallpaper history (imported from history.json on first run)."""
+        self.history_store = HistoryStore(
+            self.data_dir / "history.db", legacy_json=self.history_file
+        )
+        self.history_pages = HistoryPages(self.history_store)
+        count = 0
+        try:
+            count = self.history_pages.count()
+        except Exception as e:
+            print(f"Failed to load history: {e}")
+        # History is unbounded; keep a thumbnail for every entry in it
+        self.io_pool.submit(self.thumbnails.prune, max(DEFAULT_MAX_ENTRIES, count))
 
     def save_to_history(self, wallpaper_path, quote):
         """Save wallpaper to history."""
         try:
-            # Create entry
-            entry = {
-                "path": str(wallpaper_path),
-                "quote": quote,
-                "timestamp": datetime.now().isoformat(),
-            }
-
-            # Ensure history is a list
-            if not isinstance(self.history, list):
-                self.history = []
-
-            # Add to beginning
-            self.history.insert(0, entry)
-            self.history = self.history[:50]  # Keep last 50
-
-            # Save to file
-            with open(self.history_file, "w") as f:
-                json.dump(self.history, f, indent=2)
-
-            # Update gallery display
-            self.root.after(0, self.update_history_gallery)
+            self.history_store.add(wallpaper_path, quote)
+            # The browser shows the new entry first without rebuilding
+            self.root.after(0, self.history_changed)
         except Exception as e:
             print(f"Failed to save history: {e}")
 
@@ -359,9 +470,14 @@ class ModernWallpaperGUI:
         self.applied_indicator.pack(side=tk.LEFT, padx=6)
 
         # Resolution info
+        # Detect once; Tk's screen size is used if the platform query fails
+        display.detect_outputs(
+            fallback=(self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        )
+        screen_width, screen_height = display.screen_resolution()
         self.resolution_label = tk.Label(
             preview_header,
-            text="1920×1080",
+            text=f"{screen_width}×{screen_height}",
             font=("Segoe UI", 10),
             bg=self.colors["bg_tertiary"],
             fg=self.colors["text_secondary"],
@@ -468,35 +584,31 @@ class ModernWallpaperGUI:
             bg=self.colors["bg_secondary"],
             height=200,
             highlightthickness=0,
+            xscrollincrement=HISTORY_SLOT_WIDTH,
         )
 
-        scrollbar = ttk.Scrollbar(
+        self.history_scrollbar = ttk.Scrollbar(
             gallery_frame, orient=tk.HORIZONTAL, command=self.history_canvas.xview
         )
 
-        self.history_canvas.configure(xscrollcommand=scrollbar.set)
+        self.history_canvas.configure(xscrollcommand=self.on_history_scroll)
 
         self.history_canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.history_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
-        # Create inner frame for thumbnails
-        self.history_frame = tk.Frame(
-            self.history_canvas, bg=self.colors["bg_secondary"]
-        )
-        self.history_canvas_window = self.history_canvas.create_window(
-            (0, 0), window=self.history_frame, anchor="nw"
-        )
-
-        self.history_frame.bind("<Configure>", self.on_history_configure)
+        # Blank image shown while a thumbnail loads
+        self.history_blank = tk.PhotoImage(width=120, height=80)
+        self.history_canvas.bind("<Configure>", lambda e: self.schedule_history_refresh())
         
         # Enable mouse wheel scrolling
         self.history_canvas.bind("<MouseWheel>", self.on_history_mousewheel)
         self.history_canvas.bind("<Button-4>", self.on_history_mousewheel)
         self.history_canvas.bind("<Button-5>", self.on_history_mousewheel)
 
-    def on_history_configure(self, event):
-        """Update scroll region when history frame changes."""
-        self.history_canvas.configure(scrollregion=self.history_canvas.bbox("all"))
+    def on_history_scroll(self, first, last):
+        """Move the scrollbar and bring the newly visible slots in."""
+        self.history_scrollbar.set(first, last)
+        self.schedule_history_refresh()
 
     def on_history_mousewheel(self, event):
         """Handle mouse wheel scrolling for history gallery."""
@@ -532,6 +644,7 @@ class ModernWallpaperGUI:
         # Sections
         self.create_category_section(scrollable_frame)
         self.create_auto_rotation_section(scrollable_frame)
+        self.create_prefetch_section(scrollable_frame)
         self.create_url_section(scrollable_frame)
         self.create_settings_section(scrollable_frame)
 
@@ -629,6 +742,75 @@ class ModernWallpaperGUI:
         )
         self.timer_label.pack(fill=tk.X, pady=5)
 
+    def create_prefetch_section(self, parent):
+        """Create prefetch spool controls."""
+        section = self.create_section(parent, "Prefetch")
+
+        def spin_row(label, variable, from_, to):
+            row = tk.Frame(section, bg=self.colors["bg_secondary"])
+            row.pack(fill=tk.X, pady=3)
+            tk.Label(
+                row,
+                text=label,
+                font=("Segoe UI", 10),
+                bg=self.colors["bg_secondary"],
+                fg=self.colors["text_secondary"],
+            ).pack(side=tk.LEFT)
+            spin = tk.Spinbox(
+                row,
+                from_=from_,
+                to=to,
+                textvariable=variable,
+                width=8,
+                font=("Segoe UI", 10),
+                bg=self.colors["bg_tertiary"],
+                fg=self.colors["text_primary"],
+                buttonbackground=self.colors["bg_hover"],
+                command=self.on_prefetch_change,
+            )
+            spin.pack(side=tk.RIGHT)
+            spin.bind("<Return>", lambda e: self.on_prefetch_change())
+            spin.bind("<FocusOut>", lambda e: self.on_prefetch_change())
+
+        spin_row("Ready wallpapers:", self.prefetch_depth, 0, 10)
+        spin_row("Max disk (MB):", self.prefetch_max_mb, 20, 2000)
+
+        policy_row = tk.Frame(section, bg=self.colors["bg_secondary"])
+        policy_row.pack(fill=tk.X, pady=3)
+        tk.Label(
+            policy_row,
+            text="Refill:",
+            font=("Segoe UI", 10),
+            bg=self.colors["bg_secondary"],
+            fg=self.colors["text_secondary"],
+        ).pack(side=tk.LEFT)
+        policy_menu = tk.OptionMenu(
+            policy_row,
+            self.prefetch_policy,
+            *REFILL_POLICIES,
+            command=lambda _value: self.on_prefetch_change(),
+        )
+        policy_menu.config(
+            font=("Segoe UI", 10),
+            bg=self.colors["bg_tertiary"],
+            fg=self.colors["text_primary"],
+            activebackground=self.colors["bg_hover"],
+            relief=tk.FLAT,
+            highlightthickness=0,
+        )
+        policy_menu.pack(side=tk.RIGHT)
+
+        self.prefetch_label = tk.Label(
+            section,
+            text="Ready: 0/0",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors["bg_tertiary"],
+            fg=self.colors["accent_blue"],
+            padx=10,
+            pady=5,
+        )
+        self.prefetch_label.pack(fill=tk.X, pady=5)
+
     def create_url_section(self, parent):
         """Create custom URL input."""
         section = self.create_section(parent, "Custom Image URL")
@@ -758,14 +940,21 @@ class ModernWallpaperGUI:
     def on_category_change(self):
         """Handle category change."""
         self.save_config()
+        self._current_category = self.quote_category.get()
+        if self.prefetch_queue is not None:
+            # Spooled wallpapers carry quotes from the old category
+            self.prefetch_queue.prune(keep_tag=self._current_category)
+            self.prefetch_queue.request_refill()
         self.update_status("Category changed", "accent_green")
 
     def toggle_auto_rotate(self):
         """Toggle auto-rotation."""
         if self.auto_rotate.get():
             self.start_auto_rotation()
+            self.start_prefetcher()
         else:
             self.stop_auto_rotation()
+            self.stop_prefetcher()
         self.save_config()
 
     def on_interval_change(self):
@@ -788,28 +977,63 @@ class ModernWallpaperGUI:
         )
 
         if file_path:
+            try:
+                imaging.check_image(file_path, display.screen_resolution())
+            except imaging.ImageTooLarge as e:
+                print(f"[WARN] Local image rejected: {e}")
+                messagebox.showwarning("Image Too Large", str(e))
+                self.update_status("Image too large", "accent_red")
+                return
+            except Exception as e:
+                print(f"[WARN] Could not read image header: {e}")
             self.load_image_to_preview(file_path)
             self.current_wallpaper = file_path
             self.update_status("Local image loaded", "accent_green")
 
     def load_image_to_preview(self, path):
-        """Load *path* into the preview canvas, scaled to fit while keeping ratio."""
+        """Load *path* into the preview canvas, scaled to fit while keeping ratio.
+
+        Decoding and scaling run on the preview worker; only the PhotoImage
+        is created on the Tk thread. A newer request supersedes older ones.
+        """
+        canvas_w = self.preview_canvas.winfo_width()
+        canvas_h = self.preview_canvas.winfo_height()
+        if canvas_w < 10 or canvas_h < 10:  # canvas not realised yet
+            self.root.after(100, lambda: self.load_image_to_preview(path))
+            return
+
+        self.preview_generation += 1
+        generation = self.preview_generation
+
+        def decode():
+            if generation != self.preview_generation:
+                return None  # superseded while queued
+            # Decode at reduced scale and fit to the canvas, keeping ratio
+            return imaging.load_scaled(path, (canvas_w, canvas_h))
+
+        future = self.preview_pool.submit(decode)
+        future.add_done_callback(
+            lambda f: self.root.after(0, lambda: self.show_preview(generation, path, f))
+        )
+
+    def show_preview(self, generation, path, future):
+        """Display a decoded preview on the Tk thread unless it is stale."""
+        if generation != self.preview_generation:
+            return
         try:
-            img = Image.open(path)
-            canvas_w = self.preview_canvas.winfo_width()
-            canvas_h = self.preview_canvas.winfo_height()
-            if canvas_w < 10 or canvas_h < 10:  # canvas not realised yet
-                self.root.after(100, lambda: self.load_image_to_preview(path))
+            result = future.result()
+            if result is None:
                 return
+            img, (src_w, src_h) = result
 
             # Update resolution label
-            self.resolution_label.config(text=f"{img.width}×{img.height}")
+            self.resolution_label.config(text=f"{src_w}×{src_h}")
 
-            # scale to fit
-            img.thumbnail((canvas_w, canvas_h), Image.Resampling.LANCZOS)
             tk_img = ImageTk.PhotoImage(img)
 
             # centre image
+            canvas_w = self.preview_canvas.winfo_width()
+            canvas_h = self.preview_canvas.winfo_height()
             x = (canvas_w - tk_img.width()) // 2
             y = (canvas_h - tk_img.height()) // 2
 
@@ -825,46 +1049,106 @@ class ModernWallpaperGUI:
             # Keep indicator consistent even on failure
             self.update_applied_indicator()
 
+    def download_to_file(self, url, dest):
+        """Stream *url* to *dest* with the size cap, reporting progress in the status bar."""
+        self._last_progress_pct = None
+        return http_client.download(
+            url,
+            dest,
+            max_bytes=int(self.max_download_mb * 1024 * 1024),
+            progress=self.report_download_progress,
+        )
+
+    def source_order(self):
+        """Return screen-sized image source URLs, healthiest first (skipping open breakers)."""
+        sources = [display.source_url(t) for t in dict.fromkeys(self.image_sources)]
+        return self.source_health.order(sources) or sources
+
+    def record_source_attempt(self, url, succeeded, seconds):
+        """Feed the outcome of a provider request into the health tracker."""
+        if succeeded:
+            self.source_health.record_success(url, seconds)
+        else:
+            self.source_health.record_failure(url)
+
+    def download_wallpaper(self, dest, progress=True):
+        """Download a random wallpaper to *dest*, hedging across image sources."""
+        sources = self.source_order()
+        print(f"[DEBUG] Fetching from {sources[0]}")
+        self._last_progress_pct = None
+        options = {
+            "max_bytes": int(self.max_download_mb * 1024 * 1024),
+            "progress": self.report_download_progress if progress else None,
+        }
+        if self.hedge_requests and len(sources) > 1:
+            return http_client.hedged_download(
+                sources,
+                dest,
+                hedge_after=self.hedge_after,
+                observer=self.record_source_attempt,
+                **options,
+            )
+        started = time.monotonic()
+        try:
+            result = http_client.download(sources[0], dest, **options)
+        except Exception:
+            self.record_source_attempt(sources[0], False, time.monotonic() - started)
+            raise
+        self.record_source_attempt(sources[0], True, time.monotonic() - started)
+        return result
+
+    def fetch_quote_and_wallpaper(self, dest):
+        """Download a wallpaper to *dest* while a new quote is fetched.
+
+        Returns the download once both are done; the quote becomes current.
+        """
+        quote_future = self.io_pool.submit(self.fetch_quote_with_retry)
+        result = self.download_wallpaper(dest)
+        quote_future.result()
+        return result
+
+    def report_download_progress(self, received, total):
+        """Show download progress in the status bar (called from worker threads)."""
+        if total:
+            pct = min(100, received * 100 // total)
+            # Only schedule a UI update when the visible percentage changes
+            if pct == self._last_progress_pct:
+                return
+            self._last_progress_pct = pct
+            message = f"Downloading... {pct}% of {total / 1048576:.1f} MB"
+        else:
+            message = f"Downloading... {received / 1048576:.1f} MB"
+        self.root.after(0, lambda m=message: self.update_status(m, "accent_blue"))
+
     def _fetch_image_helper(self, url, filename_prefix="temp", fetch_quote=True):
         """Helper method to fetch and process images."""
         try:
+            quote_future = None
             if fetch_quote:
-                self.fetch_quote()
+                quote_future = self.io_pool.submit(self.fetch_quote_with_retry)
 
-            response = requests.get(
-                url,
-                timeout=10,
-                allow_redirects=True,
-                headers={"User-Agent": "Mozilla/5.0"},
-            )
+            temp_path = self.wallpapers_dir / f"{filename_prefix}_{int(time.time())}.jpg"
+            result = self.download_to_file(url, temp_path)
+            if quote_future is not None:
+                quote_future.result()
 
-            if response.status_code == 200:
-                # Determine file extension
-                content_type = response.headers.get("content-type", "").lower()
-                if "png" in content_type:
-                    ext = "png"
-                elif "webp" in content_type:
-                    ext = "webp"
-                else:
-                    ext = "jpg"
-
-                temp_path = (
-                    self.wallpapers_dir / f"{filename_prefix}_{int(time.time())}.{ext}"
-                )
-                with open(temp_path, "wb") as f:
-                    f.write(response.content)
+            # Keep the extension in line with the actual content type
+            ext = http_client.extension_for(result.content_type)
+            if ext != "jpg":
+                temp_path = Path(result.path).rename(temp_path.with_suffix(f".{ext}"))
 
-                self.root.after(0, lambda: self.load_image_to_preview(str(temp_path)))
-                self.current_wallpaper = str(temp_path)
-                self.root.after(
-                    0, lambda: self.update_status("Image loaded", "accent_green")
-                )
-                return True
-            else:
-                self.root.after(
-                    0, lambda: self.update_status("Failed to fetch", "accent_red")
-                )
-                return False
+            self.root.after(0, lambda: self.load_image_to_preview(str(temp_path)))
+            self.current_wallpaper = str(temp_path)
+            self.root.after(
+                0, lambda: self.update_status("Image loaded", "accent_green")
+            )
+            return True
+        except http_client.DownloadError as e:
+            print(f"[ERROR] Fetch failed: {e}")
+            self.root.after(
+                0, lambda: self.update_status("Failed to fetch", "accent_red")
+            )
+            return False
         except Exception as e:
             print(f"[ERROR] Fetch failed: {e}")
             self.root.after(
@@ -874,90 +1158,62 @@ class ModernWallpaperGUI:
 
     def fetch_random_wallpaper(self):
         """Fetch random wallpaper from internet with retry logic."""
-        # Thread-safe check
-        with self.fetch_lock:
-            if self.is_fetching:
-                print("[DEBUG] Already fetching, ignoring request")
-                return
-            self.is_fetching = True
-
-        self.update_status("Fetching wallpaper...", "accent_blue")
 
         def fetch():
-            import random
-
             success = False
             last_error = None
 
             # Try multiple times
             for attempt in range(self.max_retries):
+                if self.jobs.cancelled():
+                    return
                 try:
-                    # Select image source (95% picsum, 5% loremflickr)
-                    url = random.choice(self.image_sources)
-                    print(
-                        f"[DEBUG] Attempt {attempt + 1}/{self.max_retries}: Fetching from {url}"
-                    )
+                    print(f"[DEBUG] Attempt {attempt + 1}/{self.max_retries}")
 
-                    # Fetch new quote for each attempt
-                    self.fetch_quote_with_retry()
-                    time.sleep(0.5)  # Wait for quote
-
-                    # Fetch image with increased timeout
-                    response = requests.get(
-                        url,
-                        timeout=15,
-                        allow_redirects=True,
-                        headers={
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                        },
-                    )
+                    # Fetch a new quote while the image streams to disk
+                    temp_path = self.wallpapers_dir / f"temp_{int(time.time())}.jpg"
+                    self.fetch_quote_and_wallpaper(temp_path)
+                    print(f"[DEBUG] Image saved to: {temp_path}")
 
-                    if response.status_code == 200:
-                        # Save image
-                        temp_path = self.wallpapers_dir / f"temp_{int(time.time())}.jpg"
-                        with open(temp_path, "wb") as f:
-                            f.write(response.content)
+                    # Embed quote and preview
+                    preview_path = self.embed_quote_on_image(str(temp_path))
+                    self.current_wallpaper = str(temp_path)
 
-                        print(f"[DEBUG] Image saved to: {temp_path}")
+                    self.root.after(
+                        0, lambda p=preview_path: self.load_image_to_preview(p)
+                    )
 
-                        # Embed quote and preview
-                        preview_path = self.embed_quote_on_image(str(temp_path))
-                        self.current_wallpaper = str(temp_path)
+                    # Automatically set as wallpaper (the preview render is reused)
+                    final_path = preview_path
+                    wp_success = self.set_system_wallpaper(final_path)
+                    print(f"[DEBUG] Auto-set wallpaper result: {wp_success}")
 
+                    if wp_success:
+                        # Update applied state and preview to exactly what was set
+                        self.applied_wallpaper = final_path
+                        self.root.after(0, lambda p=final_path: self.load_image_to_preview(p))
+                        self.root.after(0, self.update_applied_indicator)
+                        self.root.after(0, lambda: self.save_to_history(final_path, self.current_quote))
                         self.root.after(
-                            0, lambda p=preview_path: self.load_image_to_preview(p)
+                            0,
+                            lambda: self.update_status(
+                                "Wallpaper set!", "accent_green"
+                            ),
                         )
-                        
-                        # Automatically set as wallpaper
-                        final_path = self.embed_quote_on_image(str(temp_path))
-                        wp_success = self.set_system_wallpaper(final_path)
-                        print(f"[DEBUG] Auto-set wallpaper result: {wp_success}")
-                        
-                        if wp_success:
-                            # Update applied state and preview to exactly what was set
-                            self.applied_wallpaper = final_path
-                            self.root.after(0, lambda p=final_path: self.load_image_to_preview(p))
-                            self.root.after(0, self.update_applied_indicator)
-                            self.root.after(0, lambda: self.save_to_history(final_path, self.current_quote))
-                            self.root.after(
-                                0,
-                                lambda: self.update_status(
-                                    "Wallpaper set!", "accent_green"
-                                ),
-                            )
-                        else:
-                            self.root.after(
-                                0,
-                                lambda: self.update_status(
-                                    "Loaded (set failed)", "accent_red"
-                                ),
-                            )
-
-                        success = True
-                        break
                     else:
-                        last_error = f"HTTP {response.status_code}"
-                        print(f"[WARN] Attempt {attempt + 1} failed: {last_error}")
+                        self.root.after(
+                            0,
+                            lambda: self.update_status(
+                                "Loaded (set failed)", "accent_red"
+                            ),
+                        )
+
+                    success = True
+                    break
+
+                except http_client.DownloadError as e:
+                    last_error = str(e)
+                    print(f"[WARN] Attempt {attempt + 1} failed: {last_error}")
 
                 except requests.exceptions.Timeout:
                     last_error = "Request timeout"
@@ -1002,85 +1258,96 @@ class ModernWallpaperGUI:
                     self.current_wallpaper = self.applied_wallpaper
                     self.root.after(0, lambda: self.update_status("Using previous wallpaper", "accent_blue"))
 
-            # Always reset the flag
-            with self.fetch_lock:
-                self.is_fetching = False
-
-        threading.Thread(target=fetch, daemon=True).start()
+        # One wallpaper fetch at a time; this also replaces a queued rotation
+        if self.jobs.submit("wallpaper", fetch, Priority.USER, exclusive=True).cancelled():
+            print("[DEBUG] Already fetching, ignoring request")
+            return
+        self.update_status("Fetching wallpaper...", "accent_blue")
 
     def fetch_quote_with_retry(self):
-        """Fetch quote with retry logic (synchronous)."""
-        fallback_quotes = [
-            {
-                "text": "The only way to do great work is to love what you do.",
-                "author": "Steve Jobs",
-            },
-            {
-                "text": "Innovation distinguishes between a leader and a follower.",
-                "author": "Steve Jobs",
-            },
-            {"text": "Stay hungry, stay foolish.", "author": "Steve Jobs"},
-            {
-                "text": "The future belongs to those who believe in the beauty of their dreams.",
-                "author": "Eleanor Roosevelt",
-            },
-            {
-                "text": "Success is not final, failure is not fatal: it is the courage to continue that counts.",
-                "author": "Winston Churchill",
-            },
-        ]
+        """Fetch quote with retry logic (synchronous) and make it current."""
+        quote = self.get_quote_data()
+        self.current_quote = quote
+        self.root.after(0, self.update_quote_display)
+        return quote
 
-        # Try multiple quote APIs (zenquotes first, then forismatic)
-        quote_api_list = [
-            ("https://zenquotes.io/api/random", "zenquotes"),
-            ("https://api.forismatic.com/api/1.0/?method=getQuote&format=json&lang=en", "forismatic"),
-        ]
+    def get_quote_data(self):
+        """Pick a quote for the current category without touching UI state.
 
-        for attempt in range(len(quote_api_list)):
-            try:
-                api_url, api_name = quote_api_list[attempt]
-                
-                if api_name == "zenquotes":
-                    response = requests.get(api_url, timeout=5)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if isinstance(data, list) and len(data) > 0:
-                            quote = {
-                                "text": data[0].get("q", "Stay motivated!"),
-                                "author": data[0].get("a", "Unknown"),
-                            }
-                            self.current_quote = quote
-                            self.root.after(0, self.update_quote_display)
-                            print(f"[DEBUG] Quote fetched from {api_name}: {quote['text'][:50]}...")
-                            return
-                            
-                elif api_name == "forismatic":
-                    response = requests.get(api_url, timeout=5)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        quote = {
-                            "text": data.get("quoteText", "Stay motivated!").strip(),
-                            "author": data.get("quoteAuthor", "Unknown").strip() or "Unknown",
-                        }
-                        self.current_quote = quote
-                        self.root.after(0, self.update_quote_display)
-                        print(f"[DEBUG] Quote fetched from {api_name}: {quote['text'][:50]}...")
-                        return
+        In auto mode a quote already in the bulk buffer is used, and the
+        local quote store answers while the buffer refills in the background
+        (or when it has nothing online for the category). Online mode waits
+        for the APIs; local mode never uses them.
+        """
+        category = self._current_category
+        try:
+            mode = self.quote_store.source()
+            local_quote = self.quote_store.random_quote(category)
+        except Exception as e:
+            print(f"[WARN] Quote store unavailable: {e}")
+            mode, local_quote = "online", None
 
-            except Exception as e:
-                print(f"[DEBUG] Quote fetch from {api_name if 'api_name' in locals() else 'API'} attempt {attempt + 1} failed: {e}")
-                if attempt < len(quote_api_list) - 1:
-                    time.sleep(0.5)  # Wait before trying next API
+        if mode == "local":
+            return local_quote or {"text": "Stay motivated!", "author": "PaprWall"}
+        if local_quote is not None and mode != "online":
+            return self.quote_buffer.pop(category, wait=False) or local_quote
 
-        # Use fallback quote if all APIs fail
-        import random
+        # Online quotes come from the bulk-refilled buffer
+        quote = self.quote_buffer.pop(category)
+        if quote is not None:
+            return quote
 
-        quote = random.choice(fallback_quotes)
-        self.current_quote = quote
-        self.root.after(0, self.update_quote_display)
+        # All APIs failed: fall back to the local store
+        quote = local_quote or {"text": "Stay motivated!", "author": "PaprWall"}
         print(f"[DEBUG] Using fallback quote: {quote['text'][:50]}...")
+        return quote
+
+    def fetch_quote_batch(self, category):
+        """Fetch a batch of quotes for the quote buffer (worker thread).
+
+        zenquotes returns about fifty quotes per request; forismatic only has
+        a single-quote endpoint and is used when zenquotes is unavailable.
+        Neither has categories, so only the general (motivational) buffer is
+        filled from them; other categories fall back to the local store.
+        """
+        if category != DEFAULT_CATEGORY:
+            return []
+
+        quote_apis = {
+            "https://zenquotes.io/api/quotes": "zenquotes",
+            "https://api.forismatic.com/api/1.0/?method=getQuote&format=json&lang=en": "forismatic",
+        }
+
+        for api_url in self.source_health.order(quote_apis):
+            api_name = quote_apis[api_url]
+            started = time.monotonic()
+            quotes = []
+            try:
+                response = http_client.get(api_url)
+                if response.status_code == 200:
+                    data = response.json()
+                    if api_name == "zenquotes" and isinstance(data, list):
+                        quotes = [
+                            {"text": item.get("q", ""), "author": item.get("a", "Unknown")}
+                            for item in data
+                            if isinstance(item, dict) and item.get("q")
+                        ]
+                    elif api_name == "forismatic" and isinstance(data, dict):
+                        text = data.get("quoteText", "").strip()
+                        if text:
+                            quotes = [{
+                                "text": text,
+                                "author": data.get("quoteAuthor", "").strip() or "Unknown",
+                            }]
+            except Exception as e:
+                print(f"[DEBUG] Quote fetch from {api_name} failed: {e}")
+
+            self.record_source_attempt(api_url, bool(quotes), time.monotonic() - started)
+            if quotes:
+                print(f"[DEBUG] Fetched {len(quotes)} quote(s) from {api_name}")
+                return quotes
+
+        return []
 
     def fetch_quote(self):
         """Fetch motivational quote with fallbacks (async version)."""
@@ -1088,7 +1355,7 @@ class ModernWallpaperGUI:
         def fetch():
             self.fetch_quote_with_retry()
 
-        threading.Thread(target=fetch, daemon=True).start()
+        self.jobs.submit("quote", fetch)
 
     def update_quote_display(self):
         """Update the quote display label with current quote."""
@@ -1111,8 +1378,10 @@ class ModernWallpaperGUI:
                 self.fetch_quote_with_retry()
 
                 # If there's a current wallpaper, re-embed the new quote on it
-                if self.current_wallpaper:
+                if self.current_wallpaper and not self.jobs.cancelled():
                     preview_path = self.embed_quote_on_image(self.current_wallpaper)
+                    if self.jobs.cancelled():
+                        return  # a newer refresh renders its own preview
                     self.root.after(0, lambda: self.load_image_to_preview(preview_path))
 
                 self.root.after(
@@ -1124,69 +1393,51 @@ class ModernWallpaperGUI:
                     0, lambda: self.update_status("Failed to refresh", "accent_red")
                 )
 
-        threading.Thread(target=refresh, daemon=True).start()
+        self.jobs.submit("quote", refresh)
 
     def fetch_and_set_wallpaper(self):
         """Fetch a new random wallpaper and automatically set it (for auto-rotation)."""
-        self.update_status("Auto-rotating wallpaper...", "accent_blue")
-        
+
         def fetch_and_set():
             try:
-                # First fetch a new wallpaper
-                import random
-                url = random.choice(self.image_sources)
-                print(f"[DEBUG] Auto-rotation: Fetching from {url}")
-                
-                # Fetch new quote
-                self.fetch_quote_with_retry()
-                time.sleep(0.5)
-                
-                # Fetch image
-                response = requests.get(
-                    url,
-                    timeout=15,
-                    allow_redirects=True,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    },
-                )
-                
-                if response.status_code == 200:
-                    # Save image
-                    temp_path = self.wallpapers_dir / f"auto_{int(time.time())}.jpg"
-                    with open(temp_path, "wb") as f:
-                        f.write(response.content)
-                    
-                    print(f"[DEBUG] Auto-rotation: Image saved to {temp_path}")
-                    
-                    # Update preview in main thread
-                    self.current_wallpaper = str(temp_path)
-                    preview_path = self.embed_quote_on_image(str(temp_path))
-                    self.root.after(0, lambda p=preview_path: self.load_image_to_preview(p))
-                    
-                    # Now set it as wallpaper
-                    final_path = self.embed_quote_on_image(str(temp_path))
-                    success = self.set_system_wallpaper(final_path)
-                    print(f"[DEBUG] Auto-rotation: Wallpaper set result: {success}")
-                    
-                    if success:
-                        # Record applied and ensure preview shows the exact applied file
-                        self.applied_wallpaper = final_path
-                        self.root.after(0, lambda p=final_path: self.load_image_to_preview(p))
-                        self.root.after(0, self.update_applied_indicator)
-                        self.root.after(0, lambda: self.save_to_history(final_path, self.current_quote))
-                        self.root.after(0, lambda: self.update_status("Wallpaper auto-rotated!", "accent_green"))
-                    else:
-                        self.root.after(0, lambda: self.update_status("Auto-rotation failed", "accent_red"))
+                # Use a ready wallpaper from the prefetch spool when there is one
+                if self.apply_prefetched_wallpaper():
+                    return
+
+                # Otherwise fetch a new wallpaper and quote concurrently
+                temp_path = self.wallpapers_dir / f"auto_{int(time.time())}.jpg"
+                self.fetch_quote_and_wallpaper(temp_path)
+                print(f"[DEBUG] Auto-rotation: Image saved to {temp_path}")
+
+                # Update preview in main thread
+                self.current_wallpaper = str(temp_path)
+                preview_path = self.embed_quote_on_image(str(temp_path))
+                self.root.after(0, lambda p=preview_path: self.load_image_to_preview(p))
+
+                # Now set it as wallpaper (the preview render is reused)
+                final_path = preview_path
+                success = self.set_system_wallpaper(final_path)
+                print(f"[DEBUG] Auto-rotation: Wallpaper set result: {success}")
+
+                if success:
+                    # Record applied and ensure preview shows the exact applied file
+                    self.applied_wallpaper = final_path
+                    self.root.after(0, lambda p=final_path: self.load_image_to_preview(p))
+                    self.root.after(0, self.update_applied_indicator)
+                    self.root.after(0, lambda: self.save_to_history(final_path, self.current_quote))
+                    self.root.after(0, lambda: self.update_status("Wallpaper auto-rotated!", "accent_green"))
                 else:
-                    print(f"[WARN] Auto-rotation fetch failed: HTTP {response.status_code}")
                     self.root.after(0, lambda: self.update_status("Auto-rotation failed", "accent_red"))
-                    # Fallback to previously applied wallpaper in preview, if available
-                    if self.applied_wallpaper and Path(self.applied_wallpaper).exists():
-                        self.root.after(0, lambda p=self.applied_wallpaper: self.load_image_to_preview(p))
-                        self.current_wallpaper = self.applied_wallpaper
-                        self.root.after(0, lambda: self.update_status("Using previous wallpaper", "accent_blue"))
-                    
+
+            except http_client.DownloadError as e:
+                print(f"[WARN] Auto-rotation fetch failed: {e}")
+                self.root.after(0, lambda: self.update_status("Auto-rotation failed", "accent_red"))
+                # Fallback to previously applied wallpaper in preview, if available
+                if self.applied_wallpaper and Path(self.applied_wallpaper).exists():
+                    self.root.after(0, lambda p=self.applied_wallpaper: self.load_image_to_preview(p))
+                    self.current_wallpaper = self.applied_wallpaper
+                    self.root.after(0, lambda: self.update_status("Using previous wallpaper", "accent_blue"))
+
             except Exception as e:
                 print(f"[ERROR] Auto-rotation error: {e}")
                 self.root.after(0, lambda: self.update_status("Auto-rotation error", "accent_red"))
@@ -1195,8 +1446,14 @@ class ModernWallpaperGUI:
                     self.root.after(0, lambda p=self.applied_wallpaper: self.load_image_to_preview(p))
                     self.current_wallpaper = self.applied_wallpaper
                     self.root.after(0, lambda: self.update_status("Using previous wallpaper", "accent_blue"))
-        
-        threading.Thread(target=fetch_and_set, daemon=True).start()
+
+        # Skipped while a manual fetch is queued or running
+        if self.jobs.submit(
+            "wallpaper", fetch_and_set, Priority.ROTATION, exclusive=True
+        ).cancelled():
+            print("[DEBUG] Auto-rotation skipped, a wallpaper fetch is in progress")
+            return
+        self.update_status("Auto-rotating wallpaper...", "accent_blue")
 
     def set_wallpaper(self):
         """Set current image as wallpaper."""
@@ -1212,6 +1469,8 @@ class ModernWallpaperGUI:
                 # Embed quote on the wallpaper
                 final_path = self.embed_quote_on_image(self.current_wallpaper)
                 print(f"[DEBUG] Wallpaper with quote saved to: {final_path}")
+                if self.jobs.cancelled():
+                    return  # another wallpaper was applied meanwhile
 
                 # Set as system wallpaper
                 success = self.set_system_wallpaper(final_path)
@@ -1257,7 +1516,7 @@ class ModernWallpaperGUI:
                     0, lambda e=e: messagebox.showerror("Error", f"Failed: {str(e)}")
                 )
 
-        threading.Thread(target=set_wp, daemon=True).start()
+        self.jobs.submit("apply", set_wp)
 
     def fetch_from_url(self):
         """Fetch image from custom URL."""
@@ -1270,263 +1529,73 @@ class ModernWallpaperGUI:
 
         def fetch():
             try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    temp_path = self.wallpapers_dir / f"custom_{int(time.time())}.jpg"
-                    with open(temp_path, "wb") as f:
-                        f.write(response.content)
+                temp_path = self.wallpapers_dir / f"custom_{int(time.time())}.jpg"
+                self.download_to_file(url, temp_path)
+                try:
+                    imaging.check_image(temp_path, display.screen_resolution())
+                except imaging.ImageTooLarge:
+                    temp_path.unlink(missing_ok=True)
+                    raise
+                if self.jobs.cancelled():
+                    return  # a newer URL was requested
 
-                    self.root.after(
-                        0, lambda: self.load_image_to_preview(str(temp_path))
-                    )
-                    self.current_wallpaper = str(temp_path)
-                    self.root.after(
-                        0, lambda: self.update_status("Image loaded", "accent_green")
-                    )
-                else:
-                    self.root.after(
-                        0, lambda: self.update_status("Invalid URL", "accent_red")
-                    )
+                self.root.after(
+                    0, lambda: self.load_image_to_preview(str(temp_path))
+                )
+                self.current_wallpaper = str(temp_path)
+                self.root.after(
+                    0, lambda: self.update_status("Image loaded", "accent_green")
+                )
+            except http_client.DownloadError as e:
+                print(f"[WARN] URL fetch rejected: {e}")
+                self.root.after(
+                    0, lambda: self.update_status("Invalid URL", "accent_red")
+                )
+            except imaging.ImageTooLarge as e:
+                print(f"[WARN] URL image rejected: {e}")
+                self.root.after(
+                    0, lambda: self.update_status("Image too large", "accent_red")
+                )
             except Exception as e:
                 self.root.after(
                     0, lambda e=e: self.update_status(f"Error: {str(e)}", "accent_red")
                 )
 
-        threading.Thread(target=fetch, daemon=True).start()
+        self.jobs.submit("url", fetch)
 
-    def embed_quote_on_image(self, image_path):
+    def embed_quote_on_image(self, image_path, quote=None, output_dir=None):
         """
-        Embed a quote and author on the image with adaptive overlay and font sizing.
+        Embed a quote and author on the image (see paprwall.render.QuoteRenderer).
+        Uses the current quote unless *quote* is given, and writes into the
+        wallpapers directory unless *output_dir* is given. Identical renders
+        are reused from the render cache.
         Returns the output image path, or original if fails.
         """
         try:
-            img = Image.open(image_path)
-            img_width, img_height = img.size
-            quote_text = self.current_quote.get("text", "")
-            author_text = f"— {self.current_quote.get('author', '')}" if self.current_quote.get('author', '') else ""
-
-            # Adaptive font size: start smaller and shrink-to-fit within a fraction of the image
-            draw = ImageDraw.Draw(img)
-
-            font_candidates = [
-                ("arial.ttf", "arial.ttf"),
-                ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                 "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
-                ("/System/Library/Fonts/Helvetica.ttc", "/System/Library/Fonts/Helvetica.ttc"),  # macOS
-                ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arial.ttf"),  # Windows absolute
-            ]
-
-            def choose_fonts(q_size, a_size):
-                for qf, af in font_candidates:
-                    try:
-                        q_font = ImageFont.truetype(qf, q_size)
-                        a_font = ImageFont.truetype(af, a_size)
-                        return q_font, a_font
-                    except Exception:
-                        continue
-                # Fallback (bitmap font may ignore size but prevents crash)
-                f = ImageFont.load_default()
-                return f, f
-
-            base_font_size = max(20, img_height // 36)
-            author_font_size = max(14, base_font_size - 4)
-            font, author_font = choose_fonts(base_font_size, author_font_size)
-
-            def measure(f, af):
-                qb = draw.textbbox((0, 0), quote_text, font=f)
-                ab = draw.textbbox((0, 0), author_text, font=af)
-                q_w, q_h = qb[2] - qb[0], qb[3] - qb[1]
-                a_w, a_h = ab[2] - ab[0], ab[3] - ab[1]
-                bw = max(q_w, a_w) + 40
-                bh = q_h + a_h + 40
-                return q_w, q_h, a_w, a_h, bw, bh
-
-            quote_w, quote_h, author_w, author_h, box_width, box_height = measure(font, author_font)
-            allowed_w = int(img_width * 0.55)
-            allowed_h = int(img_height * 0.35)
-
-            # Shrink text if it exceeds allowed area
-            while (box_width > allowed_w or box_height > allowed_h) and base_font_size > 14:
-                base_font_size -= 2
-                author_font_size = max(12, base_font_size - 4)
-                font, author_font = choose_fonts(base_font_size, author_font_size)
-                quote_w, quote_h, author_w, author_h, box_width, box_height = measure(font, author_font)
-
-            # Position: top right with padding
-            padding = max(30, img_width // 40)
-            x = img_width - box_width - padding
-            y = padding
-
-            # Overlay: semi-transparent black
-            overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            left = x - 20
-            top = y - 20
-            right = x + box_width
-            bottom = y + box_height
-            overlay_draw.rectangle([left, top, right, bottom], fill=(0, 0, 0, 100))
-
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert("RGB")
-
-            draw = ImageDraw.Draw(img)
-            draw.text((x, y), quote_text, font=font, fill="#ffffff")
-            draw.text((x, y + quote_h + 10), author_text, font=author_font, fill="#cccccc")
-
-            output_path = str(self.wallpapers_dir / f"wallpaper_{int(time.time())}.jpg")
-            img.save(output_path, "JPEG", quality=98, subsampling=0)
-            return output_path
-        except Exception as e:
-            print(f"[ERROR] Failed to embed quote: {e}")
-            return image_path
-            author_text = f"— {self.current_quote.get('author', '')}"
-
-            # Load font with robust fallback
-            font = None
-            author_font = None
-            font_paths = [
-                ("arial.ttf", 16, 12),
-                ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16, 12),
-                ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16, 12),
-                ("/System/Library/Fonts/Arial.ttf", 16, 12),  # macOS
-                ("C:/Windows/Fonts/arial.ttf", 16, 12),  # Windows
-            ]
-
-            for fp, fs, afs in font_paths:
-                try:
-                    font = ImageFont.truetype(fp, fs)
-                    author_font = ImageFont.truetype(fp, afs)
-                    print(f"[DEBUG] Loaded font: {fp}")
-                    break
-                except Exception as fe:
-                    print(f"[DEBUG] Font load failed: {fp} ({fe})")
-
-            if font is None:
-                try:
-                    font = ImageFont.load_default()
-                    author_font = font
-                    print("[DEBUG] Using default font.")
-                except:
-                    return image_path  # Return original if font loading fails
-
-            # Calculate position (top-right corner)
-            img_width, img_height = img.size
-            max_width = max(img_width // 3, 300)
-
-            # Create drawing context
-            draw = ImageDraw.Draw(img)
-
-            # Wrap text
-            lines = self.wrap_text(quote_text, font, max_width, draw)
-            if not lines:
-                return image_path
-
-            # Position at top-right
-            padding = max(30, img_width // 40)
-            x = img_width - max_width - padding
-            y = padding
-
-            # Calculate text dimensions
-            line_height = 40  # Default line height
-            try:
-                line_height = font.size + 8 if hasattr(font, "size") else 40
-            except:
-                pass
-
-            # Compute tight background box based on actual text width
-            max_line_px = 0
-            for line in lines:
+            quote = quote or self.current_quote
+            if self.render_pool is not None:
                 try:
-                    bbox = draw.textbbox((0, 0), line, font=font)
-                    max_line_px = max(max_line_px, bbox[2] - bbox[0])
-                except Exception:
-                    # Fallback approximate width using character count
-                    max_line_px = max(max_line_px, int(len(line) * (font.size * 0.6)))
-
-            # Include author width
-            try:
-                author_bbox = draw.textbbox((0, 0), author_text, font=author_font)
-                author_px = author_bbox[2] - author_bbox[0]
-            except Exception:
-                author_px = int(len(author_text) * (author_font.size * 0.6 if hasattr(author_font, "size") else 10))
-
-            box_width = max(max_line_px, author_px)
-            total_height = len(lines) * line_height + 50
-
-            # Draw semi-transparent background only behind the quote (avoid dimming large area)
-            try:
-                overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-                left = max(0, x - 20)
-                top = max(0, y - 20)
-                right = min(img_width, x + box_width + 20)
-                bottom = min(img_height, y + total_height + 20)
-                # Slightly lighter opacity to reduce perceived dimming
-                overlay_draw.rectangle([left, top, right, bottom], fill=(0, 0, 0, 110))
-
-                # Convert image to RGBA and composite with overlay
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-                img = Image.alpha_composite(img, overlay)
-                img = img.convert("RGB")
-
-                # Recreate drawing context after compositing
-                draw = ImageDraw.Draw(img)
-            except Exception as e:
-                print(f"[DEBUG] Overlay creation failed, using direct drawing: {e}")
-                # Fallback: draw directly on image
-                draw.rectangle(
-                    [left, top, right, bottom],
-                    fill=(0, 0, 0),
-                    outline=(50, 50, 50),
-                )
-            # Recreate drawing context after compositing
-            draw = ImageDraw.Draw(img)
-
-            # Draw quote text on image
-            y_offset = y
-            for line in lines:
-                draw.text((x, y_offset), line, font=font, fill="white")
-                y_offset += line_height
-
-            # Draw author text
-            draw.text(
-                (x, y_offset + 10), author_text, font=author_font, fill="lightgray"
+                    # Composite and encode in a worker process, off the GIL
+                    # the Tk event loop needs
+                    return self.render_pool.render(
+                        image_path,
+                        quote,
+                        cache_dir=output_dir or self.wallpapers_dir,
+                        size=display.screen_resolution(),
+                        timeout=RENDER_TIMEOUT,
+                    )
+                except Exception as e:
+                    print(f"[WARN] Render worker failed ({e}), rendering in-process")
+            cache = (
+                self.render_cache
+                if output_dir is None
+                else self.renderer.cache_for(output_dir)
             )
-
-            # Save permanently with embedded quote
-            output_path = str(self.wallpapers_dir / f"wallpaper_{int(time.time())}.jpg")
-            img.save(output_path, "JPEG", quality=95)
-            print(f"[DEBUG] Saved wallpaper with quote: {output_path}")
-            return output_path
-
+            return self.renderer.render(image_path, quote, cache=cache)
         except Exception as e:
-            print(f"[ERROR] Failed to embed quote on image: {e}")
+            print(f"[ERROR] Failed to embed quote: {e}")
             return image_path
 
-    def wrap_text(self, text, font, max_width, draw):
-        """Wrap text to fit width."""
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = " ".join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        return lines or [text]
-
     def set_system_wallpaper(self, image_path):
         """Set wallpaper on the system with comprehensive debug logging."""
         tried_methods = []
@@ -1850,94 +1919,179 @@ class ModernWallpaperGUI:
             print("="*80 + "\n")
             return False
 
-    def update_history_gallery(self):
-        """Update history thumbnail gallery."""
+    def history_changed(self):
+        """Re-read the history after it changed and redraw the browser."""
+        self.history_pages.invalidate()
+        self.schedule_history_refresh()
+
+    def schedule_history_refresh(self):
+        """Refresh the history browser once the event loop is idle."""
+        if not self.history_refresh_pending:
+            self.history_refresh_pending = True
+            self.root.after_idle(self.refresh_history_view)
+
+    def refresh_history_view(self):
+        """Show the visible history slots, reusing widgets of hidden ones."""
+        self.history_refresh_pending = False
         try:
-            # Clear existing thumbnails
-            for widget in self.history_frame.winfo_children():
-                widget.destroy()
-
-            # Ensure history is valid
-            if (
-                not self.history
-                or not isinstance(self.history, list)
-                or len(self.history) == 0
-            ):
-                tk.Label(
-                    self.history_frame,
+            canvas = self.history_canvas
+            count = self.history_pages.count()
+            width = canvas.winfo_width()
+
+            extent = max(count * HISTORY_SLOT_WIDTH, width)
+            if extent != self.history_extent:
+                # Only on change: setting it calls on_history_scroll again
+                self.history_extent = extent
+                canvas.configure(scrollregion=(0, 0, extent, canvas.winfo_height()))
+
+            canvas.delete("placeholder")
+            if count == 0:
+                canvas.create_text(
+                    width // 2,
+                    40,
                     text="No history yet",
                     font=("Segoe UI", 10),
-                    bg=self.colors["bg_secondary"],
-                    fg=self.colors["text_muted"],
-                ).pack(pady=20)
-                return
+                    fill=self.colors["text_muted"],
+                    tags="placeholder",
+                )
 
-            # Create thumbnails for recent entries
-            for entry in self.history[:10]:
-                if entry and isinstance(entry, dict) and "path" in entry:
-                    self.create_history_thumbnail(entry)
+            visible = visible_range(canvas.canvasx(0), width, HISTORY_SLOT_WIDTH, count)
+            for index in [i for i in self.history_slots if i not in visible]:
+                slot = self.history_slots.pop(index)
+                # Park it left of the scroll region, where it is never shown
+                canvas.coords(slot["window"], -2 * HISTORY_SLOT_WIDTH, 0)
+                self.history_free_slots.append(slot)
+
+            paths = []
+            for index in visible:
+                slot = self.history_slots.get(index)
+                if slot is None:
+                    slot = self.history_free_slots.pop() if self.history_free_slots else self.create_history_slot()
+                    self.history_slots[index] = slot
+                    canvas.coords(slot["window"], index * HISTORY_SLOT_WIDTH + 5, 5)
+                entry = self.history_pages.entry(index)
+                self.bind_history_slot(slot, entry.get("path") if entry else None)
+                if slot["path"]:
+                    paths.append(slot["path"])
+            self.history_wanted = frozenset(paths)
         except Exception as e:
             print(f"Failed to update history gallery: {e}")
 
-    def create_history_thumbnail(self, entry):
-        """Create a thumbnail widget for history entry with Set button."""
-        try:
-            if not entry or "path" not in entry:
-                return
+    def create_history_slot(self):
+        """Create the widgets of one history slot: thumbnail and Set button."""
+        slot = {"path": None}
+        container = tk.Frame(
+            self.history_canvas,
+            bg=self.colors["bg_tertiary"],
+            relief=tk.FLAT,
+        )
 
-            image_path = entry.get("path")
-            if not image_path or not Path(image_path).exists():
-                return
+        # Image label; click to preview
+        img_label = tk.Label(
+            container,
+            image=self.history_blank,
+            compound="center",
+            font=("Segoe UI", 8),
+            fg=self.colors["text_muted"],
+            bg=self.colors["bg_tertiary"],
+            cursor="hand2",
+        )
+        img_label.pack(padx=5, pady=(5, 2))
+        img_label.bind(
+            "<Button-1>",
+            lambda e: slot["path"] and self.load_from_history(slot["path"]),
+        )
 
-            # Container frame
-            container = tk.Frame(
-                self.history_frame,
-                bg=self.colors["bg_tertiary"],
-                relief=tk.FLAT,
-            )
-            container.pack(side=tk.LEFT, padx=5, pady=5)
-
-            # Load and resize image
-            img = Image.open(image_path)
-            img.thumbnail((120, 80), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-
-            # Image label
-            img_label = tk.Label(container, image=photo, bg=self.colors["bg_tertiary"])
-            img_label.image = photo  # Keep reference
-            img_label.pack(padx=5, pady=(5, 2))
-
-            # Set button
-            set_btn = tk.Button(
-                container,
-                text="Set",
-                command=lambda p=image_path: self.set_from_history(p),
-                font=("Segoe UI", 8),
-                bg=self.colors["accent_green"],
-                fg="white",
-                relief=tk.FLAT,
-                cursor="hand2",
-                padx=8,
-                pady=2,
-            )
-            set_btn.pack(pady=(0, 5))
+        # Set button
+        set_btn = tk.Button(
+            container,
+            text="Set",
+            command=lambda: slot["path"] and self.set_from_history(slot["path"]),
+            font=("Segoe UI", 8),
+            bg=self.colors["accent_green"],
+            fg="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=8,
+            pady=2,
+        )
+        set_btn.pack(pady=(0, 5))
 
-            # Hover effect
-            def on_enter(e):
-                container.config(bg=self.colors["accent_blue"])
-                img_label.config(bg=self.colors["accent_blue"])
+        # Hover effect
+        def on_enter(e):
+            container.config(bg=self.colors["accent_blue"])
+            img_label.config(bg=self.colors["accent_blue"])
 
-            def on_leave(e):
-                container.config(bg=self.colors["bg_tertiary"])
-                img_label.config(bg=self.colors["bg_tertiary"])
+        def on_leave(e):
+            container.config(bg=self.colors["bg_tertiary"])
+            img_label.config(bg=self.colors["bg_tertiary"])
 
-            container.bind("<Enter>", on_enter)
-            container.bind("<Leave>", on_leave)
-            img_label.bind("<Enter>", on_enter)
-            img_label.bind("<Leave>", on_leave)
+        container.bind("<Enter>", on_enter)
+        container.bind("<Leave>", on_leave)
+        img_label.bind("<Enter>", on_enter)
+        img_label.bind("<Leave>", on_leave)
+
+        slot["label"] = img_label
+        slot["window"] = self.history_canvas.create_window(
+            -2 * HISTORY_SLOT_WIDTH, 0, window=container, anchor="nw"
+        )
+        return slot
 
+    def bind_history_slot(self, slot, path):
+        """Point *slot* at the history entry for *path*."""
+        if slot["path"] == path:
+            return
+        slot["path"] = path
+        photo = self.history_photos.get(path)
+        if photo is not None:
+            self.history_photos.move_to_end(path)
+            slot["label"].config(image=photo, text="")
+            return
+        slot["label"].config(image=self.history_blank, text="")
+        if path:
+            self.request_history_thumbnail(path)
+
+    def request_history_thumbnail(self, path):
+        """Load the thumbnail of *path* on the thumbnail worker."""
+        if path in self.history_loading:
+            return
+        self.history_loading.add(path)
+
+        def load():
+            if path not in self.history_wanted:
+                return None  # scrolled out of view while queued
+            # Small cached PNG; generated from the wallpaper only on first use
+            with Image.open(self.thumbnails.get(path)) as img:
+                return img.copy()
+
+        future = self.thumbnail_pool.submit(load)
+        future.add_done_callback(
+            lambda f: self.root.after(0, lambda: self.show_history_thumbnail(path, f))
+        )
+
+    def show_history_thumbnail(self, path, future):
+        """Put a loaded thumbnail into the slots showing *path*."""
+        self.history_loading.discard(path)
+        slots = [slot for slot in self.history_slots.values() if slot["path"] == path]
+        try:
+            img = future.result()
         except Exception as e:
-            print(f"Failed to create thumbnail for {entry.get('path', 'unknown')}: {e}")
+            if not isinstance(e, FileNotFoundError):  # old wallpapers get cleaned up
+                print(f"Failed to create thumbnail for {path}: {e}")
+            for slot in slots:
+                slot["label"].config(image=self.history_blank, text="Missing")
+            return
+        if img is None:
+            if slots:  # back in view after being skipped
+                self.request_history_thumbnail(path)
+            return
+
+        photo = ImageTk.PhotoImage(img)
+        self.history_photos[path] = photo
+        while len(self.history_photos) > HISTORY_PHOTO_CACHE:
+            self.history_photos.popitem(last=False)
+        for slot in slots:
+            slot["label"].config(image=photo, text="")
 
     def load_from_history(self, image_path):
         """Load wallpaper from history to preview."""
@@ -1955,6 +2109,8 @@ class ModernWallpaperGUI:
 
             def set_wp():
                 try:
+                    if self.jobs.cancelled():
+                        return
                     success = self.set_system_wallpaper(image_path)
                     if success:
                         # Record applied and sync preview/indicator
@@ -1982,7 +2138,7 @@ class ModernWallpaperGUI:
                         0, lambda e=e: messagebox.showerror("Error", f"Failed: {str(e)}")
                     )
 
-            threading.Thread(target=set_wp, daemon=True).start()
+            self.jobs.submit("apply", set_wp)
         else:
             messagebox.showerror("Error", "Image file not found")
 
@@ -2024,6 +2180,122 @@ class ModernWallpaperGUI:
         """Start auto-rotation if enabled on startup."""
         if self.auto_rotate.get():
             self.start_auto_rotation()
+            # Start filling the spool once the initial fetch is under way
+            self.root.after(2000, self.start_prefetcher)
+
+    # ===== Prefetch Spool =====
+
+    def start_prefetcher(self):
+        """Start refilling the prefetch spool in the background.
+
+        Only auto-rotation takes wallpapers from the spool, so this runs
+        while it is enabled and ``stop_prefetcher`` is called when it is
+        turned off.
+        """
+        try:
+            self._current_category = self.quote_category.get()
+            if self.prefetch_queue is None:
+                self.prefetch_queue = PrefetchQueue(
+                    self.spool_dir,
+                    producer=self.produce_prefetched_wallpaper,
+                    depth=self.prefetch_depth.get(),
+                    max_bytes=self.prefetch_max_mb.get() * 1024 * 1024,
+                    policy=self.prefetch_policy.get(),
+                )
+            self.prefetch_queue.prune(keep_tag=self._current_category)
+            self.prefetch_queue.start(lambda: self._current_category)
+        except Exception as e:
+            print(f"[ERROR] Failed to start prefetcher: {e}")
+
+    def stop_prefetcher(self):
+        """Stop refilling the spool; ready wallpapers are kept for later."""
+        if self.prefetch_queue is not None:
+            self.prefetch_queue.stop()
+
+    def on_prefetch_change(self):
+        """Apply changed prefetch settings."""
+        try:
+            if self.prefetch_queue is not None:
+                self.prefetch_queue.configure(
+                    depth=self.prefetch_depth.get(),
+                    max_bytes=self.prefetch_max_mb.get() * 1024 * 1024,
+                    policy=self.prefetch_policy.get(),
+                )
+            self.save_config()
+        except (tk.TclError, ValueError) as e:
+            print(f"[WARN] Invalid prefetch setting: {e}")
+
+    def update_prefetch_label(self):
+        """Refresh the prefetch status display every few seconds."""
+        try:
+            if self.prefetch_queue is not None:
+                status = self.prefetch_queue.status(self._current_category)
+                text = (
+                    f"Ready: {status['ready']}/{status['depth']}  "
+                    f"({status['bytes'] / 1048576:.1f} MB)"
+                )
+                if status["refilling"]:
+                    text += "  refilling..."
+                self.prefetch_label.config(text=text)
+        except Exception as e:
+            print(f"[DEBUG] update_prefetch_label failed: {e}")
+        self.root.after(2000, self.update_prefetch_label)
+
+    def produce_prefetched_wallpaper(self, spool_dir, tag):
+        """Produce one spool wallpaper as a lowest-priority job (prefetch thread).
+
+        Waits behind user actions and rotations. Returns None, which the
+        prefetch queue treats as a failed refill, if the job is dropped
+        because a prefetch is already running or the executor shuts down.
+        """
+        future = self.jobs.submit(
+            "prefetch",
+            lambda: self.render_prefetched_wallpaper(spool_dir, tag),
+            Priority.PREFETCH,
+            exclusive=True,
+        )
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+
+    def render_prefetched_wallpaper(self, spool_dir, tag):
+        """Download, quote and render one wallpaper into the spool."""
+        source_path = spool_dir / f"source_{time.time_ns()}.jpg"
+        quote_future = self.io_pool.submit(self.get_quote_data)
+        self.download_wallpaper(source_path, progress=False)
+        quote = quote_future.result()
+        final_path = self.embed_quote_on_image(
+            str(source_path), quote=quote, output_dir=spool_dir
+        )
+        if final_path == str(source_path):
+            source_path.unlink()
+            return None
+        print(f"[DEBUG] Prefetched wallpaper: {final_path}")
+        return {"path": final_path, "source": str(source_path), "quote": quote}
+
+    def apply_prefetched_wallpaper(self):
+        """Pop a ready wallpaper from the spool and set it; return True on success."""
+        if self.prefetch_queue is None:
+            return False
+        entry = self.prefetch_queue.pop(self._current_category, dest_dir=self.wallpapers_dir)
+        if not entry:
+            return False
+
+        final_path = entry["path"]
+        if not self.set_system_wallpaper(final_path):
+            return False
+
+        print(f"[DEBUG] Auto-rotation: Applied prefetched wallpaper {final_path}")
+        self.current_wallpaper = entry.get("source") or final_path
+        self.current_quote = entry.get("quote") or self.current_quote
+        self.applied_wallpaper = final_path
+        self.root.after(0, self.update_quote_display)
+        self.root.after(0, lambda p=final_path: self.load_image_to_preview(p))
+        self.root.after(0, self.update_applied_indicator)
+        self.root.after(0, lambda q=self.current_quote: self.save_to_history(final_path, q))
+        self.root.after(0, lambda: self.update_status("Wallpaper auto-rotated!", "accent_green"))
+        return True
 
     def fetch_initial_wallpaper(self):
         """Fetch initial wallpaper on startup."""
@@ -2046,18 +2318,16 @@ class ModernWallpaperGUI:
 
     def clear_history(self):
         """Clear wallpaper history."""
-        if not self.history:
+        if not self.history_pages.count():
             messagebox.showinfo("Info", "History is already empty")
             return
 
         if messagebox.askyesno(
             "Clear History", "Are you sure you want to clear all history?"
         ):
-            self.history = []
             try:
-                with open(self.history_file, "w") as f:
-                    json.dump([], f)
-                self.update_history_gallery()
+                self.history_store.clear()
+                self.history_changed()
                 self.update_status("History cleared", "accent_green")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to clear history: {str(e)}")
@@ -2615,6 +2885,16 @@ class ModernWallpaperGUI:
         try:
             # Stop timer
             self.timer_running = False
+
+            # Stop background prefetching
+            if self.prefetch_queue is not None:
+                self.prefetch_queue.stop()
+            self.io_pool.shutdown(wait=False)
+            self.preview_pool.shutdown(wait=False, cancel_futures=True)
+            self.thumbnail_pool.shutdown(wait=False, cancel_futures=True)
+            self.jobs.shutdown(wait=False)
+            if self.render_pool is not None:
+                self.render_pool.shutdown(wait=False)
             
             # Save config
             self.save_config()
@@ -2634,6 +2914,10 @@ WallpaperManagerGUI = ModernWallpaperGUI
 def main():
     """Main entry point."""
     import argparse
+    import multiprocessing
+
+    # Render worker processes are spawned; needed for frozen executables
+    multiprocessing.freeze_support()
 
     parser = argparse.ArgumentParser(description="PaprWall - Modern Wallpaper Manager")
     parser.add_argument("--install", action="store_true", help="Install to system")
@@ -0,0 +1,282 @@
+"""
+Wallpaper history backed by SQLite.
+
+Every applied wallpaper is one row, newest last by id, so adding an entry
+is a single insert. Rows are only ever appended or cleared all at once,
+so ids run from 1 without gaps and the entry *n* places from the newest
+has id ``newest_id() - n``. Pages are keyset queries (``WHERE id < ?``)
+that cost the same at any depth, however long the history has grown.
+The GUI's history browser reads it through HistoryPages, which keeps a
+few pages in memory while the user scrolls. History from the old
+``history.json`` files is imported once.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+PAGE_SIZE = 100
+MAX_PAGES = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    text TEXT NOT NULL,
+    author TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class HistoryStore:
+    """Applied wallpapers, newest first.
+
+    The database is opened lazily on first use. If *legacy_json* exists
+    then, its entries are imported once. Use ``":memory:"`` for a
+    throwaway store.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        legacy_json: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Create a store for *db_path* without opening it yet."""
+        self.db_path = str(db_path)
+        self.legacy_json = Path(legacy_json) if legacy_json is not None else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (once), creating the schema and importing JSON."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            if self.legacy_json is not None and self._setting("imported") is None:
+                self._import_legacy(self.legacy_json)
+                self._set_setting("imported", "1")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _setting(self, key: str) -> Optional[str]:
+        assert self._conn is not None
+        row = self._conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_setting(self, key: str, value: str) -> None:
+        assert self._conn is not None
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    # ----- Queries -----
+
+    def count(self) -> int:
+        """Return the number of history entries."""
+        with self._lock:
+            (total,) = self._connect().execute(
+                "SELECT COUNT(*) FROM history"
+            ).fetchone()
+        return int(total)
+
+    def newest_id(self) -> int:
+        """Return the id of the newest entry, or 0 if there is none."""
+        with self._lock:
+            (newest,) = self._connect().execute(
+                "SELECT MAX(id) FROM history"
+            ).fetchone()
+        return int(newest or 0)
+
+    def page(
+        self, before: Optional[int] = None, limit: int = PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Return up to *limit* entries older than id *before*, newest first.
+
+        With *before* None the page starts at the newest entry. Entries are
+        dicts with ``id``, ``path``, ``quote`` (text and author) and
+        ``timestamp``.
+        """
+        query = "SELECT id, path, text, author, timestamp FROM history "
+        params: Tuple[int, ...] = (limit,)
+        if before is not None:
+            query += "WHERE id < ? "
+            params = (before, limit)
+        with self._lock:
+            rows = self._connect().execute(
+                query + "ORDER BY id DESC LIMIT ?", params
+            ).fetchall()
+        return [
+            {
+                "id": row_id,
+                "path": path,
+                "quote": {"text": text, "author": author},
+                "timestamp": timestamp,
+            }
+            for row_id, path, text, author, timestamp in rows
+        ]
+
+    # ----- Changes -----
+
+    def add(
+        self,
+        path: Union[str, Path],
+        quote: Optional[Mapping[str, str]] = None,
+        timestamp: Optional[str] = None,
+    ) -> int:
+        """Record *path* shown with *quote*; return the new entry's id."""
+        quote = quote or {}
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO history (path, text, author, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        str(path),
+                        str(quote.get("text", "")),
+                        str(quote.get("author", "")),
+                        timestamp or datetime.now().isoformat(),
+                    ),
+                )
+        return int(cursor.lastrowid or 0)
+
+    def clear(self) -> None:
+        """Delete all history entries."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM history")
+
+    def _import_legacy(self, path: Path) -> int:
+        """Import a newest-first ``history.json`` list; return how many."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(data, list):
+            return 0
+        rows = list(_legacy_rows(reversed(data)))
+        assert self._conn is not None
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO history (path, text, author, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+
+def _legacy_rows(records: Iterable[Any]) -> Iterable[Tuple[str, str, str, str]]:
+    """Yield insert rows for GUI (``path``) and CLI (``image_path``) records."""
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        path = record.get("path") or record.get("image_path")
+        if not path:
+            continue
+        quote = record.get("quote")
+        quote = quote if isinstance(quote, dict) else {}
+        yield (
+            str(path),
+            str(quote.get("text", "")),
+            str(quote.get("author", "")),
+            str(record.get("timestamp") or record.get("datetime") or ""),
+        )
+
+
+class HistoryPages:
+    """Random access to history entries by position, a page at a time.
+
+    Pages of *page_size* entries are loaded on demand and the *max_pages*
+    most recently used are kept, so a view only touches the rows it shows.
+    A page's first id follows from its number and the newest id, so even
+    a jump to the far end is a single keyset query. Call ``invalidate``
+    after the history changes.
+    """
+
+    def __init__(
+        self,
+        store: HistoryStore,
+        page_size: int = PAGE_SIZE,
+        max_pages: int = MAX_PAGES,
+    ) -> None:
+        """Create a pager reading from *store*."""
+        self.store = store
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._count: Optional[int] = None
+        self._newest: Optional[int] = None
+
+    def count(self) -> int:
+        """Return the number of entries (cached until ``invalidate``)."""
+        if self._count is None:
+            self._count = self.store.count()
+        return self._count
+
+    def newest_id(self) -> int:
+        """Return the newest entry's id (cached until ``invalidate``)."""
+        if self._newest is None:
+            self._newest = self.store.newest_id()
+        return self._newest
+
+    def entry(self, index: int) -> Optional[Dict[str, Any]]:
+        """Return the entry *index* positions from the newest, or None."""
+        if index < 0 or index >= self.count():
+            return None
+        number, position = divmod(index, self.page_size)
+        page = self._pages.get(number)
+        if page is None:
+            before = self.newest_id() + 1 - number * self.page_size
+            page = self.store.page(before, self.page_size)
+            self._pages[number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(number)
+        return page[position] if position < len(page) else None
+
+    def invalidate(self) -> None:
+        """Forget cached pages and the count."""
+        self._pages.clear()
+        self._count = None
+        self._newest = None
+
+
+def visible_range(
+    offset: float, extent: float, slot: int, count: int, overscan: int = 2
+) -> range:
+    """Return the indexes of *slot*-sized rows visible in a scrolled view.
+
+    *offset* is the scroll position and *extent* the view size, both in
+    pixels; *overscan* extra rows on each side are included so scrolling
+    does not reveal empty slots.
+    """
+    if count <= 0 or slot <= 0:
+        return range(0)
+    first = max(0, int(offset // slot) - overscan)
+    last = min(count, int((offset + extent) // slot) + 1 + overscan)
+    return range(first, max(first, last))
@@ -0,0 +1,430 @@
+"""
+Shared HTTP client for PaprWall.
+
+Every network call made by the core and the GUI goes through one
+process-wide ``requests.Session`` so connections to the same host are
+kept alive and reused between rotations instead of paying DNS, TCP and
+TLS setup on every request.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_POOL_CONNECTIONS = 8
+DEFAULT_POOL_MAXSIZE = 8
+
+DEFAULT_MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+IMAGE_CONTENT_TYPES: Tuple[str, ...] = ("image/",)
+
+# Hedged downloads: wait this long for the preferred source before starting
+# an alternate when there is not enough latency history for a percentile.
+DEFAULT_HEDGE_AFTER = 3.0
+MIN_HEDGE_AFTER = 0.5
+LATENCY_WINDOW = 50
+MIN_LATENCY_SAMPLES = 5
+
+# Per-host timeouts (seconds). Subdomains inherit their parent's entry.
+DEFAULT_HOST_TIMEOUTS: Dict[str, float] = {
+    "api.quotable.io": 5.0,
+    "zenquotes.io": 5.0,
+    "api.forismatic.com": 5.0,
+    "picsum.photos": 15.0,
+    "loremflickr.com": 15.0,
+    "source.unsplash.com": 15.0,
+}
+
+
+# Called as progress(bytes_received, total_bytes_or_None) while downloading.
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+# Called as observer(url, succeeded, seconds) for each finished hedge attempt.
+AttemptObserver = Callable[[str, bool, float], None]
+
+
+class DownloadError(Exception):
+    """Raised when a download is rejected or fails before completion."""
+
+
+class DownloadCancelled(DownloadError):
+    """Raised when a download is cancelled through its cancel event."""
+
+
+class _LinkedEvent(threading.Event):
+    """Cancel flag that also reports set when a parent event is set."""
+
+    def __init__(self, parent: Optional[threading.Event]) -> None:
+        super().__init__()
+        self.parent = parent
+
+    def is_set(self) -> bool:
+        return super().is_set() or (
+            self.parent is not None and self.parent.is_set()
+        )
+
+
+class Download(NamedTuple):
+    """Result of a completed streaming download."""
+
+    path: str
+    content_type: str
+    size: int
+
+
+def extension_for(content_type: str) -> str:
+    """Return a file extension (without dot) for an image content type."""
+    content_type = content_type.lower()
+    if "png" in content_type:
+        return "png"
+    if "webp" in content_type:
+        return "webp"
+    return "jpg"
+
+
+class HttpClient:
+    """Keep-alive HTTP client with per-host connection pools and timeouts."""
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        default_timeout: float = DEFAULT_TIMEOUT,
+        host_timeouts: Optional[Dict[str, float]] = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> None:
+        """Create the session and mount pooled adapters for http and https."""
+        self.default_timeout = float(default_timeout)
+        self.host_timeouts = dict(DEFAULT_HOST_TIMEOUTS)
+        if host_timeouts:
+            self.host_timeouts.update(
+                {host.lower(): float(t) for host, t in host_timeouts.items()}
+            )
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+        # pool_connections is the number of hosts kept, pool_maxsize the number
+        # of idle keep-alive sockets kept per host.
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Rolling completed-download durations (seconds) per host, the
+        # baseline hedged downloads compare a running attempt against
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._latency_lock = threading.Lock()
+
+    def timeout_for(self, url: str) -> float:
+        """Return the configured timeout for the host of *url*."""
+        host = (urlsplit(url).hostname or "").lower()
+        while host:
+            if host in self.host_timeouts:
+                return self.host_timeouts[host]
+            if "." not in host:
+                break
+            host = host.split(".", 1)[1]
+        return self.default_timeout
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Issue a GET on the shared session, applying the per-host timeout."""
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        kwargs.setdefault("allow_redirects", True)
+        return self.session.get(url, **kwargs)
+
+    def record_latency(self, url: str, seconds: float) -> None:
+        """Record how long a complete download from the host of *url* took."""
+        host = (urlsplit(url).hostname or "").lower()
+        with self._latency_lock:
+            samples = self._latencies.setdefault(
+                host, deque(maxlen=LATENCY_WINDOW)
+            )
+            samples.append(seconds)
+
+    def latency_percentile(
+        self, url: str, percentile: float = 90
+    ) -> Optional[float]:
+        """Return the percentile of full download times for the host of *url*.
+
+        Returns None until enough samples have been recorded.
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        with self._latency_lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def download(
+        self,
+        url: str,
+        dest: Union[str, Path],
+        max_bytes: Optional[int] = DEFAULT_MAX_DOWNLOAD_BYTES,
+        progress: Optional[ProgressCallback] = None,
+        accept_types: Optional[Tuple[str, ...]] = IMAGE_CONTENT_TYPES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cancel_event: Optional[threading.Event] = None,
+        **kwargs: Any,
+    ) -> Download:
+        """Stream *url* to *dest* chunk by chunk without buffering the body.
+
+        The response is rejected before any body bytes are read when the
+        status is not 200, the ``content-type`` does not start with one of
+        *accept_types*, or the declared ``content-length`` exceeds
+        *max_bytes*. The transfer is aborted as soon as more than
+        *max_bytes* arrive, or when *cancel_event* is set. Data is written
+        to a ``.part`` file that only replaces *dest* once complete, and
+        the time the whole transfer took is recorded for the host.
+        Raises :class:`DownloadError`.
+        """
+        dest = Path(dest)
+        part_path = dest.with_name(dest.name + ".part")
+        started = time.monotonic()
+        response = self.get(url, stream=True, **kwargs)
+        try:
+            if response.status_code != 200:
+                raise DownloadError(f"HTTP {response.status_code}")
+
+            content_type = (
+                response.headers.get("content-type", "").split(";")[0].strip().lower()
+            )
+            if accept_types and content_type and not content_type.startswith(
+                accept_types
+            ):
+                raise DownloadError(f"Unexpected content type: {content_type}")
+
+            total: Optional[int] = None
+            declared = response.headers.get("content-length")
+            if declared and str(declared).isdigit():
+                total = int(declared)
+                if max_bytes is not None and total > max_bytes:
+                    raise DownloadError(
+                        f"Image too large: {total} bytes (limit {max_bytes})"
+                    )
+
+            received = 0
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise DownloadCancelled(f"Cancelled: {url}")
+                    if not chunk:
+                        continue
+                    received += len(chunk)
+                    if max_bytes is not None and received > max_bytes:
+                        raise DownloadError(
+                            f"Image too large: over {max_bytes} bytes"
+                        )
+                    f.write(chunk)
+                    if progress is not None:
+                        progress(received, total)
+
+            os.replace(part_path, dest)
+            self.record_latency(url, time.monotonic() - started)
+            return Download(str(dest), content_type, received)
+        except BaseException:
+            try:
+                part_path.unlink()
+            except OSError:
+                pass
+            raise
+        finally:
+            response.close()
+
+    def hedged_download(
+        self,
+        urls: Sequence[str],
+        dest: Union[str, Path],
+        hedge_after: Optional[float] = None,
+        max_hedges: int = 1,
+        cancel_event: Optional[threading.Event] = None,
+        observer: Optional[AttemptObserver] = None,
+        **kwargs: Any,
+    ) -> Download:
+        """Download from the first of *urls*, hedging with the others.
+
+        The preferred source ``urls[0]`` is started first. If it has not
+        finished after *hedge_after* seconds (by default the p90 of the
+        complete downloads seen from its host) the next source is started
+        as well, up to *max_hedges* extra requests. The first download to
+        complete wins; the others are cancelled and their files removed.
+        Any attempt that fails is replaced by the next source at once,
+        while the others keep running. Setting *cancel_event*
+        cancels every attempt. *observer* is told the outcome of every
+        attempt that was not cancelled. Keyword arguments are passed to
+        :meth:`download`.
+        """
+        if not urls:
+            raise DownloadError("No sources to download from")
+        dest = Path(dest)
+        if hedge_after is None:
+            hedge_after = self.latency_percentile(urls[0]) or DEFAULT_HEDGE_AFTER
+        hedge_after = max(MIN_HEDGE_AFTER, hedge_after)
+
+        remaining = list(urls)
+        pending: Dict["Future[Download]", threading.Event] = {}
+        errors: List[Exception] = []
+        hedges = 0
+        pool = ThreadPoolExecutor(max_workers=1 + max_hedges)
+
+        def run_attempt(
+            url: str, path: Path, cancel: threading.Event
+        ) -> Download:
+            started = time.monotonic()
+            try:
+                result = self.download(url, path, cancel_event=cancel, **kwargs)
+            except DownloadCancelled:
+                raise
+            except Exception:
+                if observer is not None:
+                    observer(url, False, time.monotonic() - started)
+                raise
+            if observer is not None:
+                observer(url, True, time.monotonic() - started)
+            return result
+
+        def launch() -> None:
+            url = remaining.pop(0)
+            cancel = _LinkedEvent(cancel_event)
+            attempt = len(urls) - len(remaining)
+            attempt_dest = dest.with_name(f"{dest.stem}.{attempt}{dest.suffix}")
+            future = pool.submit(run_attempt, url, attempt_dest, cancel)
+            pending[future] = cancel
+
+        try:
+            launch()
+            while pending:
+                can_hedge = bool(remaining) and hedges < max_hedges
+                done, _ = wait(
+                    list(pending),
+                    timeout=hedge_after if can_hedge else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    # Still waiting on the slow source: start an alternate
+                    hedges += 1
+                    launch()
+                    continue
+
+                winner: Optional[Download] = None
+                failed = 0
+                for future in done:
+                    pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        failed += 1
+                        continue
+                    if winner is None:
+                        winner = result
+                    else:
+                        # Finished together with the winner
+                        _discard_attempt(future)
+                if winner is not None:
+                    os.replace(winner.path, dest)
+                    return Download(str(dest), winner.content_type, winner.size)
+
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled("Cancelled")
+
+                # Replace each failed attempt with the next source right away
+                for _ in range(min(failed, len(remaining))):
+                    launch()
+        finally:
+            for future, cancel in pending.items():
+                cancel.set()
+                # A losing attempt may still complete before it sees the flag
+                future.add_done_callback(_discard_attempt)
+            pool.shutdown(wait=False)
+
+        raise errors[-1] if errors else DownloadError("All sources failed")
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+def _discard_attempt(future: "Future[Download]") -> None:
+    """Delete the file of a hedge attempt that completed but lost."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        os.remove(future.result().path)
+    except OSError:
+        pass
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def configure(**options: Any) -> HttpClient:
+    """Replace the process-wide client with one built from *options*.
+
+    Accepts the keyword arguments of :class:`HttpClient`; unknown keys are
+    ignored so settings can be passed straight from a config file.
+    """
+    global _client
+    allowed = {
+        "pool_connections",
+        "pool_maxsize",
+        "default_timeout",
+        "host_timeouts",
+        "user_agent",
+    }
+    client = HttpClient(**{k: v for k, v in options.items() if k in allowed})
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None:
+        old.close()
+    return client
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """GET *url* through the shared pooled client."""
+    return get_client().get(url, **kwargs)
+
+
+def download(url: str, dest: Union[str, Path], **kwargs: Any) -> Download:
+    """Stream *url* to *dest* through the shared client, see HttpClient.download."""
+    return get_client().download(url, dest, **kwargs)
+
+
+def hedged_download(
+    urls: Sequence[str], dest: Union[str, Path], **kwargs: Any
+) -> Download:
+    """Hedged download through the shared client, see HttpClient.hedged_download."""
+    return get_client().hedged_download(urls, dest, **kwargs)
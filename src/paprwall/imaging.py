@@ -0,0 +1,201 @@
+"""
+Image loading helpers.
+
+Previews and thumbnails are loaded with ``load_scaled``, which decodes
+large images at a reduced scale (JPEG draft mode, or ``Image.reduce``)
+before the final high-quality resample.
+
+Every image is opened through ``open_image``, which enforces a pixel and
+memory budget: images whose header claims more than ``max_pixels`` are
+rejected before decoding (decompression bombs), JPEGs larger than the
+target are decoded at a reduced scale, and anything that would still
+decode to more than ``max_decoded_bytes`` is refused with ImageTooLarge.
+"""
+
+import threading
+import warnings
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+from PIL import ExifTags, Image
+
+Size = Tuple[int, int]
+
+# Reject images claiming more pixels than this (~16K x 12K)
+DEFAULT_MAX_PIXELS = 200_000_000
+# Largest decoded frame allowed in memory
+DEFAULT_MAX_DECODED_BYTES = 512 * 1024 * 1024
+
+_limits = {
+    "max_pixels": DEFAULT_MAX_PIXELS,
+    "max_decoded_bytes": DEFAULT_MAX_DECODED_BYTES,
+}
+_limits_lock = threading.Lock()
+Image.MAX_IMAGE_PIXELS = DEFAULT_MAX_PIXELS
+
+# Decode at no less than this multiple of the final size before resampling
+REDUCING_GAP = 2.0
+
+# EXIF orientation -> transpose that brings the image upright
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+class ImageTooLarge(ValueError):
+    """The image exceeds the configured pixel or memory budget."""
+
+
+def configure_limits(
+    max_pixels: Optional[int] = None, max_decoded_bytes: Optional[int] = None
+) -> None:
+    """Set the process-wide image budget (None keeps the current value).
+
+    *max_pixels* also becomes Pillow's own decompression bomb limit.
+    """
+    with _limits_lock:
+        if max_pixels is not None:
+            _limits["max_pixels"] = int(max_pixels)
+            Image.MAX_IMAGE_PIXELS = int(max_pixels)
+        if max_decoded_bytes is not None:
+            _limits["max_decoded_bytes"] = int(max_decoded_bytes)
+
+
+def limits() -> Tuple[int, int]:
+    """Return the current (max_pixels, max_decoded_bytes)."""
+    with _limits_lock:
+        return _limits["max_pixels"], _limits["max_decoded_bytes"]
+
+
+def decoded_bytes(size: Sequence[int], mode: str) -> int:
+    """Estimate the memory a decoded frame of *size* and *mode* takes."""
+    if mode in ("1", "L", "P"):
+        per_pixel = 1
+    elif mode.startswith("I;16"):
+        per_pixel = 2
+    else:
+        # Pillow stores multi-band and 32-bit images with 4 bytes per pixel
+        per_pixel = 4
+    return int(size[0]) * int(size[1]) * per_pixel
+
+
+def check_budget(image: Image.Image) -> None:
+    """Raise ImageTooLarge if decoding *image* as configured breaks the budget.
+
+    Call after ``draft()`` so reduced-scale JPEG decoding is accounted for.
+    """
+    max_pixels, max_bytes = limits()
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageTooLarge(
+            f"{width}x{height} image exceeds the {max_pixels:,} pixel limit"
+        )
+    needed = decoded_bytes(image.size, image.mode)
+    if needed > max_bytes:
+        raise ImageTooLarge(
+            f"{width}x{height} image needs {needed // (1024 * 1024)} MB to decode, "
+            f"limit is {max_bytes // (1024 * 1024)} MB"
+        )
+
+
+def _open_checked(path: Union[str, Path]) -> Image.Image:
+    """Open *path*, rejecting images over the pixel limit from their header."""
+    try:
+        with warnings.catch_warnings():
+            # Over-limit images are rejected below, not just warned about
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            image = Image.open(path)
+    except Image.DecompressionBombError as e:
+        raise ImageTooLarge(str(e)) from None
+    max_pixels, _ = limits()
+    if image.width * image.height > max_pixels:
+        image.close()
+        raise ImageTooLarge(
+            f"{image.width}x{image.height} image exceeds the {max_pixels:,} pixel limit"
+        )
+    return image
+
+
+def open_image(path: Union[str, Path], target: Optional[Size] = None) -> Image.Image:
+    """Open *path* for decoding within the pixel and memory budget.
+
+    With a *target* size, JPEGs are set up to decode at the smallest
+    1/2, 1/4 or 1/8 scale still covering it, so a huge photo never has to
+    be fully decoded for a screen-sized render. Raises ImageTooLarge for
+    decompression bombs and images that would not fit in memory.
+    """
+    image = _open_checked(path)
+    try:
+        if target is not None and image.format == "JPEG":
+            image.draft("RGB", (int(target[0]), int(target[1])))
+        check_budget(image)
+        return image
+    except Exception:
+        image.close()
+        raise
+
+
+def check_image(path: Union[str, Path], target: Optional[Size] = None) -> Size:
+    """Check that *path* is an image within the budget; return its size."""
+    with open_image(path, target) as image:
+        return image.size
+
+
+def fit_size(size: Sequence[int], bounds: Sequence[int]) -> Size:
+    """Return *size* scaled down (never up) to fit *bounds*, keeping ratio."""
+    width, height = size
+    scale = min(bounds[0] / width, bounds[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def load_scaled(
+    path: Union[str, Path],
+    bounds: Sequence[int],
+    reducing_gap: float = REDUCING_GAP,
+) -> Tuple[Image.Image, Size]:
+    """Load *path* upright and scaled to fit *bounds*.
+
+    JPEGs are decoded with draft mode at the smallest 1/2, 1/4 or 1/8
+    scale that is still *reducing_gap* times the final size; other formats
+    are shrunk with ``Image.reduce`` by the largest such integer factor.
+    Only then is the image resampled with LANCZOS, so large images are
+    never fully decoded for a small preview. Returns the image and the
+    upright size of the source.
+    """
+    with _open_checked(path) as image:
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+        transpose = _ORIENTATION_TRANSPOSE.get(orientation)
+        swapped = orientation in (5, 6, 7, 8)
+        source_size: Size = (
+            (image.height, image.width) if swapped else (image.width, image.height)
+        )
+
+        # Work in the stored (pre-rotation) orientation until the end
+        upright = fit_size(source_size, bounds)
+        final = (upright[1], upright[0]) if swapped else upright
+        wanted = (
+            max(1, int(final[0] * reducing_gap)),
+            max(1, int(final[1] * reducing_gap)),
+        )
+
+        scaled: Image.Image = image
+        if image.format == "JPEG":
+            image.draft("RGB", wanted)
+        check_budget(image)
+        if image.format != "JPEG":
+            factor = int(min(image.width / wanted[0], image.height / wanted[1]))
+            if factor > 1:
+                scaled = image.reduce(factor)
+        if scaled.mode not in ("RGB", "RGBA", "L"):
+            scaled = scaled.convert("RGBA" if "A" in scaled.getbands() else "RGB")
+        result = scaled.resize(final, Image.Resampling.LANCZOS)
+
+    if transpose is not None:
+        result = result.transpose(transpose)
+    return result, source_size
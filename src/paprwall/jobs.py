@@ -0,0 +1,195 @@
+"""
+Bounded priority executor for GUI background work.
+
+Every GUI action (fetch, refresh, apply, rotation, prefetch) used to start
+its own thread, so repeated clicks or a rotation firing during a manual
+fetch piled up threads, duplicate downloads and renders racing to update
+the preview. JobExecutor runs them on a fixed number of workers instead,
+most important first (user actions, then auto-rotation, then prefetch),
+and lets a newer job of the same *kind* supersede an older one:
+
+* a queued job of that kind is dropped (its future is cancelled), unless
+  it is more important than the new job, in which case the new one is;
+* an *exclusive* job is dropped while one of its kind is already running
+  (a second fetch click while fetching); a non-exclusive job instead asks
+  the running one to stop, which it sees through ``cancelled()``.
+
+With at most one job of each kind waiting, the queue is bounded by the
+number of kinds the GUI submits.
+"""
+
+import heapq
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_WORKERS = 2
+
+
+class Priority(IntEnum):
+    """Job priorities; lower values run first."""
+
+    USER = 0
+    ROTATION = 1
+    PREFETCH = 2
+
+
+class _Job:
+    """A queued or running job."""
+
+    __slots__ = ("kind", "priority", "seq", "fn", "future", "superseded")
+
+    def __init__(
+        self, kind: str, priority: int, seq: int, fn: Callable[[], Any]
+    ) -> None:
+        self.kind = kind
+        self.priority = priority
+        self.seq = seq
+        self.fn = fn
+        self.future: "Future[Any]" = Future()
+        self.superseded = False
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class JobExecutor:
+    """Runs jobs on a bounded pool of threads by priority, one queued per kind."""
+
+    def __init__(
+        self, workers: int = DEFAULT_WORKERS, name: str = "paprwall-job"
+    ) -> None:
+        """Create an executor with *workers* threads, started on the first job."""
+        self.workers = max(1, workers)
+        self.name = name
+        self.dropped = 0
+        self._heap: List[_Job] = []
+        self._queued: Dict[str, _Job] = {}
+        self._running: Dict[str, List[_Job]] = {}
+        self._threads: List[threading.Thread] = []
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._seq = 0
+        self._shutdown = False
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[[], Any],
+        priority: int = Priority.USER,
+        exclusive: bool = False,
+    ) -> "Future[Any]":
+        """Queue *fn* as a job of *kind* and return its future.
+
+        A job superseded on submission gets a future that is already
+        cancelled. Raises RuntimeError after ``shutdown``.
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new jobs after shutdown")
+            self._seq += 1
+            job = _Job(kind, priority, self._seq, fn)
+
+            queued = self._queued.get(kind)
+            running = self._running.get(kind, [])
+            if exclusive and running:
+                return self._reject(job)
+            if queued is not None:
+                if queued.priority < priority:
+                    return self._reject(job)
+                self._remove(queued)
+            if not exclusive:
+                for active in running:
+                    active.superseded = True
+
+            heapq.heappush(self._heap, job)
+            self._queued[kind] = job
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"{self.name}-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return job.future
+
+    def _reject(self, job: _Job) -> "Future[Any]":
+        self.dropped += 1
+        job.future.cancel()
+        return job.future
+
+    def _remove(self, job: _Job) -> None:
+        """Take a queued *job* off the queue and cancel it (lock held)."""
+        self._heap.remove(job)
+        heapq.heapify(self._heap)
+        del self._queued[job.kind]
+        self.dropped += 1
+        job.future.cancel()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                job = heapq.heappop(self._heap)
+                del self._queued[job.kind]
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._running.setdefault(job.kind, []).append(job)
+
+            self._local.job = job
+            try:
+                job.future.set_result(job.fn())
+            except BaseException as e:
+                # Including SystemExit: the caller sees it through the future,
+                # and the worker stays up (KeyboardInterrupt only ever reaches
+                # the main thread)
+                job.future.set_exception(e)
+            finally:
+                self._local.job = None
+                with self._cond:
+                    running = self._running[job.kind]
+                    running.remove(job)
+                    if not running:
+                        del self._running[job.kind]
+
+    def cancelled(self) -> bool:
+        """Return True inside a job a newer one of its kind has superseded.
+
+        Long jobs check this before publishing results so a stale job does
+        not overwrite a newer one's. Outside a job it is always False.
+        """
+        job: Optional[_Job] = getattr(self._local, "job", None)
+        return job is not None and job.superseded
+
+    def queued(self) -> List[str]:
+        """Return the kinds of the waiting jobs in the order they will run."""
+        with self._cond:
+            return [job.kind for job in sorted(self._heap)]
+
+    def running(self) -> List[str]:
+        """Return the kinds of the jobs running now."""
+        with self._cond:
+            return [kind for kind, jobs in self._running.items() for _ in jobs]
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel waiting jobs, ask running ones to stop and end the workers."""
+        with self._cond:
+            self._shutdown = True
+            for job in self._heap:
+                job.future.cancel()
+            self._heap.clear()
+            self._queued.clear()
+            for jobs in self._running.values():
+                for job in jobs:
+                    job.superseded = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,241 @@
+"""
+Text layout for quote overlays.
+
+``fit_text`` finds the largest font size at which a quote and its author
+fit a box by binary search over the font size range, instead of stepping
+the size down and re-measuring until it fits. With a wrap width the
+quote is broken into lines at each size tried. The result is a TextLayout
+that carries the fonts, lines and measurements needed to draw it.
+
+``wrap_text`` breaks a paragraph into lines by adding up cached word
+widths, so each distinct word is measured once per font rather than
+re-measuring the whole candidate line for every word.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from .fonts import Font, FontManager, font_manager
+
+# Padding added around the text when sizing the background box
+BOX_MARGIN = 40
+# Gap between the quote and the author line
+AUTHOR_GAP = 10
+# Extra space between wrapped quote lines, as a fraction of the font size
+LINE_SPACING = 0.25
+MIN_FONT_SIZE = 14
+# Word widths kept across renders
+WORD_CACHE_SIZE = 20000
+
+
+def default_author_size(size: int) -> int:
+    """Return the author font size paired with quote font *size*."""
+    return max(12, size - 4)
+
+
+class TextLayout(NamedTuple):
+    """A measured quote/author layout at one font size."""
+
+    font_size: int
+    author_font_size: int
+    font: Font
+    author_font: Font
+    quote_size: Tuple[int, int]
+    author_size: Tuple[int, int]
+    box_width: int
+    box_height: int
+    fits: bool
+    lines: Tuple[str, ...] = ()
+    line_height: int = 0
+
+
+def text_size(text: str, font: Font) -> Tuple[int, int]:
+    """Return the width and height of *text* drawn in *font*."""
+    if not text:
+        return 0, 0
+    left, top, right, bottom = font.getbbox(text)
+    return int(right - left), int(bottom - top)
+
+
+def measure(
+    quote_text: str,
+    author_text: str,
+    size: int,
+    author_size: Callable[[int], int] = default_author_size,
+    manager: Optional[FontManager] = None,
+    max_width: Optional[int] = None,
+    max_height: Optional[int] = None,
+    wrap_width: Optional[int] = None,
+) -> TextLayout:
+    """Lay out the quote and author at font *size*.
+
+    With *wrap_width* the quote is wrapped into lines of at most that
+    width; otherwise it is a single line.
+    """
+    manager = manager or font_manager()
+    author_font_size = author_size(size)
+    font, author_font = manager.fonts(size, author_font_size)
+    if wrap_width is None:
+        lines: Tuple[str, ...] = (quote_text,)
+        q_w, q_h = text_size(quote_text, font)
+        line_height = q_h
+    else:
+        lines = tuple(wrap_text(quote_text, font, wrap_width))
+        widths = [text_size(line, font)[0] for line in lines]
+        line_height = text_size("Ag", font)[1] + int(size * LINE_SPACING)
+        q_w = max(widths, default=0)
+        q_h = line_height * len(lines)
+    a_w, a_h = text_size(author_text, author_font)
+    box_width = max(q_w, a_w) + BOX_MARGIN
+    box_height = q_h + a_h + BOX_MARGIN
+    fits = (max_width is None or box_width <= max_width) and (
+        max_height is None or box_height <= max_height
+    )
+    return TextLayout(
+        size,
+        author_font_size,
+        font,
+        author_font,
+        (q_w, q_h),
+        (a_w, a_h),
+        box_width,
+        box_height,
+        fits,
+        lines,
+        line_height,
+    )
+
+
+def fit_text(
+    quote_text: str,
+    author_text: str,
+    max_width: int,
+    max_height: int,
+    max_size: int,
+    min_size: int = MIN_FONT_SIZE,
+    author_size: Callable[[int], int] = default_author_size,
+    manager: Optional[FontManager] = None,
+    wrap_width: Optional[int] = None,
+) -> TextLayout:
+    """Return the layout at the largest size in [min_size, max_size] that fits.
+
+    Text extent grows with font size, so the size is found by binary
+    search in O(log(max_size - min_size)) measurements. When even
+    *min_size* does not fit, its layout is returned with ``fits=False``.
+    """
+    manager = manager or font_manager()
+
+    def at(size: int) -> TextLayout:
+        return measure(
+            quote_text,
+            author_text,
+            size,
+            author_size,
+            manager,
+            max_width,
+            max_height,
+            wrap_width,
+        )
+
+    best = at(max_size)
+    if best.fits or max_size <= min_size:
+        return best
+
+    low, high = min_size, max_size - 1
+    fallback: Optional[TextLayout] = None
+    while low <= high:
+        mid = (low + high) // 2
+        layout = at(mid)
+        if layout.fits:
+            best = layout
+            low = mid + 1
+        else:
+            if mid == min_size:
+                fallback = layout
+            high = mid - 1
+    if best.fits:
+        return best
+    return fallback or at(min_size)
+
+
+def font_key(font: Font) -> Hashable:
+    """Return a key identifying *font* (file and size) for width caching."""
+    path = getattr(font, "path", None)
+    if isinstance(path, str):
+        return (path, getattr(font, "size", None), getattr(font, "index", 0))
+    # Fonts not loaded from a file (e.g. the default font) are identified by
+    # object; the FontManager keeps them alive for the whole process
+    return id(font)
+
+
+class WordWidths:
+    """LRU cache of word widths keyed by (font, word)."""
+
+    def __init__(self, maxsize: int = WORD_CACHE_SIZE) -> None:
+        """Create a cache holding at most *maxsize* widths."""
+        self.maxsize = maxsize
+        self._widths: "OrderedDict[Tuple[Hashable, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    def width(self, font: Font, word: str) -> float:
+        """Return the advance width of *word* in *font*."""
+        key = (font_key(font), word)
+        with self._lock:
+            width = self._widths.get(key)
+            if width is not None:
+                self._widths.move_to_end(key)
+                return width
+            self.misses += 1
+        width = float(font.getlength(word))
+        with self._lock:
+            self._widths[key] = width
+            while len(self._widths) > self.maxsize:
+                self._widths.popitem(last=False)
+        return width
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._widths)
+
+
+_word_widths = WordWidths()
+
+
+def wrap_text(
+    text: str,
+    font: Font,
+    max_width: int,
+    widths: Optional[WordWidths] = None,
+) -> List[str]:
+    """Wrap *text* into lines no wider than *max_width* in *font*.
+
+    Line widths are accumulated from per-word widths (plus the space
+    width), each looked up once per font, so wrapping is linear in the
+    number of words. A word wider than *max_width* gets a line of its own.
+    """
+    if widths is None:
+        widths = _word_widths
+    space = widths.width(font, " ")
+    seen: Dict[str, float] = {}
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0.0
+
+    for word in text.split():
+        word_width = seen.get(word)
+        if word_width is None:
+            word_width = seen[word] = widths.width(font, word)
+        if not current:
+            current, current_width = [word], word_width
+        elif current_width + space + word_width <= max_width:
+            current.append(word)
+            current_width += space + word_width
+        else:
+            lines.append(" ".join(current))
+            current, current_width = [word], word_width
+
+    if current:
+        lines.append(" ".join(current))
+    return lines
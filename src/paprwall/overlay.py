@@ -0,0 +1,137 @@
+"""
+Reusable quote overlay tiles.
+
+The quote block (backdrop, wrapped text, author line) depends only on the
+quote, the screen size and the renderer settings, never on the wallpaper
+underneath. It is drawn once into an RGBA tile whose alpha holds both the
+backdrop and the anti-aliased text; applying it to any wallpaper is then a
+single masked paste. Tiles are kept in a small LRU cache so the refresh
+button, retries and renders for several monitors of the same size reuse
+them.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+from . import layout
+from .fonts import Font
+
+DEFAULT_CACHE_SIZE = 8
+QUOTE_COLOR = (255, 255, 255)
+AUTHOR_COLOR = (204, 204, 204)
+# Backdrop extends this far left of and above the text
+BACKDROP_PADDING = 20
+
+
+class OverlayTile(NamedTuple):
+    """An RGBA quote block and where its top-left corner goes."""
+
+    image: Image.Image
+    position: Tuple[int, int]
+
+    def apply(self, image: Image.Image) -> Image.Image:
+        """Blend the tile onto *image* (RGB, modified in place) and return it."""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.paste(self.image, self.position, self.image)
+        return image
+
+
+def _text_layer(
+    size: Tuple[int, int],
+    color: Tuple[int, int, int],
+    lines: Tuple[Tuple[Tuple[int, int], str, Font], ...],
+) -> Image.Image:
+    """Return *lines* drawn in *color* on a transparent layer of *size*."""
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+    for xy, text, font in lines:
+        draw.text(xy, text, font=font, fill=255)
+    layer = Image.new("RGBA", size, color + (0,))
+    layer.putalpha(mask)
+    return layer
+
+
+def draw_tile(
+    text_layout: layout.TextLayout,
+    author_text: str,
+    position: Tuple[int, int],
+    backdrop_alpha: int,
+) -> OverlayTile:
+    """Draw the quote block of *text_layout* with its text at *position*.
+
+    The backdrop is black at *backdrop_alpha* and reaches BACKDROP_PADDING
+    pixels left of and above the text. Text is composited over it with
+    proper alpha, so pasting the tile equals drawing onto a darkened image.
+    """
+    pad = BACKDROP_PADDING
+    size = (text_layout.box_width + pad + 1, text_layout.box_height + pad + 1)
+    tile = Image.new("RGBA", size, (0, 0, 0, max(0, min(backdrop_alpha, 255))))
+
+    quote_lines = tuple(
+        ((pad, pad + i * text_layout.line_height), line, text_layout.font)
+        for i, line in enumerate(text_layout.lines)
+    )
+    tile = Image.alpha_composite(tile, _text_layer(size, QUOTE_COLOR, quote_lines))
+    if author_text:
+        author_xy = (pad, pad + text_layout.quote_size[1] + layout.AUTHOR_GAP)
+        author_line = ((author_xy, author_text, text_layout.author_font),)
+        tile = Image.alpha_composite(tile, _text_layer(size, AUTHOR_COLOR, author_line))
+
+    x, y = position
+    return OverlayTile(tile, (x - pad, y - pad))
+
+
+class TileCache:
+    """LRU cache of overlay tiles."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """Create a cache holding at most *maxsize* tiles."""
+        self.maxsize = maxsize
+        self._tiles: "OrderedDict[Hashable, OverlayTile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, create: Callable[[], OverlayTile]) -> OverlayTile:
+        """Return the tile for *key*, calling *create* to draw it if missing."""
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+        tile = create()
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.maxsize:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def clear(self) -> None:
+        """Drop all cached tiles."""
+        with self._lock:
+            self._tiles.clear()
+
+    def cache_size(self) -> int:
+        """Return the number of tiles currently cached."""
+        with self._lock:
+            return len(self._tiles)
+
+
+_cache: Optional[TileCache] = None
+_cache_lock = threading.Lock()
+
+
+def tile_cache() -> TileCache:
+    """Return the process-wide TileCache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TileCache()
+        return _cache
@@ -0,0 +1,318 @@
+"""
+Background prefetch queue of ready-to-apply wallpapers.
+
+A PrefetchQueue keeps up to ``depth`` fully rendered wallpapers (image with
+the quote already composited) in a spool directory and refills it in the
+background, so a rotation only has to pop a file and set it.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+REFILL_POLICIES = ("eager", "low-water", "off")
+DEFAULT_DEPTH = 3
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_POLICY = "eager"
+SETTINGS_FILE = "spool.json"
+
+# producer(spool_dir, tag) renders one wallpaper into spool_dir and returns
+# {"path": rendered_image, "source": original_image_or_None, "quote": {...}},
+# or None when it could not produce one.
+Producer = Callable[[Path, str], Optional[Dict[str, Any]]]
+
+
+class PrefetchQueue:
+    """Spool of pre-rendered wallpapers, refilled by a background thread.
+
+    Each entry is a rendered image plus a JSON sidecar holding its quote and
+    tag (the quote category it was rendered for). Entries are popped oldest
+    first and only for a matching tag.
+
+    Refill policies:
+        eager      keep the spool full, refilling after every pop
+        low-water  refill to depth only once ``low_water`` or fewer are left
+        off        never refill automatically (``fill()`` still works)
+    """
+
+    def __init__(
+        self,
+        spool_dir: Union[str, Path],
+        producer: Optional[Producer] = None,
+        depth: int = DEFAULT_DEPTH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        policy: str = DEFAULT_POLICY,
+        low_water: int = 1,
+        retry_delay: float = 30.0,
+    ) -> None:
+        """Initialize the queue; the spool directory is created if needed."""
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.producer = producer
+        self.low_water = low_water
+        self.retry_delay = retry_delay
+        self.refilling = False
+
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tag_getter: Callable[[], str] = lambda: ""
+
+        self.depth = DEFAULT_DEPTH
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self.policy = DEFAULT_POLICY
+        self.configure(depth=depth, max_bytes=max_bytes, policy=policy)
+
+    # ----- Settings -----
+
+    @classmethod
+    def from_settings(
+        cls, spool_dir: Union[str, Path], producer: Optional[Producer] = None
+    ) -> "PrefetchQueue":
+        """Create a queue using the settings saved in the spool directory."""
+        settings: Dict[str, Any] = {}
+        settings_file = Path(spool_dir) / SETTINGS_FILE
+        if settings_file.exists():
+            try:
+                with open(settings_file, "r") as f:
+                    settings = json.load(f)
+            except Exception as e:
+                print(f"Failed to load prefetch settings: {e}")
+        return cls(
+            spool_dir,
+            producer,
+            depth=settings.get("depth", DEFAULT_DEPTH),
+            max_bytes=settings.get("max_bytes", DEFAULT_MAX_BYTES),
+            policy=settings.get("policy", DEFAULT_POLICY),
+        )
+
+    @staticmethod
+    def is_configured(spool_dir: Union[str, Path]) -> bool:
+        """Return True if settings have been saved for *spool_dir*."""
+        return (Path(spool_dir) / SETTINGS_FILE).exists()
+
+    def configure(
+        self,
+        depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> None:
+        """Update queue depth, disk budget and refill policy."""
+        if depth is not None:
+            self.depth = max(0, int(depth))
+        if max_bytes is not None:
+            self.max_bytes = max(0, int(max_bytes))
+        if policy is not None:
+            if policy not in REFILL_POLICIES:
+                raise ValueError(f"Unknown refill policy: {policy}")
+            self.policy = policy
+        self.request_refill()
+
+    def save_settings(self) -> None:
+        """Persist the current settings into the spool directory."""
+        settings = {
+            "depth": self.depth,
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+        }
+        try:
+            with open(self.spool_dir / SETTINGS_FILE, "w") as f:
+                json.dump(settings, f, indent=2)
+        except Exception as e:
+            print(f"Failed to save prefetch settings: {e}")
+
+    # ----- Inspection -----
+
+    def entries(self, tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return spooled entries, oldest first, optionally filtered by tag."""
+        result = []
+        with self._lock:
+            for meta_path in sorted(self.spool_dir.glob("entry_*.json")):
+                try:
+                    with open(meta_path, "r") as f:
+                        entry = json.load(f)
+                except Exception:
+                    continue
+                if not Path(entry.get("path", "")).exists():
+                    continue
+                if tag is None or entry.get("tag") == tag:
+                    entry["meta"] = str(meta_path)
+                    result.append(entry)
+        return result
+
+    def ready(self, tag: Optional[str] = None) -> int:
+        """Return the number of ready wallpapers for *tag*."""
+        return len(self.entries(tag))
+
+    def disk_usage(self) -> int:
+        """Return the bytes used by spooled files."""
+        total = 0
+        for path in self.spool_dir.iterdir():
+            if path.is_file() and path.name != SETTINGS_FILE:
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    pass
+        return total
+
+    def status(self, tag: Optional[str] = None) -> Dict[str, Any]:
+        """Return a summary suitable for display."""
+        return {
+            "ready": self.ready(tag),
+            "depth": self.depth,
+            "bytes": self.disk_usage(),
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "refilling": self.refilling,
+        }
+
+    def refill_due(self, tag: str) -> bool:
+        """Return True if the refill policy asks for more wallpapers now."""
+        if self.policy == "off" or self.depth <= 0:
+            return False
+        ready = self.ready(tag)
+        if ready >= self.depth or self.disk_usage() >= self.max_bytes:
+            return False
+        if self.policy == "low-water":
+            return ready <= self.low_water
+        return True
+
+    # ----- Queue operations -----
+
+    def pop(
+        self, tag: str, dest_dir: Optional[Union[str, Path]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Take the oldest ready wallpaper for *tag*, or None if there is none.
+
+        When *dest_dir* is given the rendered image (and its source) are moved
+        there, so the returned paths stay valid after the spool is pruned.
+        """
+        with self._lock:
+            entries = self.entries(tag)
+            if not entries:
+                return None
+            entry = entries[0]
+            os.remove(entry.pop("meta"))
+            if dest_dir is not None:
+                for key in ("path", "source"):
+                    if entry.get(key) and Path(entry[key]).exists():
+                        target = Path(dest_dir) / Path(entry[key]).name
+                        shutil.move(entry[key], str(target))
+                        entry[key] = str(target)
+        self.request_refill()
+        return entry
+
+    def prune(self, keep_tag: Optional[str] = None) -> int:
+        """Delete entries whose tag differs from *keep_tag* (all if None)."""
+        removed = 0
+        with self._lock:
+            for entry in self.entries():
+                if keep_tag is not None and entry.get("tag") == keep_tag:
+                    continue
+                self._remove_entry(entry)
+                removed += 1
+        return removed
+
+    def _remove_entry(self, entry: Dict[str, Any]) -> None:
+        """Delete an entry's files."""
+        for key in ("path", "source", "meta"):
+            if entry.get(key):
+                try:
+                    os.remove(entry[key])
+                except OSError:
+                    pass
+
+    def _produce_one(self, tag: str) -> bool:
+        """Ask the producer for one wallpaper and record it in the spool."""
+        if self.producer is None:
+            return False
+        try:
+            result = self.producer(self.spool_dir, tag)
+        except Exception as e:
+            print(f"Prefetch failed: {e}")
+            return False
+        if not result or not result.get("path"):
+            return False
+
+        entry = {
+            "path": str(result["path"]),
+            "source": str(result["source"]) if result.get("source") else None,
+            "quote": result.get("quote", {}),
+            "tag": tag,
+            "created": time.time(),
+        }
+        meta_path = self.spool_dir / f"entry_{time.time_ns()}.json"
+        tmp_path = meta_path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, meta_path)
+        return True
+
+    def fill(self, tag: str, limit: Optional[int] = None) -> int:
+        """Produce wallpapers until the spool is full; return how many were added.
+
+        This ignores the refill policy so it can be used for explicit fills.
+        """
+        added = 0
+        self.refilling = True
+        try:
+            while not self._stop.is_set():
+                if limit is not None and added >= limit:
+                    break
+                if self.ready(tag) >= self.depth:
+                    break
+                if self.disk_usage() >= self.max_bytes:
+                    break
+                if not self._produce_one(tag):
+                    break
+                added += 1
+        finally:
+            self.refilling = False
+        return added
+
+    # ----- Background refill -----
+
+    def start(self, tag_getter: Callable[[], str]) -> None:
+        """Start the background refill thread.
+
+        *tag_getter* is called from the worker thread to learn which tag to
+        render for, so it must not touch Tk widgets or variables.
+        """
+        self._tag_getter = tag_getter
+        if (
+            self._thread is not None
+            and self._thread.is_alive()
+            and not self._stop.is_set()
+        ):
+            self.request_refill()
+            return
+        # A thread still winding down after stop() keeps its own stop event
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refill thread."""
+        self._stop.set()
+        self._wake.set()
+
+    def request_refill(self) -> None:
+        """Wake the background thread to re-check the refill policy."""
+        self._wake.set()
+
+    def _run(self, stop: threading.Event) -> None:
+        """Refill loop; re-checks after each wake-up or every retry_delay."""
+        while not stop.is_set():
+            self._wake.clear()
+            tag = self._tag_getter()
+            if self.refill_due(tag):
+                self.fill(tag)
+            self._wake.wait(self.retry_delay)
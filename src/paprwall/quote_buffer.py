@@ -0,0 +1,177 @@
+"""
+Per-category buffer of quotes fetched in bulk.
+
+Quote providers such as zenquotes return dozens of quotes per request, so
+instead of one API call per rotation the QuoteBuffer keeps a list of
+fetched quotes for each category, hands them out one at a time and
+refills a category in the background once it drops below the low-water
+mark. The buffer is saved to disk after each refill and at exit, so it
+survives restarts without a write per quote.
+"""
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Union
+
+DEFAULT_LOW_WATER = 5
+DEFAULT_CAPACITY = 100
+
+# fetcher(category) returns a batch of {"text", "author"} quotes ([] on failure)
+BatchFetcher = Callable[[str], List[Dict[str, str]]]
+
+
+class QuoteBuffer:
+    """Quotes buffered per category and refilled in bulk.
+
+    ``pop()`` only waits for the network when a category's buffer is
+    empty; otherwise a refill is started in the background once fewer
+    than ``low_water`` quotes remain. With ``path=None`` the buffer is
+    kept in memory only, and ``background=False`` refills synchronously.
+    Quotes handed out since the last save are written by ``save()``, which
+    runs after every refill and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        fetcher: BatchFetcher,
+        path: Optional[Union[str, Path]] = None,
+        low_water: int = DEFAULT_LOW_WATER,
+        capacity: int = DEFAULT_CAPACITY,
+        background: bool = True,
+    ) -> None:
+        """Create the buffer, loading saved quotes from *path* if present."""
+        self.fetcher = fetcher
+        self.path = Path(path) if path is not None else None
+        self.low_water = low_water
+        self.capacity = capacity
+        self.background = background
+        self._buffers: Dict[str, List[Dict[str, str]]] = {}
+        self._refilling: Set[str] = set()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+        if self.path is not None:
+            atexit.register(self.save)
+
+    # ----- Persistence -----
+
+    def load(self) -> None:
+        """Load buffered quotes, ignoring a missing or unreadable file."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            with self._lock:
+                self._buffers = {
+                    category: [q for q in quotes if q.get("text")]
+                    for category, quotes in data.items()
+                }
+        except Exception as e:
+            print(f"Failed to load quote buffer: {e}")
+
+    def save(self) -> None:
+        """Write the buffered quotes to disk if they changed since the last save."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {
+                category: list(quotes) for category, quotes in self._buffers.items()
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self._dirty = True
+            print(f"Failed to save quote buffer: {e}")
+
+    # ----- Buffer operations -----
+
+    def size(self, category: str) -> int:
+        """Return the number of buffered quotes for *category*."""
+        with self._lock:
+            return len(self._buffers.get(category, []))
+
+    def _take(self, category: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            quotes = self._buffers.get(category)
+            if not quotes:
+                return None
+            self._dirty = True
+            return quotes.pop(0)
+
+    def pop(self, category: str, wait: bool = True) -> Optional[Dict[str, str]]:
+        """Return the next quote for *category*, or None if none can be had.
+
+        With *wait* False an empty buffer is refilled in the background and
+        None is returned at once, so the caller can use another source.
+        """
+        quote = self._take(category)
+        if quote is None and not wait:
+            self.request_refill(category)
+            return None
+        if quote is None:
+            # Nothing buffered: this call has to wait for the network
+            self.refill(category)
+            quote = self._take(category)
+        if quote is not None and self.size(category) < self.low_water:
+            self.request_refill(category)
+        return quote
+
+    def refill(self, category: str) -> int:
+        """Fetch a batch for *category* now; return how many quotes were added."""
+        try:
+            batch = self.fetcher(category)
+        except Exception as e:
+            print(f"Quote batch fetch failed: {e}")
+            batch = []
+
+        added = 0
+        with self._lock:
+            quotes = self._buffers.setdefault(category, [])
+            known = {q["text"] for q in quotes}
+            for quote in batch:
+                if len(quotes) >= self.capacity:
+                    break
+                if quote.get("text") and quote["text"] not in known:
+                    quotes.append(
+                        {
+                            "text": quote["text"],
+                            "author": quote.get("author") or "Unknown",
+                        }
+                    )
+                    known.add(quote["text"])
+                    added += 1
+            if added:
+                self._dirty = True
+        if added:
+            self.save()
+        return added
+
+    def request_refill(self, category: str) -> None:
+        """Refill *category* in the background (synchronously if disabled)."""
+        if not self.background:
+            self.refill(category)
+            return
+        with self._lock:
+            if category in self._refilling:
+                return
+            self._refilling.add(category)
+
+        def run() -> None:
+            try:
+                self.refill(category)
+            finally:
+                with self._lock:
+                    self._refilling.discard(category)
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,261 @@
+"""
+Offline quote corpus backed by SQLite.
+
+Quotes are indexed by category, author and length. Each category numbers
+its quotes 0..n-1 (``seq``) and keeps its count, so a random quote is a
+single indexed lookup instead of a network call or an ``ORDER BY
+random()`` scan. The store is seeded from the bundled ``data/quotes.json``
+and can be extended with user CSV or JSON collections.
+"""
+
+import csv
+import json
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+BUNDLED_QUOTES = Path(__file__).parent / "data" / "quotes.json"
+DEFAULT_CATEGORY = "motivational"
+
+# Where get_quote looks first:
+#   auto    local corpus, network only for categories with no local quotes
+#   local   local corpus only, never the network
+#   online  quote APIs first, local corpus as the fallback
+QUOTE_SOURCES = ("auto", "local", "online")
+DEFAULT_SOURCE = "auto"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    author TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    UNIQUE (category, text)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS quotes_category_seq ON quotes (category, seq);
+CREATE INDEX IF NOT EXISTS quotes_author ON quotes (author);
+CREATE INDEX IF NOT EXISTS quotes_category_length ON quotes (category, length);
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class QuoteStore:
+    """Local quote corpus with O(1) random selection per category.
+
+    The database is opened lazily on first use and seeded from the bundled
+    corpus when *seed* is True. Use ``":memory:"`` for a throwaway store.
+    """
+
+    def __init__(self, db_path: Union[str, Path], seed: bool = True) -> None:
+        """Create a store for *db_path* without opening it yet."""
+        self.db_path = str(db_path)
+        self.seed = seed
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (once), creating the schema and seeding it."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            if self.seed and self._setting("seeded") is None:
+                self._import_records(_load_json(BUNDLED_QUOTES), DEFAULT_CATEGORY)
+                self._set_setting("seeded", "1")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ----- Settings -----
+
+    def _setting(self, key: str) -> Optional[str]:
+        assert self._conn is not None
+        row = self._conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_setting(self, key: str, value: str) -> None:
+        assert self._conn is not None
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    def source(self) -> str:
+        """Return the saved quote source mode (one of QUOTE_SOURCES)."""
+        with self._lock:
+            self._connect()
+            value = self._setting("source")
+        return value if value in QUOTE_SOURCES else DEFAULT_SOURCE
+
+    def set_source(self, mode: str) -> None:
+        """Save the quote source mode; raises ValueError for unknown modes."""
+        if mode not in QUOTE_SOURCES:
+            raise ValueError(f"Unknown quote source: {mode}")
+        with self._lock:
+            self._connect()
+            self._set_setting("source", mode)
+
+    # ----- Queries -----
+
+    def count(self, category: Optional[str] = None) -> int:
+        """Return the number of quotes in *category* (all when None)."""
+        with self._lock:
+            conn = self._connect()
+            if category is None:
+                row = conn.execute("SELECT COUNT(*) FROM quotes").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT count FROM categories WHERE name = ?",
+                    (category.lower(),),
+                ).fetchone()
+        return int(row[0]) if row else 0
+
+    def categories(self) -> Dict[str, int]:
+        """Return the quote count per category."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, count FROM categories ORDER BY name"
+            ).fetchall()
+        return {name: count for name, count in rows}
+
+    def random_quote(
+        self, category: str = DEFAULT_CATEGORY, max_length: Optional[int] = None
+    ) -> Optional[Dict[str, str]]:
+        """Return a random quote from *category*, or None if it has none.
+
+        With *max_length* only quotes up to that many characters qualify;
+        that lookup uses the (category, length) index.
+        """
+        category = category.lower()
+        with self._lock:
+            conn = self._connect()
+            if max_length is None:
+                row = conn.execute(
+                    "SELECT count FROM categories WHERE name = ?", (category,)
+                ).fetchone()
+                if not row or not row[0]:
+                    return None
+                quote = conn.execute(
+                    "SELECT text, author FROM quotes WHERE category = ? AND seq = ?",
+                    (category, random.randrange(row[0])),
+                ).fetchone()
+            else:
+                (matching,) = conn.execute(
+                    "SELECT COUNT(*) FROM quotes WHERE category = ? AND length <= ?",
+                    (category, max_length),
+                ).fetchone()
+                if not matching:
+                    return None
+                quote = conn.execute(
+                    "SELECT text, author FROM quotes WHERE category = ? "
+                    "AND length <= ? LIMIT 1 OFFSET ?",
+                    (category, max_length, random.randrange(matching)),
+                ).fetchone()
+        if quote is None:
+            return None
+        return {"text": quote[0], "author": quote[1]}
+
+    def by_author(self, author: str, limit: int = 20) -> List[Dict[str, str]]:
+        """Return up to *limit* quotes by *author*."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT text, author, category FROM quotes WHERE author = ? LIMIT ?",
+                (author, limit),
+            ).fetchall()
+        return [{"text": t, "author": a, "category": c} for t, a, c in rows]
+
+    # ----- Import -----
+
+    def add(
+        self, text: str, author: str = "Unknown", category: str = DEFAULT_CATEGORY
+    ) -> bool:
+        """Add one quote; returns False if it is empty or already stored."""
+        with self._lock:
+            self._connect()
+            return self._import_records(
+                [{"text": text, "author": author, "category": category}],
+                DEFAULT_CATEGORY,
+            ) == 1
+
+    def import_file(
+        self, path: Union[str, Path], category: str = DEFAULT_CATEGORY
+    ) -> int:
+        """Import quotes from a CSV or JSON file; return how many were added.
+
+        CSV files need a header with ``text`` (or ``quote``) and optionally
+        ``author`` and ``category`` columns. JSON files hold a list of
+        objects with the same keys, or ``{"quotes": [...]}``. Rows without a
+        category are filed under *category*.
+        """
+        path = Path(path)
+        if path.suffix.lower() == ".csv":
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                records: List[Dict[str, Any]] = list(csv.DictReader(f))
+        else:
+            records = _load_json(path)
+        with self._lock:
+            self._connect()
+            return self._import_records(records, category)
+
+    def _import_records(
+        self, records: Iterable[Dict[str, Any]], default_category: str
+    ) -> int:
+        """Insert records, keeping each category's seq numbering dense."""
+        assert self._conn is not None
+        conn = self._conn
+        added = 0
+        with conn:
+            counts = dict(conn.execute("SELECT name, count FROM categories"))
+            for record in records:
+                text = str(record.get("text") or record.get("quote") or "").strip()
+                if not text:
+                    continue
+                author = str(record.get("author") or "").strip() or "Unknown"
+                category = (
+                    str(record.get("category") or "").strip().lower()
+                    or default_category
+                )
+                seq = counts.get(category, 0)
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO quotes "
+                    "(category, seq, text, author, length) VALUES (?, ?, ?, ?, ?)",
+                    (category, seq, text, author, len(text)),
+                )
+                if cursor.rowcount:
+                    counts[category] = seq + 1
+                    added += 1
+            conn.executemany(
+                "INSERT OR REPLACE INTO categories (name, count) VALUES (?, ?)",
+                counts.items(),
+            )
+        return added
+
+
+def _load_json(path: Path) -> List[Dict[str, Any]]:
+    """Read quote records from a JSON list or ``{"quotes": [...]}`` file."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("quotes", [])
+    return [record for record in data if isinstance(record, dict)]
@@ -0,0 +1,317 @@
+"""
+Quote rendering.
+
+QuoteRenderer is the one place quotes are composited onto wallpapers, for
+the CLI/daemon (``WallpaperCore.add_quote_to_image``) and the GUI alike:
+the image is fitted to the screen, the quote block (laid out with the
+largest font that fits, on a darkened box) is blended on from a cached
+overlay tile, and the result is written by a pluggable Encoder (JPEG,
+WebP or PNG). Every encode is timed in ``encode_timings`` so formats and
+settings can be compared.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple, Type, Union
+
+from PIL import Image
+
+from . import display, imaging, layout
+from .fonts import FontManager, font_manager
+from .overlay import OverlayTile, TileCache, draw_tile, tile_cache
+from .render_cache import RenderCache, render_key
+from .thumbnails import ThumbnailCache
+
+PathLike = Union[str, Path]
+
+
+class EncodeTimings:
+    """Running totals of encode time and output size per encoder."""
+
+    def __init__(self) -> None:
+        """Create empty totals."""
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, size: int) -> None:
+        """Record one encode by *name* taking *seconds* and writing *size* bytes."""
+        with self._lock:
+            totals = self._totals.setdefault(
+                name, {"count": 0, "seconds": 0.0, "bytes": 0, "last_seconds": 0.0}
+            )
+            totals["count"] += 1
+            totals["seconds"] += seconds
+            totals["bytes"] += size
+            totals["last_seconds"] = seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, total/mean/last seconds and mean bytes per encoder."""
+        with self._lock:
+            return {
+                name: {
+                    "count": totals["count"],
+                    "seconds": totals["seconds"],
+                    "mean_seconds": totals["seconds"] / totals["count"],
+                    "last_seconds": totals["last_seconds"],
+                    "mean_bytes": totals["bytes"] / totals["count"],
+                }
+                for name, totals in self._totals.items()
+            }
+
+    def reset(self) -> None:
+        """Forget all recorded encodes."""
+        with self._lock:
+            self._totals.clear()
+
+
+encode_timings = EncodeTimings()
+
+
+class Encoder:
+    """Writes rendered images in one format with fixed options."""
+
+    name = ""
+    format = ""
+    extension = ""
+    # Image modes the format can store; anything else is converted to RGB
+    modes: Tuple[str, ...] = ("RGB",)
+
+    def __init__(self, **options: Any) -> None:
+        """Create an encoder passing *options* to ``Image.save``."""
+        self.options = options
+
+    def params(self) -> Dict[str, Any]:
+        """Return the format and options (part of the render cache key)."""
+        return {"format": self.name, **self.options}
+
+    def encode(self, image: Image.Image, path: PathLike) -> int:
+        """Write *image* to *path*; return the number of bytes written."""
+        if image.mode not in self.modes:
+            image = image.convert("RGB")
+        start = time.perf_counter()
+        image.save(path, self.format, **self.options)
+        seconds = time.perf_counter() - start
+        size = Path(path).stat().st_size
+        encode_timings.record(self.name, seconds, size)
+        return size
+
+
+class JpegEncoder(Encoder):
+    """JPEG with tunable quality, chroma subsampling and progressive scan."""
+
+    name = "jpeg"
+    format = "JPEG"
+    extension = ".jpg"
+    modes = ("RGB", "L")
+
+    def __init__(
+        self,
+        quality: int = 95,
+        subsampling: int = 2,
+        progressive: bool = False,
+        optimize: bool = False,
+    ) -> None:
+        """Create a JPEG encoder (subsampling 0 = 4:4:4, 2 = 4:2:0)."""
+        super().__init__(
+            quality=quality,
+            subsampling=subsampling,
+            progressive=progressive,
+            optimize=optimize,
+        )
+
+
+class WebPEncoder(Encoder):
+    """WebP, lossy or lossless."""
+
+    name = "webp"
+    format = "WEBP"
+    extension = ".webp"
+    modes = ("RGB", "RGBA")
+
+    def __init__(
+        self, quality: int = 90, method: int = 4, lossless: bool = False
+    ) -> None:
+        """Create a WebP encoder (method 0 = fastest, 6 = smallest)."""
+        super().__init__(quality=quality, method=method, lossless=lossless)
+
+
+class PngEncoder(Encoder):
+    """Lossless PNG."""
+
+    name = "png"
+    format = "PNG"
+    extension = ".png"
+    modes = ("RGB", "RGBA", "L")
+
+    def __init__(self, compress_level: int = 6, optimize: bool = False) -> None:
+        """Create a PNG encoder (compress_level 1 = fastest, 9 = smallest)."""
+        super().__init__(compress_level=compress_level, optimize=optimize)
+
+
+ENCODERS: Dict[str, Type[Encoder]] = {
+    JpegEncoder.name: JpegEncoder,
+    WebPEncoder.name: WebPEncoder,
+    PngEncoder.name: PngEncoder,
+}
+
+
+def make_encoder(format: str = "jpeg", **options: Any) -> Encoder:
+    """Return an encoder for *format* (jpeg, webp, png) with *options*.
+
+    Raises ValueError for an unknown format or option.
+    """
+    cls = ENCODERS.get(format.lower())
+    if cls is None:
+        raise ValueError(
+            f"Unknown image format {format!r}, expected one of {', '.join(ENCODERS)}"
+        )
+    try:
+        return cls(**options)
+    except TypeError as e:
+        raise ValueError(f"Invalid {format} options: {e}") from None
+
+
+class QuoteRenderer:
+    """Composites a quote onto a wallpaper and encodes the result."""
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        fonts: Optional[FontManager] = None,
+        backdrop_alpha: int = 100,
+        max_width_ratio: float = 0.55,
+        max_height_ratio: float = 0.35,
+        tiles: Optional[TileCache] = None,
+        thumbnails: Optional[ThumbnailCache] = None,
+    ) -> None:
+        """Create a renderer.
+
+        The quote box may use at most *max_width_ratio* of the image width
+        and *max_height_ratio* of its height, on a black backdrop of
+        *backdrop_alpha*. Overlay tiles are cached in *tiles*, or in the
+        process-wide tile cache. With *thumbnails*, a thumbnail of every
+        new render is stored there too.
+        """
+        self.encoder = encoder or JpegEncoder()
+        self.fonts = fonts
+        self.backdrop_alpha = backdrop_alpha
+        self.max_width_ratio = max_width_ratio
+        self.max_height_ratio = max_height_ratio
+        self.tiles = tiles
+        self.thumbnails = thumbnails
+
+    def params(self, size: Tuple[int, int]) -> Dict[str, Any]:
+        """Return everything besides image and quote that affects the output."""
+        return {
+            "size": tuple(size),
+            "alpha": self.backdrop_alpha,
+            "box": (self.max_width_ratio, self.max_height_ratio),
+            **self.encoder.params(),
+        }
+
+    def cache_for(self, directory: PathLike) -> RenderCache:
+        """Return a render cache in *directory* using this encoder's extension."""
+        return RenderCache(directory, suffix=self.encoder.extension)
+
+    def tile_key(self, size: Tuple[int, int], quote: Mapping[str, str]) -> Hashable:
+        """Return the overlay cache key for *quote* on a *size* wallpaper."""
+        manager = self.fonts or font_manager()
+        return (
+            tuple(size),
+            quote.get("text", ""),
+            quote.get("author", ""),
+            self.backdrop_alpha,
+            self.max_width_ratio,
+            self.max_height_ratio,
+            manager.discover(),
+        )
+
+    def overlay(self, size: Tuple[int, int], quote: Mapping[str, str]) -> OverlayTile:
+        """Return the quote block for a *size* wallpaper, drawn once per key."""
+        return self.tiles_cache().get(
+            self.tile_key(size, quote), lambda: self.draw_overlay(size, quote)
+        )
+
+    def tiles_cache(self) -> TileCache:
+        """Return the overlay tile cache this renderer uses."""
+        return self.tiles if self.tiles is not None else tile_cache()
+
+    def draw_overlay(
+        self, size: Tuple[int, int], quote: Mapping[str, str]
+    ) -> OverlayTile:
+        """Lay out *quote* for a *size* wallpaper and draw its overlay tile."""
+        img_width, img_height = size
+        quote_text = quote.get("text", "")
+        author = quote.get("author", "")
+        author_text = f"— {author}" if author else ""
+
+        # Largest font (up to a screen-relative start) that fits the box
+        allowed_w = int(img_width * self.max_width_ratio)
+        allowed_h = int(img_height * self.max_height_ratio)
+        text_layout = layout.fit_text(
+            quote_text,
+            author_text,
+            allowed_w,
+            allowed_h,
+            max_size=max(20, img_height // 36),
+            manager=self.fonts or font_manager(),
+            wrap_width=allowed_w - layout.BOX_MARGIN,
+        )
+
+        # Position: top right with padding
+        padding = max(30, img_width // 40)
+        x = img_width - text_layout.box_width - padding
+        y = padding
+        return draw_tile(text_layout, author_text, (x, y), self.backdrop_alpha)
+
+    def compose(self, image: Image.Image, quote: Mapping[str, str]) -> Image.Image:
+        """Draw *quote* in the top-right corner of *image* and return it."""
+        return self.overlay(image.size, quote).apply(image)
+
+    def render(
+        self,
+        image_path: PathLike,
+        quote: Mapping[str, str],
+        output_path: Optional[PathLike] = None,
+        cache: Optional[RenderCache] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> str:
+        """Render *quote* onto *image_path* at the screen size; return the file.
+
+        The result goes to *output_path*, or into *cache* (returning an
+        earlier identical render when there is one). Errors are raised,
+        including imaging.ImageTooLarge for images over the memory budget.
+        """
+        size = size or display.screen_resolution()
+        key = None
+        if cache is not None:
+            key = render_key(image_path, quote, self.params(size))
+            cached = cache.get(key)
+            if cached:
+                return cached
+
+        # Decodes huge JPEGs at a reduced scale; raises ImageTooLarge for bombs
+        with imaging.open_image(image_path, size) as source:
+            image = self.compose(display.fit_to_screen(source, size), quote)
+
+        if key is not None and cache is not None:
+            temp_path = cache.temp_path(key)
+            self.encoder.encode(image, temp_path)
+            result = cache.commit(key, temp_path)
+        elif output_path is not None:
+            self.encoder.encode(image, output_path)
+            result = str(output_path)
+        else:
+            raise ValueError("Either output_path or cache is required")
+        self._store_thumbnail(result, image)
+        return result
+
+    def _store_thumbnail(self, path: str, image: Image.Image) -> None:
+        if self.thumbnails is None:
+            return
+        try:
+            self.thumbnails.put(path, image)
+        except OSError as e:
+            # The wallpaper is fine; the gallery regenerates the thumbnail
+            print(f"Could not store thumbnail for {path}: {e}")
@@ -0,0 +1,111 @@
+"""
+Cache of rendered wallpapers.
+
+A render is fully determined by the source image content, the quote and
+the layout/encoder parameters, so the hash of those names the output
+file. Rendering the same quote onto the same image again (preview, then
+apply, then "Set Wallpaper") returns the existing file instead of
+compositing and writing another identical JPEG.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+# Bump when rendering changes so old files are not reused
+RENDER_VERSION = 3
+KEY_LENGTH = 24
+_CHUNK_SIZE = 1 << 20
+
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: PathLike) -> str:
+    """Return the SHA-256 of the file at *path*.
+
+    Digests are remembered by (path, size, mtime), so an unchanged file is
+    only read once per process.
+    """
+    stat = os.stat(path)
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(memo_key)
+    if digest is not None:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    with _digests_lock:
+        _digests[memo_key] = digest
+    return digest
+
+
+def render_key(
+    image_path: PathLike,
+    quote: Mapping[str, Any],
+    params: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Return the cache key for rendering *quote* onto *image_path*."""
+    payload = json.dumps(
+        {
+            "version": RENDER_VERSION,
+            "image": file_digest(image_path),
+            "text": quote.get("text", ""),
+            "author": quote.get("author", ""),
+            "params": dict(params or {}),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+class RenderCache:
+    """Rendered wallpapers stored as ``<prefix><key><suffix>`` in a directory."""
+
+    def __init__(
+        self,
+        directory: PathLike,
+        prefix: str = "wallpaper_",
+        suffix: str = ".jpg",
+    ) -> None:
+        """Create a cache writing renders into *directory*."""
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        """Return where the render with *key* is stored."""
+        return self.directory / f"{self.prefix}{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the rendered file for *key*, or None if it is not cached."""
+        path = self.path_for(key)
+        if path.is_file() and path.stat().st_size > 0:
+            self.hits += 1
+            return str(path)
+        self.misses += 1
+        return None
+
+    def temp_path(self, key: str) -> Path:
+        """Return a temporary path to render *key* into before ``commit``."""
+        return self.directory / (
+            f".{self.prefix}{key}.{threading.get_ident()}.tmp{self.suffix}"
+        )
+
+    def commit(self, key: str, temp_path: PathLike) -> str:
+        """Move a finished render into place and return its cached path."""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        return str(path)
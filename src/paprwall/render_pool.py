@@ -0,0 +1,141 @@
+"""
+Process-pool rendering backend.
+
+Compositing a 4K wallpaper and encoding it holds the GIL for a good part
+of a second, which stalls the Tk event loop when it runs on a GUI thread.
+RenderPool runs QuoteRenderer in a small pool of worker processes instead.
+Workers are started once, keep their renderer and loaded fonts between
+jobs, and take only paths, the quote and the screen size, returning the
+path of the rendered file.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from . import imaging
+from .render import QuoteRenderer
+
+PathLike = Union[str, Path]
+
+DEFAULT_WORKERS = 2
+MAX_WORKERS = 8
+
+# Per-process renderer, set up by _init_worker
+_renderer: Optional[QuoteRenderer] = None
+
+
+def _init_worker(renderer: QuoteRenderer, limits: Tuple[int, int]) -> None:
+    """Keep *renderer* for this worker and load its fonts up front."""
+    global _renderer
+    _renderer = renderer
+    # Spawned workers start with default limits; use the parent's budget
+    imaging.configure_limits(*limits)
+    from .fonts import font_manager
+
+    font_manager().discover()
+
+
+def _render_job(
+    image_path: str,
+    quote: Dict[str, str],
+    output_path: Optional[str],
+    cache_dir: Optional[str],
+    size: Optional[Tuple[int, int]],
+) -> str:
+    """Render one wallpaper in a worker process."""
+    renderer = _renderer or QuoteRenderer()
+    cache = renderer.cache_for(cache_dir) if cache_dir is not None else None
+    return renderer.render(image_path, quote, output_path, cache=cache, size=size)
+
+
+def default_workers() -> int:
+    """Return the default pool size: two, or fewer on single-core machines."""
+    return max(1, min(DEFAULT_WORKERS, os.cpu_count() or 1))
+
+
+class RenderPool:
+    """A bounded pool of warm render worker processes."""
+
+    def __init__(
+        self,
+        renderer: Optional[QuoteRenderer] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Create a pool of *workers* processes rendering with *renderer*.
+
+        Processes are started on the first job, not here.
+        """
+        self.renderer = renderer or QuoteRenderer()
+        self.workers = max(1, min(workers or default_workers(), MAX_WORKERS))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Tk and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.renderer, imaging.limits()),
+                )
+            return self._executor
+
+    def submit(
+        self,
+        image_path: PathLike,
+        quote: Mapping[str, str],
+        output_path: Optional[PathLike] = None,
+        cache_dir: Optional[PathLike] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ) -> "Future[str]":
+        """Queue a render and return a future for the output path.
+
+        As with ``QuoteRenderer.render``, the result goes to *output_path* or
+        into the render cache in *cache_dir*. Pass the screen *size* so
+        workers do not have to detect it themselves.
+        """
+        return self._pool().submit(
+            _render_job,
+            str(image_path),
+            dict(quote),
+            str(output_path) if output_path is not None else None,
+            str(cache_dir) if cache_dir is not None else None,
+            (size[0], size[1]) if size is not None else None,
+        )
+
+    def render(
+        self,
+        image_path: PathLike,
+        quote: Mapping[str, str],
+        output_path: Optional[PathLike] = None,
+        cache_dir: Optional[PathLike] = None,
+        size: Optional[Tuple[int, int]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Render in a worker and wait for the output path.
+
+        If a worker died, or the render took longer than *timeout* seconds,
+        the pool is dropped so the next job starts fresh processes, and
+        BrokenProcessPool or TimeoutError is raised.
+        """
+        future = self.submit(image_path, quote, output_path, cache_dir, size)
+        try:
+            return future.result(timeout)
+        except (BrokenProcessPool, TimeoutError):
+            future.cancel()
+            self.shutdown(wait=False)
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes (a later job starts new ones)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,242 @@
+"""
+Health tracking for image and quote providers.
+
+SourceHealth keeps a rolling success rate and latency for every provider
+(keyed by host name), opens a circuit breaker after repeated consecutive
+failures so the provider is skipped, and lets it be probed again once a
+cooldown has passed. Providers are ordered by their score, and the state
+is saved to a JSON file so it survives restarts. Saves are batched: a
+recorded result schedules one write a few seconds later (and at exit), so
+a burst of hedged requests costs a single disk write.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+DEFAULT_WINDOW = 20
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 300.0
+MAX_COOLDOWN = 6 * 3600.0
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+# Seconds between a recorded result and the batched save
+SAVE_DELAY = 2.0
+
+
+def key_for(url: str) -> str:
+    """Return the health key (host name) for a provider URL."""
+    return (urlsplit(url).hostname or url).lower()
+
+
+class _Stats:
+    """Rolling statistics and breaker state for one provider."""
+
+    def __init__(self, window: int) -> None:
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.cooldown = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "outcomes": [int(o) for o in self.outcomes],
+            "latency": self.latency,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_at": self.opened_at,
+            "cooldown": self.cooldown,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], window: int) -> "_Stats":
+        stats = cls(window)
+        stats.outcomes.extend(bool(o) for o in data.get("outcomes", []))
+        stats.latency = data.get("latency")
+        stats.consecutive_failures = int(data.get("consecutive_failures", 0))
+        stats.opened_at = data.get("opened_at")
+        stats.cooldown = float(data.get("cooldown", 0.0))
+        return stats
+
+
+class SourceHealth:
+    """Rolling health scores and circuit breakers for providers.
+
+    A provider's breaker opens after ``failure_threshold`` consecutive
+    failures. While open the provider is skipped; after the cooldown it is
+    half-open and the next request acts as a probe. A successful probe
+    closes the breaker, a failed one reopens it with the cooldown doubled
+    (up to ``MAX_COOLDOWN``).
+
+    With ``path=None`` the state is kept in memory only. Otherwise
+    results are written *save_delay* seconds after they are recorded, or
+    at exit; call ``save()`` to write pending changes now.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        window: int = DEFAULT_WINDOW,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        save_delay: float = SAVE_DELAY,
+    ) -> None:
+        """Create the tracker, loading saved state from *path* if it exists."""
+        self.path = Path(path) if path is not None else None
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.save_delay = save_delay
+        self._stats: Dict[str, _Stats] = {}
+        self._lock = threading.Lock()
+        # Serializes writers; never taken while holding _lock
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self.load()
+        if self.path is not None:
+            atexit.register(self.save)
+
+    # ----- Persistence -----
+
+    def load(self) -> None:
+        """Load saved state, ignoring a missing or unreadable file."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            with self._lock:
+                self._stats = {
+                    key: _Stats.from_dict(value, self.window)
+                    for key, value in data.items()
+                }
+        except Exception as e:
+            print(f"Failed to load source health: {e}")
+
+    def save(self) -> None:
+        """Write the current state to disk if it changed since the last save."""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = {key: stats.to_dict() for key, stats in self._stats.items()}
+            tmp_path = self.path.with_name(
+                f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                print(f"Failed to save source health: {e}")
+
+    def _schedule_save(self) -> None:
+        """Mark the state changed and save it after ``save_delay`` (lock held)."""
+        self._dirty = True
+        if self.path is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.save_delay, self.save)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # ----- Recording -----
+
+    def _get(self, key: str) -> _Stats:
+        if key not in self._stats:
+            self._stats[key] = _Stats(self.window)
+        return self._stats[key]
+
+    def record_success(self, url: str, latency: Optional[float] = None) -> None:
+        """Record a successful request to the provider of *url*."""
+        with self._lock:
+            stats = self._get(key_for(url))
+            stats.outcomes.append(True)
+            if latency is not None:
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += LATENCY_ALPHA * (latency - stats.latency)
+            stats.consecutive_failures = 0
+            stats.opened_at = None
+            stats.cooldown = 0.0
+            self._schedule_save()
+
+    def record_failure(self, url: str) -> None:
+        """Record a failed request, opening the breaker when it trips."""
+        now = time.time()
+        with self._lock:
+            stats = self._get(key_for(url))
+            stats.outcomes.append(False)
+            stats.consecutive_failures += 1
+            if stats.opened_at is not None:
+                # A failed probe: back off further
+                stats.cooldown = min(MAX_COOLDOWN, stats.cooldown * 2)
+                stats.opened_at = now
+            elif stats.consecutive_failures >= self.failure_threshold:
+                stats.cooldown = self.base_cooldown
+                stats.opened_at = now
+            self._schedule_save()
+
+    # ----- Queries -----
+
+    def is_open(self, url: str) -> bool:
+        """Return True while the provider's breaker is open (skip it)."""
+        with self._lock:
+            stats = self._stats.get(key_for(url))
+            if stats is None or stats.opened_at is None:
+                return False
+            return time.time() - stats.opened_at < stats.cooldown
+
+    def score(self, url: str) -> float:
+        """Return a score in (0, 1]; higher is better, unknown providers score 1."""
+        with self._lock:
+            stats = self._stats.get(key_for(url))
+            if stats is None or not stats.outcomes:
+                return 1.0
+            rate = sum(stats.outcomes) / len(stats.outcomes)
+            latency = stats.latency or 0.0
+        return rate / (1.0 + latency)
+
+    def order(self, urls: Iterable[str]) -> List[str]:
+        """Return *urls* with open breakers removed, best score first.
+
+        Ties keep their original order, so the configured preference is
+        used until there is evidence against it.
+        """
+        candidates = [url for url in urls if not self.is_open(url)]
+        return sorted(candidates, key=self.score, reverse=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a summary per provider, for display and debugging."""
+        with self._lock:
+            keys = list(self._stats)
+        summary = {}
+        for key in keys:
+            url = f"https://{key}/"
+            with self._lock:
+                stats = self._stats[key]
+                outcomes = list(stats.outcomes)
+                latency = stats.latency
+            summary[key] = {
+                "success_rate": sum(outcomes) / len(outcomes) if outcomes else None,
+                "latency": latency,
+                "open": self.is_open(url),
+                "score": self.score(url),
+            }
+        return summary
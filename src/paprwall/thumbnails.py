@@ -0,0 +1,132 @@
+"""
+On-disk thumbnail cache for the history gallery.
+
+Thumbnails are small PNGs named by a hash of a sample of the source file's
+content and the thumbnail size, so an edited or replaced file gets a new
+one while a wallpaper moved elsewhere (out of the prefetch spool, say)
+keeps its own. The renderer writes a wallpaper's thumbnail from the image it has
+just composited; anything else is generated from the file on first use.
+Afterwards the gallery only reads a few small PNGs instead of decoding
+full-size wallpapers.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image
+
+from . import CACHE_DIR, imaging
+
+PathLike = Union[str, Path]
+
+THUMBNAIL_SIZE = (120, 80)
+DEFAULT_MAX_ENTRIES = 500
+KEY_LENGTH = 24
+# Bytes hashed from each end of a file for its key
+SAMPLE_BYTES = 64 * 1024
+
+
+class ThumbnailCache:
+    """Thumbnails stored as ``<key>.png`` in a directory."""
+
+    def __init__(
+        self,
+        directory: Optional[PathLike] = None,
+        size: Tuple[int, int] = THUMBNAIL_SIZE,
+    ) -> None:
+        """Create a cache of *size* thumbnails in *directory*.
+
+        The directory defaults to ``CACHE_DIR/thumbnails`` and is created
+        when the first thumbnail is written.
+        """
+        self.directory = (
+            Path(directory) if directory is not None else CACHE_DIR / "thumbnails"
+        )
+        self.size = (size[0], size[1])
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path: PathLike) -> str:
+        """Return the cache key of the file at *path* as it is now.
+
+        The key covers the file size and its first and last SAMPLE_BYTES,
+        not its location, so moving or copying a file keeps the key.
+        """
+        digest = hashlib.sha256(f"{self.size[0]}x{self.size[1]}".encode("ascii"))
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            digest.update(str(length).encode("ascii"))
+            digest.update(f.read(SAMPLE_BYTES))
+            if length > SAMPLE_BYTES:
+                f.seek(max(SAMPLE_BYTES, length - SAMPLE_BYTES))
+                digest.update(f.read(SAMPLE_BYTES))
+        return digest.hexdigest()[:KEY_LENGTH]
+
+    def path_for(self, path: PathLike) -> Path:
+        """Return where the thumbnail of *path* is stored."""
+        return self.directory / f"{self.key(path)}.png"
+
+    def lookup(self, path: PathLike) -> Optional[str]:
+        """Return the cached thumbnail of *path*, or None if there is none."""
+        thumb = self.path_for(path)
+        if thumb.is_file() and thumb.stat().st_size > 0:
+            self.hits += 1
+            return str(thumb)
+        self.misses += 1
+        return None
+
+    def put(self, path: PathLike, image: Image.Image) -> str:
+        """Store a thumbnail of *path* made from its decoded *image*.
+
+        *image* is resampled straight to thumbnail size, never copied.
+        """
+        thumb = image.resize(
+            imaging.fit_size(image.size, self.size),
+            Image.Resampling.LANCZOS,
+            reducing_gap=imaging.REDUCING_GAP,
+        )
+        if thumb.mode not in ("RGB", "RGBA", "L"):
+            thumb = thumb.convert("RGB")
+        return self._write(self.path_for(path), thumb)
+
+    def get(self, path: PathLike) -> str:
+        """Return the thumbnail of *path*, generating it on first use.
+
+        Raises OSError (or imaging.ImageTooLarge) if *path* cannot be read.
+        """
+        cached = self.lookup(path)
+        if cached:
+            return cached
+        thumb, _ = imaging.load_scaled(path, self.size)
+        return self._write(self.path_for(path), thumb)
+
+    def _write(self, target: Path, thumb: Image.Image) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(
+            f".{target.stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        thumb.save(temp, "PNG")
+        os.replace(temp, target)
+        return str(target)
+
+    def prune(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> int:
+        """Delete all but the *max_entries* newest thumbnails; return how many."""
+        try:
+            entries = sorted(
+                self.directory.glob("*.png"),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True,
+            )
+        except OSError:
+            return 0
+        removed = 0
+        for stale in entries[max_entries:]:
+            try:
+                stale.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,114 @@
+"""
+Tests for the asyncio wallpaper API.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from paprwall.async_core import Applied, AsyncWallpaperCore
+
+
+def make_core():
+    """Build a mock WallpaperCore with successful operations."""
+    core = Mock()
+    core.get_quote.return_value = {"text": "Q", "author": "A"}
+    core.download_image.return_value = "/tmp/image.jpg"
+    core.add_quote_to_image.return_value = "/tmp/rendered.jpg"
+    core.set_wallpaper.return_value = True
+    return core
+
+
+class TestAsyncWallpaperCore:
+    """Test the AsyncWallpaperCore class."""
+
+    def test_fetch_runs_concurrently(self):
+        """Test that the quote and image are fetched at the same time."""
+        core = make_core()
+
+        def slow_quote(category):
+            time.sleep(0.3)
+            return {"text": "Q", "author": "A"}
+
+        def slow_image(*args, **kwargs):
+            time.sleep(0.3)
+            return "/tmp/image.jpg"
+
+        core.get_quote.side_effect = slow_quote
+        core.download_image.side_effect = slow_image
+
+        started = time.monotonic()
+        image, quote = asyncio.run(AsyncWallpaperCore(core).fetch())
+
+        assert time.monotonic() - started < 0.55
+        assert image == "/tmp/image.jpg"
+        assert quote["text"] == "Q"
+
+    def test_fetch_without_quote(self):
+        """Test that no quote is requested when add_quote is False."""
+        core = make_core()
+
+        image, quote = asyncio.run(AsyncWallpaperCore(core).fetch(add_quote=False))
+
+        assert image == "/tmp/image.jpg"
+        assert quote == {"text": "", "author": ""}
+        core.get_quote.assert_not_called()
+
+    def test_fetch_and_set(self):
+        """Test the full fetch, render and set flow."""
+        core = make_core()
+
+        result = asyncio.run(AsyncWallpaperCore(core).fetch_and_set())
+
+        assert result == Applied("/tmp/rendered.jpg", {"text": "Q", "author": "A"}, True)
+        core.save_to_history.assert_called_once()
+
+    def test_fetch_and_set_download_fails(self):
+        """Test that a failed download returns None without setting."""
+        core = make_core()
+        core.download_image.return_value = None
+
+        assert asyncio.run(AsyncWallpaperCore(core).fetch_and_set()) is None
+        core.set_wallpaper.assert_not_called()
+
+    def test_apply_failure_skips_history(self):
+        """Test that history is only written for applied wallpapers."""
+        core = make_core()
+        core.set_wallpaper.return_value = False
+
+        result = asyncio.run(AsyncWallpaperCore(core).apply("/tmp/x.jpg", {}))
+
+        assert result.success is False
+        core.save_to_history.assert_not_called()
+
+    def test_timeout_cancels_download(self):
+        """Test that a timed-out download has its cancel event set."""
+        core = make_core()
+        seen = {}
+
+        def blocking_download(*args, cancel_event=None, **kwargs):
+            seen["event"] = cancel_event
+            cancel_event.wait(2)
+            return None
+
+        core.download_image.side_effect = blocking_download
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(AsyncWallpaperCore(core).download_image(timeout=0.1))
+
+        assert isinstance(seen["event"], threading.Event)
+        assert seen["event"].is_set()
+
+    def test_set_from_file(self):
+        """Test rendering and setting a local file."""
+        core = make_core()
+
+        result = asyncio.run(AsyncWallpaperCore(core).set_from_file("/tmp/in.jpg"))
+
+        core.add_quote_to_image.assert_called_once_with(
+            "/tmp/in.jpg", {"text": "Q", "author": "A"}
+        )
+        assert result.path == "/tmp/rendered.jpg"
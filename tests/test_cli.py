@@ -56,6 +56,23 @@ class TestCLIParser:
         args = self.parser.parse_args(["--fetch"])
         assert args.fetch is True
 
+    def test_fetch_and_prefetch_are_exclusive(self):
+        """Test --fetch cannot be combined with --prefetch."""
+        with pytest.raises(SystemExit):
+            self.parser.parse_args(["--fetch", "--prefetch"])
+
+    def test_fetch_rejects_prefetch_settings(self):
+        """Test that spool settings, which imply --prefetch, reject --fetch."""
+        for flag, value in (
+            ("--prefetch-depth", "5"),
+            ("--prefetch-max-mb", "100"),
+            ("--prefetch-policy", "off"),
+        ):
+            with patch("paprwall.cli.prefetch_wallpapers") as mock_prefetch:
+                with pytest.raises(SystemExit):
+                    main(["--fetch", flag, value])
+            mock_prefetch.assert_not_called()
+
     def test_category_argument(self):
         """Test --category argument."""
         args = self.parser.parse_args(["--category", "science"])
@@ -172,6 +189,42 @@ class TestCLIMain:
         assert result == 0
         mock_fetch.assert_called_once_with(category="science", add_quote=False)
 
+    @patch("paprwall.cli.import_quotes")
+    def test_main_import_quotes(self, mock_import):
+        """Test main function with --import-quotes."""
+        mock_import.return_value = 0
+
+        result = main(["--import-quotes", "mine.csv", "--category", "science"])
+
+        assert result == 0
+        mock_import.assert_called_once_with("mine.csv", category="science")
+
+    @patch("paprwall.cli.fetch_and_set_wallpaper")
+    @patch("paprwall.cli.set_quote_source")
+    def test_main_quote_source_with_fetch(self, mock_source, mock_fetch):
+        """Test that --quote-source is saved before fetching."""
+        mock_source.return_value = 0
+        mock_fetch.return_value = 0
+
+        result = main(["--quote-source", "local", "--fetch"])
+
+        assert result == 0
+        mock_source.assert_called_once_with("local")
+        mock_fetch.assert_called_once()
+
+    @patch("paprwall.cli.fetch_and_set_wallpaper")
+    @patch("paprwall.cli.configure_limits")
+    def test_main_image_limits(self, mock_limits, mock_fetch):
+        """Test that the image memory budget is applied before fetching."""
+        mock_fetch.return_value = 0
+
+        result = main(["--fetch", "--max-decode-mb", "256"])
+
+        assert result == 0
+        mock_limits.assert_called_once_with(
+            max_pixels=None, max_decoded_bytes=256 * 1024 * 1024
+        )
+
     @patch("tkinter.Tk")
     @patch("paprwall.cli.WallpaperManagerGUI")
     def test_main_gui_default(self, mock_gui, mock_tk):
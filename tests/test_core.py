@@ -13,6 +13,10 @@ from paprwall.core import (
     set_wallpaper_from_file,
     fetch_and_set_wallpaper,
 )
+from paprwall.history import HistoryStore
+from paprwall.quote_buffer import QuoteBuffer
+from paprwall.quote_store import QuoteStore
+from paprwall.sources import SourceHealth
 
 # Provide a minimal ctypes.windll shim on non-Windows so patching works
 import ctypes
@@ -30,7 +34,12 @@ class TestWallpaperCore:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.core = WallpaperCore()
+        self.core = WallpaperCore(
+            health=SourceHealth(), quotes=QuoteStore(":memory:", seed=False)
+        )
+        self.core.quote_buffer = QuoteBuffer(
+            self.core._fetch_quote_batch, low_water=0, background=False
+        )
 
     def test_init(self):
         """Test WallpaperCore initialization."""
@@ -53,7 +62,7 @@ class TestWallpaperCore:
         for category in expected_categories:
             assert category in self.core.quote_categories
 
-    @patch("requests.get")
+    @patch("paprwall.http_client.get")
     def test_get_quote_success(self, mock_get):
         """Test successful quote retrieval."""
         # Mock successful response from quotable.io
@@ -70,7 +79,7 @@ class TestWallpaperCore:
         assert quote["text"] == "Test quote content"
         assert quote["author"] == "Test Author"
 
-    @patch("requests.get")
+    @patch("paprwall.http_client.get")
     def test_get_quote_failure(self, mock_get):
         """Test quote retrieval when API fails."""
         # Mock failed response
@@ -82,13 +91,99 @@ class TestWallpaperCore:
         assert quote["text"] == "Stay motivated!"
         assert quote["author"] == "PaprWall"
 
-    @patch("requests.get")
+    @patch("paprwall.http_client.get")
+    def test_get_quote_uses_buffered_batch(self, mock_get):
+        """Test that one bulk request serves several quotes."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"content": f"Quote {i}", "author": "Author"} for i in range(20)
+        ]
+        mock_get.return_value = mock_response
+
+        quotes = [self.core.get_quote("science")["text"] for _ in range(10)]
+
+        assert quotes == [f"Quote {i}" for i in range(10)]
+        assert mock_get.call_count == 1
+        assert mock_get.call_args[1]["params"]["limit"] == 50
+
+    def test_get_quote_auto_uses_buffer_when_ready(self):
+        """Test that auto mode answers locally until online quotes are buffered."""
+        self.core.quote_store.add("Local quote", "Author", "science")
+        fetcher = Mock(return_value=[{"text": "Online quote", "author": "Web"}])
+        self.core.quote_buffer = QuoteBuffer(fetcher, low_water=0, background=False)
+
+        first = self.core.get_quote("science")
+        second = self.core.get_quote("science")
+
+        assert first == {"text": "Local quote", "author": "Author"}
+        assert second == {"text": "Online quote", "author": "Web"}
+        fetcher.assert_called_once_with("science")
+
+    @patch("paprwall.http_client.get")
+    def test_get_quote_local_mode_never_uses_network(self, mock_get):
+        """Test that local mode falls back to the default quote offline."""
+        self.core.quote_store.set_source("local")
+
+        quote = self.core.get_quote("science")
+
+        assert quote["text"] == "Stay motivated!"
+        mock_get.assert_not_called()
+
+    @patch("paprwall.http_client.get")
+    def test_get_quote_online_falls_back_to_store(self, mock_get):
+        """Test that online mode uses the corpus when the APIs fail."""
+        self.core.quote_store.set_source("online")
+        self.core.quote_store.add("Stored quote", "Author", "motivational")
+        mock_get.side_effect = Exception("Network error")
+
+        quote = self.core.get_quote("motivational")
+
+        assert quote["text"] == "Stored quote"
+        assert mock_get.called
+
+    @patch("paprwall.http_client.get")
+    def test_get_quote_skips_open_breaker(self, mock_get):
+        """Test that a provider with an open circuit breaker is skipped."""
+        for _ in range(3):
+            self.core.health.record_failure("https://api.quotable.io/random")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"q": "Zen quote", "a": "Zen"}]
+        mock_get.return_value = mock_response
+
+        quote = self.core.get_quote("motivational")
+
+        assert quote["text"] == "Zen quote"
+        assert mock_get.call_count == 1
+        assert "zenquotes.io" in mock_get.call_args[0][0]
+
+    @patch("paprwall.http_client.get")
+    def test_get_quote_zenquotes_only_serves_general_category(self, mock_get):
+        """Test that uncategorized zenquotes never fills another category."""
+        self.core.quote_store.set_source("online")
+        self.core.quote_store.add("Stored science", "Author", "science")
+        for _ in range(3):
+            self.core.health.record_failure("https://api.quotable.io/random")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"q": "Zen quote", "a": "Zen"}]
+        mock_get.return_value = mock_response
+
+        quote = self.core.get_quote("science")
+
+        assert quote["text"] == "Stored science"
+        assert self.core.quote_buffer.size("science") == 0
+        assert not any("zenquotes.io" in c[0][0] for c in mock_get.call_args_list)
+
+    @patch("paprwall.http_client.HttpClient.get")
     def test_download_image_success(self, mock_get):
         """Test successful image download."""
-        # Mock successful response
+        # Mock successful streamed response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.content = b"fake image data"
+        mock_response.headers = {"content-type": "image/jpeg"}
+        mock_response.iter_content.return_value = [b"fake ", b"image data"]
         mock_get.return_value = mock_response
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -100,7 +195,24 @@ class TestWallpaperCore:
                 assert Path(result).exists()
                 assert Path(result).read_bytes() == b"fake image data"
 
-    @patch("requests.get")
+    @patch("paprwall.http_client.HttpClient.get")
+    def test_download_image_keeps_content_type_extension(self, mock_get):
+        """Test that a PNG response is saved with a .png suffix."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "image/png"}
+        mock_response.iter_content.return_value = [b"png data"]
+        mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("paprwall.core.IMAGES_DIR", Path(temp_dir)):
+                result = self.core.download_image("https://example.com/test")
+
+                assert result is not None
+                assert result.endswith(".png")
+                assert Path(result).read_bytes() == b"png data"
+
+    @patch("paprwall.http_client.HttpClient.get")
     def test_download_image_failure(self, mock_get):
         """Test image download failure."""
         mock_get.side_effect = Exception("Network error")
@@ -108,6 +220,22 @@ class TestWallpaperCore:
         result = self.core.download_image("https://example.com/test.jpg")
         assert result is None
 
+    @patch("paprwall.http_client.HttpClient.get")
+    def test_download_image_rejects_non_image(self, mock_get):
+        """Test that non-image responses are rejected before writing."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-type": "text/html"}
+        mock_get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("paprwall.core.IMAGES_DIR", Path(temp_dir)):
+                result = self.core.download_image("https://example.com/test.jpg")
+
+                assert result is None
+                assert list(Path(temp_dir).iterdir()) == []
+        mock_response.iter_content.assert_not_called()
+
     def test_wrap_text(self):
         """Test text wrapping functionality."""
         from PIL import ImageFont
@@ -155,20 +283,31 @@ class TestWallpaperCore:
 
                 self.core.save_to_history("/test/image.jpg", quote_data)
 
-                history_file = Path(temp_dir) / "history.json"
-                assert history_file.exists()
-
-                with open(history_file, "r") as f:
-                    history = json.load(f)
+                store = HistoryStore(Path(temp_dir) / "history.db")
+                history = store.page()
+                store.close()
 
                 assert len(history) == 1
-                assert history[0]["image_path"] == "/test/image.jpg"
+                assert history[0]["path"] == "/test/image.jpg"
                 assert history[0]["quote"] == quote_data
 
 
 class TestCLIFunctions:
     """Test CLI helper functions."""
 
+    def setup_method(self):
+        """Point the prefetch spool at an empty temp directory."""
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.spool_patcher = patch(
+            "paprwall.core.SPOOL_DIR", Path(self.spool_dir.name)
+        )
+        self.spool_patcher.start()
+
+    def teardown_method(self):
+        """Restore the spool directory."""
+        self.spool_patcher.stop()
+        self.spool_dir.cleanup()
+
     @patch("paprwall.core.WallpaperCore")
     def test_set_wallpaper_from_file_success(self, mock_core_class):
         """Test setting wallpaper from file successfully."""
@@ -185,6 +324,20 @@ class TestCLIFunctions:
 
         assert result == 0
 
+    @patch("paprwall.core.WallpaperCore")
+    def test_set_wallpaper_from_file_too_large(self, mock_core_class):
+        """Test that images over the memory budget are rejected cleanly."""
+        from paprwall.imaging import ImageTooLarge
+
+        with patch("os.path.exists", return_value=True), patch(
+            "paprwall.core.imaging.check_image",
+            side_effect=ImageTooLarge("too big"),
+        ):
+            result = set_wallpaper_from_file("/test/huge.png")
+
+        assert result == 1
+        mock_core_class.return_value.set_wallpaper.assert_not_called()
+
     @patch("paprwall.core.WallpaperCore")
     def test_set_wallpaper_from_file_not_found(self, mock_core_class):
         """Test setting wallpaper from non-existent file."""
@@ -209,6 +362,36 @@ class TestCLIFunctions:
 
         assert result == 0
 
+    @patch("paprwall.core.WallpaperCore")
+    def test_fetch_and_set_wallpaper_uses_spool(self, mock_core_class):
+        """Test that a prefetched wallpaper is popped instead of downloading."""
+        from paprwall.prefetch import PrefetchQueue
+
+        spool = Path(self.spool_dir.name)
+        image = spool / "wallpaper_ready.jpg"
+        image.write_bytes(b"rendered")
+        queue = PrefetchQueue(
+            spool,
+            lambda d, t: {"path": str(image), "quote": {"text": "Q", "author": "A"}},
+            depth=1,
+            policy="off",
+        )
+        queue.save_settings()
+        queue.fill("motivational")
+
+        mock_core = Mock()
+        mock_core.set_wallpaper.return_value = True
+        mock_core_class.return_value = mock_core
+
+        with tempfile.TemporaryDirectory() as images_dir:
+            with patch("paprwall.core.IMAGES_DIR", Path(images_dir)):
+                result = fetch_and_set_wallpaper()
+
+                assert result == 0
+                mock_core.download_image.assert_not_called()
+                applied = mock_core.set_wallpaper.call_args[0][0]
+                assert Path(applied) == Path(images_dir) / "wallpaper_ready.jpg"
+
     @patch("paprwall.core.WallpaperCore")
     def test_fetch_and_set_wallpaper_download_fail(self, mock_core_class):
         """Test fetching wallpaper when download fails."""
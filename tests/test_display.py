@@ -0,0 +1,99 @@
+"""
+Tests for screen resolution detection.
+"""
+
+from unittest.mock import Mock, patch
+
+from PIL import Image
+
+from paprwall import display
+
+XRANDR = """Screen 0: minimum 8 x 8, current 4480 x 1440, maximum 32767 x 32767
+eDP-1 connected primary 1920x1080+0+0 (normal left inverted right) 309mm x 174mm
+   1920x1080     60.00*+
+HDMI-1 connected 2560x1440+1920+0 (normal left inverted right) 597mm x 336mm
+   2560x1440     59.95*+
+DP-1 disconnected (normal left inverted right x axis y axis)
+"""
+
+
+class TestDetection:
+    """Test resolution detection and caching."""
+
+    def teardown_method(self):
+        """Reset the cache for other tests."""
+        display._cached = None
+
+    @patch("paprwall.display.platform.system", return_value="Linux")
+    @patch("paprwall.display.subprocess.run")
+    def test_xrandr_outputs(self, mock_run, mock_system):
+        """Test that every connected output is parsed and the largest is used."""
+        mock_run.return_value = Mock(stdout=XRANDR)
+
+        outputs = display.detect_outputs(refresh=True)
+
+        assert outputs == [(1920, 1080), (2560, 1440)]
+        assert display.screen_resolution() == (2560, 1440)
+
+    @patch("paprwall.display.platform.system", return_value="Linux")
+    @patch("paprwall.display.subprocess.run")
+    def test_detected_once(self, mock_run, mock_system):
+        """Test that detection runs once and is then cached."""
+        mock_run.return_value = Mock(stdout=XRANDR)
+
+        display.detect_outputs(refresh=True)
+        display.detect_outputs()
+        display.screen_resolution()
+
+        assert mock_run.call_count == 1
+
+    @patch("paprwall.display.platform.system", return_value="Linux")
+    @patch("paprwall.display.subprocess.run", side_effect=FileNotFoundError)
+    def test_fallback(self, mock_run, mock_system):
+        """Test the Tk fallback and the default when detection fails."""
+        assert display.detect_outputs(refresh=True, fallback=(1366, 768)) == [
+            (1366, 768)
+        ]
+        assert display.detect_outputs(refresh=True) == [display.DEFAULT_RESOLUTION]
+
+    @patch("paprwall.display.platform.system", return_value="Windows")
+    def test_windows_physical_size(self, mock_system):
+        """Test that Windows reads the desktop size without DPI awareness."""
+        windll = Mock()
+        windll.gdi32.GetDeviceCaps.side_effect = lambda hdc, index: {
+            display.DESKTOPHORZRES: 3840,
+            display.DESKTOPVERTRES: 2160,
+        }[index]
+
+        with patch("ctypes.windll", windll, create=True):
+            assert display.detect_outputs(refresh=True) == [(3840, 2160)]
+
+        windll.user32.SetProcessDPIAware.assert_not_called()
+        windll.user32.ReleaseDC.assert_called_once()
+
+    def test_source_url(self):
+        """Test that URL templates are sized for the screen."""
+        display.set_outputs([(3840, 2160)])
+
+        assert (
+            display.source_url("https://picsum.photos/{width}/{height}")
+            == "https://picsum.photos/3840/2160"
+        )
+
+
+class TestFitToScreen:
+    """Test fitting images to the screen size."""
+
+    def test_fit_crops_to_exact_size(self):
+        """Test that a different aspect ratio is scaled and cropped."""
+        image = Image.new("RGB", (1000, 1000))
+
+        fitted = display.fit_to_screen(image, (1366, 768))
+
+        assert fitted.size == (1366, 768)
+
+    def test_matching_image_is_unchanged(self):
+        """Test that an image at screen size is returned as is."""
+        image = Image.new("RGB", (1366, 768))
+
+        assert display.fit_to_screen(image, (1366, 768)) is image
@@ -0,0 +1,93 @@
+"""
+Tests for font discovery and caching.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from PIL import ImageFont
+
+from paprwall.fonts import FONT_CANDIDATES, FontManager
+
+REAL_TRUETYPE = ImageFont.truetype
+
+
+def loadable_pair():
+    """Return the first candidate pair available on this machine."""
+    for quote_path, author_path in FONT_CANDIDATES:
+        try:
+            REAL_TRUETYPE(quote_path, 12)
+            REAL_TRUETYPE(author_path, 12)
+            return quote_path, author_path
+        except Exception:
+            continue
+    return None
+
+
+class TestFontManager:
+    """Test the FontManager class."""
+
+    def test_discovery_runs_once(self):
+        """Test that the candidate chain is walked only once."""
+        manager = FontManager([("missing.ttf", "missing.ttf")])
+
+        attempts = []
+
+        def truetype(font, size=10, *args, **kwargs):
+            if isinstance(font, str):
+                attempts.append(font)
+                raise OSError(font)
+            # load_default() may build on an embedded FreeType font
+            return REAL_TRUETYPE(font, size, *args, **kwargs)
+
+        with patch("paprwall.fonts.ImageFont.truetype", side_effect=truetype):
+            assert manager.discover() is None
+            manager.quote_font(20)
+            manager.author_font(20)
+
+        assert attempts == ["missing.ttf"]
+
+    def test_default_font_fallback(self):
+        """Test that the default font is used when nothing can be loaded."""
+        manager = FontManager([("missing.ttf", "missing.ttf")])
+
+        quote_font, author_font = manager.fonts(30, 20)
+
+        assert quote_font is author_font
+        assert manager.cache_size() == 0
+
+    def test_fonts_are_cached(self):
+        """Test that repeated sizes reuse the loaded font."""
+        pair = loadable_pair()
+        if pair is None:
+            pytest.skip("no TrueType font available")
+        manager = FontManager([pair])
+        manager.discover()
+
+        with patch(
+            "paprwall.fonts.ImageFont.truetype", side_effect=REAL_TRUETYPE
+        ) as mock_truetype:
+            first = manager.quote_font(30)
+            for _ in range(10):
+                assert manager.quote_font(30) is first
+
+        assert mock_truetype.call_count == 1
+        assert manager.hits == 10
+
+    def test_lru_bound(self):
+        """Test that the least recently used font is evicted."""
+        pair = loadable_pair()
+        if pair is None:
+            pytest.skip("no TrueType font available")
+        manager = FontManager([pair], maxsize=2)
+
+        small = manager.quote_font(10)
+        manager.quote_font(20)
+        assert manager.quote_font(10) is small
+        manager.quote_font(30)
+
+        assert manager.cache_size() == 2
+        assert manager.quote_font(10) is small
+        misses = manager.misses
+        manager.quote_font(20)
+        assert manager.misses == misses + 1
@@ -0,0 +1,117 @@
+"""
+Tests for the SQLite wallpaper history.
+"""
+
+import json
+
+from paprwall.history import HistoryPages, HistoryStore, visible_range
+
+QUOTE = {"text": "Be yourself.", "author": "Oscar Wilde"}
+
+
+class TestHistoryStore:
+    """Test the HistoryStore class."""
+
+    def test_newest_first_pages(self):
+        """Test that pages run from the newest entry back."""
+        store = HistoryStore(":memory:")
+        for i in range(25):
+            store.add(f"/walls/{i}.jpg", QUOTE)
+
+        first = store.page(limit=10)
+        last = store.page(first[-1]["id"] - 10, 10)
+
+        assert store.count() == 25
+        assert store.newest_id() == 25
+        assert [e["path"] for e in first[:2]] == ["/walls/24.jpg", "/walls/23.jpg"]
+        assert first[0]["quote"] == QUOTE
+        assert [e["path"] for e in last] == [f"/walls/{i}.jpg" for i in range(4, -1, -1)]
+
+    def test_no_entry_cap(self):
+        """Test that history keeps every entry."""
+        store = HistoryStore(":memory:")
+        for i in range(500):
+            store.add(f"/walls/{i}.jpg")
+
+        assert store.count() == 500
+        assert store.page(store.newest_id() - 498, 5)[0]["path"] == "/walls/0.jpg"
+
+    def test_clear(self):
+        """Test that clearing removes all entries."""
+        store = HistoryStore(":memory:")
+        store.add("/walls/a.jpg", QUOTE)
+
+        store.clear()
+
+        assert store.count() == 0
+        assert store.page() == []
+        # Ids start over, so positions still map onto ids
+        store.add("/walls/b.jpg")
+        assert store.newest_id() == 1
+
+    def test_imports_legacy_json_once(self, tmp_path):
+        """Test importing GUI and CLI history.json entries on first open."""
+        legacy = tmp_path / "history.json"
+        legacy.write_text(
+            json.dumps(
+                [
+                    {"path": "/walls/new.jpg", "quote": QUOTE, "timestamp": "2024-02-01"},
+                    {"image_path": "/walls/old.jpg", "quote": QUOTE, "timestamp": "1700000000"},
+                    {"quote": QUOTE},
+                ]
+            )
+        )
+        store = HistoryStore(tmp_path / "history.db", legacy_json=legacy)
+
+        assert [e["path"] for e in store.page()] == ["/walls/new.jpg", "/walls/old.jpg"]
+        store.close()
+
+        reopened = HistoryStore(tmp_path / "history.db", legacy_json=legacy)
+        assert reopened.count() == 2
+        reopened.close()
+
+
+class TestHistoryPages:
+    """Test the HistoryPages class."""
+
+    def test_entries_by_position(self):
+        """Test random access across page boundaries."""
+        store = HistoryStore(":memory:")
+        for i in range(30):
+            store.add(f"/walls/{i}.jpg")
+        pages = HistoryPages(store, page_size=8, max_pages=2)
+
+        assert pages.count() == 30
+        assert pages.entry(0)["path"] == "/walls/29.jpg"
+        assert pages.entry(29)["path"] == "/walls/0.jpg"
+        assert pages.entry(9)["path"] == "/walls/20.jpg"
+        assert pages.entry(30) is None
+        assert pages.entry(-1) is None
+
+    def test_invalidate_after_add(self):
+        """Test that new entries show up after invalidate."""
+        store = HistoryStore(":memory:")
+        store.add("/walls/a.jpg")
+        pages = HistoryPages(store)
+        assert pages.entry(0)["path"] == "/walls/a.jpg"
+
+        store.add("/walls/b.jpg")
+        assert pages.count() == 1
+
+        pages.invalidate()
+        assert pages.count() == 2
+        assert pages.entry(0)["path"] == "/walls/b.jpg"
+
+
+class TestVisibleRange:
+    """Test visible_range."""
+
+    def test_window_with_overscan(self):
+        """Test the slots covering a scrolled view plus overscan."""
+        assert visible_range(0, 700, 140, 1000) == range(0, 8)
+        assert visible_range(1400, 700, 140, 1000, overscan=0) == range(10, 16)
+        assert visible_range(139_000, 700, 140, 1000) == range(990, 1000)
+
+    def test_empty(self):
+        """Test that an empty history has no visible slots."""
+        assert visible_range(0, 700, 140, 0) == range(0)
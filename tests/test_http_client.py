@@ -0,0 +1,289 @@
+"""
+Tests for the shared pooled HTTP client.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from paprwall import http_client
+from paprwall.http_client import DownloadCancelled, DownloadError, HttpClient
+
+
+def make_response(chunks, content_type="image/jpeg", length=None, status=200):
+    """Build a mock streamed response."""
+    response = Mock()
+    response.status_code = status
+    response.headers = {"content-type": content_type}
+    if length is not None:
+        response.headers["content-length"] = str(length)
+    response.iter_content.return_value = chunks
+    return response
+
+
+class TestHttpClient:
+    """Test the HttpClient class."""
+
+    def test_timeout_for_known_host(self):
+        """Test that per-host timeouts are applied."""
+        client = HttpClient(host_timeouts={"example.com": 3})
+
+        assert client.timeout_for("https://example.com/a.jpg") == 3.0
+        assert client.timeout_for("https://img.example.com/a.jpg") == 3.0
+        assert client.timeout_for("https://zenquotes.io/api/random") == 5.0
+
+    def test_timeout_for_unknown_host(self):
+        """Test that unknown hosts fall back to the default timeout."""
+        client = HttpClient(default_timeout=7)
+
+        assert client.timeout_for("https://unknown.invalid/") == 7.0
+
+    def test_get_applies_host_timeout(self):
+        """Test that get() fills in the host timeout and keeps explicit values."""
+        client = HttpClient(host_timeouts={"example.com": 4})
+        client.session.get = Mock(return_value="response")
+
+        assert client.get("https://example.com/x") == "response"
+        _, kwargs = client.session.get.call_args
+        assert kwargs["timeout"] == 4.0
+
+        client.get("https://example.com/x", timeout=1)
+        _, kwargs = client.session.get.call_args
+        assert kwargs["timeout"] == 1
+
+    def test_pool_configuration(self):
+        """Test that the mounted adapter uses the configured pool size."""
+        client = HttpClient(pool_connections=2, pool_maxsize=5)
+        adapter = client.session.get_adapter("https://picsum.photos/")
+
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 5
+
+
+class TestDownload:
+    """Test streaming downloads."""
+
+    def setup_method(self):
+        """Set up a client whose session is mocked."""
+        self.client = HttpClient()
+        self.client.session.get = Mock()
+
+    def test_download_streams_to_file(self, tmp_path):
+        """Test that chunks are written and progress is reported."""
+        self.client.session.get.return_value = make_response(
+            [b"abc", b"defg"], length=7
+        )
+        progress = Mock()
+        dest = tmp_path / "image.jpg"
+
+        result = self.client.download("https://example.com/a", dest, progress=progress)
+
+        assert dest.read_bytes() == b"abcdefg"
+        assert result.size == 7
+        assert result.content_type == "image/jpeg"
+        progress.assert_called_with(7, 7)
+        assert not (tmp_path / "image.jpg.part").exists()
+
+    def test_download_rejects_declared_size(self, tmp_path):
+        """Test that an oversized content-length aborts before reading."""
+        response = make_response([b"x" * 10], length=10)
+        self.client.session.get.return_value = response
+
+        with pytest.raises(DownloadError):
+            self.client.download("https://example.com/a", tmp_path / "a", max_bytes=5)
+
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+
+    def test_download_aborts_oversized_stream(self, tmp_path):
+        """Test that a body exceeding the cap is aborted and cleaned up."""
+        self.client.session.get.return_value = make_response([b"xxx", b"xxx"])
+
+        with pytest.raises(DownloadError):
+            self.client.download("https://example.com/a", tmp_path / "a", max_bytes=4)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_download_rejects_content_type(self, tmp_path):
+        """Test that non-image responses are rejected."""
+        self.client.session.get.return_value = make_response(
+            [b"<html>"], content_type="text/html; charset=utf-8"
+        )
+
+        with pytest.raises(DownloadError):
+            self.client.download("https://example.com/a", tmp_path / "a")
+
+    def test_download_rejects_http_error(self, tmp_path):
+        """Test that non-200 responses raise DownloadError."""
+        self.client.session.get.return_value = make_response([], status=404)
+
+        with pytest.raises(DownloadError, match="HTTP 404"):
+            self.client.download("https://example.com/a", tmp_path / "a")
+
+
+class TestSharedClient:
+    """Test the process-wide client helpers."""
+
+    def test_get_client_is_shared(self):
+        """Test that the same client instance is reused."""
+        assert http_client.get_client() is http_client.get_client()
+
+    def test_configure_replaces_client(self):
+        """Test that configure() swaps the client and ignores unknown keys."""
+        old = http_client.get_client()
+        with patch.object(old, "close") as mock_close:
+            new = http_client.configure(pool_maxsize=3, unknown_option=True)
+
+        assert new is http_client.get_client()
+        assert new is not old
+        mock_close.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+
+class TestLatency:
+    """Test per-host latency tracking."""
+
+    def test_percentile_needs_samples(self):
+        """Test that no percentile is reported without enough history."""
+        client = HttpClient()
+        client.record_latency("https://example.com/a", 1.0)
+
+        assert client.latency_percentile("https://example.com/b") is None
+
+    def test_percentile_per_host(self):
+        """Test that the p90 is computed from the host's own samples."""
+        client = HttpClient()
+        for i in range(1, 11):
+            client.record_latency("https://example.com/a", i / 10)
+        client.record_latency("https://other.com/a", 5.0)
+
+        assert client.latency_percentile("https://example.com/") == 1.0
+        assert client.latency_percentile("https://example.com/", 50) == 0.6
+        assert client.latency_percentile("https://other.com/") is None
+
+    def test_download_records_latency(self, tmp_path):
+        """Test that complete downloads, not bare requests, are sampled."""
+        client = HttpClient()
+        client.session.get = Mock(return_value=make_response([b"abc"]))
+        for _ in range(5):
+            client.get("https://example.com/x")
+        assert client.latency_percentile("https://example.com/") is None
+
+        for i in range(5):
+            client.download("https://example.com/x", tmp_path / f"{i}.jpg")
+        assert client.latency_percentile("https://example.com/") is not None
+
+
+def slow_chunks(release, count=50):
+    """Yield chunks slowly until *release* is set."""
+    for _ in range(count):
+        if release.wait(0.05):
+            break
+        yield b"s"
+
+
+class TestHedgedDownload:
+    """Test hedged downloads across sources."""
+
+    def setup_method(self):
+        """Set up a client whose responses depend on the host."""
+        self.client = HttpClient()
+        self.release = threading.Event()
+        self.responses = {}
+
+        def fake_get(url, **kwargs):
+            return self.responses[url.split("/")[2]]()
+
+        self.client.session.get = Mock(side_effect=fake_get)
+
+    def teardown_method(self):
+        """Let any slow worker finish."""
+        self.release.set()
+
+    def test_fast_primary_is_not_hedged(self, tmp_path):
+        """Test that a fast preferred source is used alone."""
+        self.responses["fast.com"] = lambda: make_response([b"fast"])
+        self.responses["alt.com"] = lambda: make_response([b"alt"])
+        dest = tmp_path / "image.jpg"
+
+        result = self.client.hedged_download(
+            ["https://fast.com/", "https://alt.com/"], dest, hedge_after=5
+        )
+
+        assert dest.read_bytes() == b"fast"
+        assert result.path == str(dest)
+        assert self.client.session.get.call_count == 1
+
+    def test_slow_primary_is_hedged_and_cancelled(self, tmp_path):
+        """Test that the alternate wins and the slow source is cancelled."""
+        self.responses["slow.com"] = lambda: make_response(slow_chunks(self.release))
+        self.responses["alt.com"] = lambda: make_response([b"alt"])
+        dest = tmp_path / "image.jpg"
+
+        started = time.monotonic()
+        self.client.hedged_download(
+            ["https://slow.com/", "https://alt.com/"], dest, hedge_after=0.5
+        )
+
+        assert time.monotonic() - started < 2
+        assert dest.read_bytes() == b"alt"
+        assert self.client.session.get.call_count == 2
+        # The cancelled attempt leaves no partial files behind
+        time.sleep(0.2)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["image.jpg"]
+
+    def test_failed_primary_falls_over(self, tmp_path):
+        """Test that a failing source is replaced without waiting."""
+        self.responses["bad.com"] = lambda: make_response([], status=500)
+        self.responses["alt.com"] = lambda: make_response([b"alt"])
+        dest = tmp_path / "image.jpg"
+
+        self.client.hedged_download(
+            ["https://bad.com/", "https://alt.com/"], dest, hedge_after=5
+        )
+
+        assert dest.read_bytes() == b"alt"
+
+    def test_failed_hedge_falls_over_while_primary_runs(self, tmp_path):
+        """Test that a failed hedge is replaced before the primary finishes."""
+        self.responses["slow.com"] = lambda: make_response(slow_chunks(self.release))
+        self.responses["bad.com"] = lambda: make_response([], status=500)
+        self.responses["alt.com"] = lambda: make_response([b"alt"])
+        dest = tmp_path / "image.jpg"
+
+        started = time.monotonic()
+        self.client.hedged_download(
+            ["https://slow.com/", "https://bad.com/", "https://alt.com/"],
+            dest,
+            hedge_after=0.5,
+        )
+
+        assert time.monotonic() - started < 1.5
+        assert dest.read_bytes() == b"alt"
+
+    def test_all_sources_fail(self, tmp_path):
+        """Test that the last error is raised when every source fails."""
+        self.responses["bad.com"] = lambda: make_response([], status=500)
+        self.responses["alt.com"] = lambda: make_response([], status=404)
+
+        with pytest.raises(DownloadError, match="404"):
+            self.client.hedged_download(
+                ["https://bad.com/", "https://alt.com/"], tmp_path / "image.jpg"
+            )
+
+    def test_download_cancel_event(self, tmp_path):
+        """Test that a set cancel event aborts a download."""
+        self.responses["slow.com"] = lambda: make_response([b"a", b"b"])
+        cancel = threading.Event()
+        cancel.set()
+
+        with pytest.raises(DownloadCancelled):
+            self.client.download(
+                "https://slow.com/", tmp_path / "image.jpg", cancel_event=cancel
+            )
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,120 @@
+"""
+Tests for the image loading helpers.
+"""
+
+from unittest.mock import patch
+
+from PIL import ExifTags, Image
+
+import pytest
+
+from paprwall import imaging
+from paprwall.imaging import (
+    ImageTooLarge,
+    check_image,
+    fit_size,
+    load_scaled,
+    open_image,
+)
+
+
+class TestLoadScaled:
+    """Test reduced-resolution loading for previews and thumbnails."""
+
+    def test_jpeg_uses_draft(self, tmp_path):
+        """Test that large JPEGs are decoded at a reduced scale."""
+        path = tmp_path / "big.jpg"
+        Image.new("RGB", (4000, 3000), "red").save(path)
+
+        with patch.object(
+            Image.Image, "resize", autospec=True, side_effect=Image.Image.resize
+        ) as mock_resize:
+            image, source_size = load_scaled(path, (120, 80))
+
+        assert source_size == (4000, 3000)
+        assert image.size == (107, 80)
+        decoded = mock_resize.call_args[0][0]
+        assert decoded.width <= 4000 // 8
+
+    def test_png_uses_reduce(self, tmp_path):
+        """Test that non-JPEG images are reduced before resampling."""
+        path = tmp_path / "big.png"
+        Image.new("RGB", (2000, 1000), "blue").save(path)
+
+        with patch.object(
+            Image.Image, "reduce", autospec=True, side_effect=Image.Image.reduce
+        ) as mock_reduce:
+            image, _ = load_scaled(path, (200, 200))
+
+        assert image.size == (200, 100)
+        assert mock_reduce.call_args[0][1] == 5
+
+    def test_exif_orientation(self, tmp_path):
+        """Test that rotated photos come out upright."""
+        path = tmp_path / "rotated.jpg"
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        Image.new("RGB", (400, 200), "green").save(path, exif=exif)
+
+        image, source_size = load_scaled(path, (100, 100))
+
+        assert source_size == (200, 400)
+        assert image.size == (50, 100)
+
+    def test_never_upscales(self):
+        """Test that small images keep their size."""
+        assert fit_size((100, 50), (400, 400)) == (100, 50)
+        assert fit_size((1920, 1080), (480, 480)) == (480, 270)
+
+
+class TestImageBudget:
+    """Test the pixel and memory budget."""
+
+    @pytest.fixture(autouse=True)
+    def restore_limits(self):
+        """Put the default limits back after each test."""
+        yield
+        imaging.configure_limits(
+            imaging.DEFAULT_MAX_PIXELS, imaging.DEFAULT_MAX_DECODED_BYTES
+        )
+
+    def test_pixel_limit_rejects_before_decoding(self, tmp_path):
+        """Test that an image over the pixel limit is refused from its header."""
+        path = tmp_path / "big.png"
+        Image.new("L", (1000, 1000)).save(path)
+        imaging.configure_limits(max_pixels=500_000)
+
+        with pytest.raises(ImageTooLarge):
+            open_image(path)
+        with pytest.raises(ImageTooLarge):
+            load_scaled(path, (100, 100))
+
+    def test_decompression_bomb(self, tmp_path):
+        """Test that Pillow's own bomb error surfaces as ImageTooLarge."""
+        path = tmp_path / "bomb.png"
+        Image.new("1", (3000, 3000)).save(path)
+        imaging.configure_limits(max_pixels=1_000_000)
+
+        with pytest.raises(ImageTooLarge):
+            check_image(path)
+
+    def test_large_jpeg_decoded_at_reduced_scale(self, tmp_path):
+        """Test that a JPEG over the memory budget fits once drafted."""
+        path = tmp_path / "panorama.jpg"
+        Image.new("RGB", (4000, 1000), "white").save(path)
+        imaging.configure_limits(max_decoded_bytes=4 * 1000 * 1000)
+
+        with pytest.raises(ImageTooLarge):
+            open_image(path)
+        with open_image(path, target=(1000, 250)) as image:
+            assert image.size == (1000, 250)
+            image.load()
+
+    def test_png_over_memory_budget(self, tmp_path):
+        """Test that formats without reduced decoding are rejected."""
+        path = tmp_path / "big.png"
+        Image.new("RGB", (2000, 1000)).save(path)
+        imaging.configure_limits(max_decoded_bytes=1024 * 1024)
+
+        with pytest.raises(ImageTooLarge):
+            check_image(path, target=(200, 100))
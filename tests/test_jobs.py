@@ -0,0 +1,127 @@
+"""
+Tests for the bounded priority job executor.
+"""
+
+import threading
+
+import pytest
+
+from paprwall.jobs import JobExecutor, Priority
+
+
+@pytest.fixture
+def executor():
+    """A one-worker executor, shut down after the test."""
+    jobs = JobExecutor(workers=1)
+    yield jobs
+    jobs.shutdown(wait=True)
+
+
+def block(executor, kind="blocker"):
+    """Occupy the worker until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def run():
+        started.set()
+        release.wait(5)
+
+    future = executor.submit(kind, run)
+    assert started.wait(5)
+    return release, future
+
+
+class TestJobExecutor:
+    """Test the JobExecutor class."""
+
+    def test_runs_by_priority(self, executor):
+        """Test that user jobs run before rotation and prefetch."""
+        release, _ = block(executor)
+        order = []
+        futures = [
+            executor.submit("prefetch", lambda: order.append("prefetch"), Priority.PREFETCH),
+            executor.submit("rotate", lambda: order.append("rotate"), Priority.ROTATION),
+            executor.submit("fetch", lambda: order.append("fetch"), Priority.USER),
+        ]
+        assert executor.queued() == ["fetch", "rotate", "prefetch"]
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ["fetch", "rotate", "prefetch"]
+
+    def test_newer_job_replaces_queued(self, executor):
+        """Test that a queued job is superseded by a newer one of its kind."""
+        release, _ = block(executor)
+        old = executor.submit("quote", lambda: "old")
+        new = executor.submit("quote", lambda: "new")
+        release.set()
+
+        assert old.cancelled()
+        assert new.result(timeout=5) == "new"
+        assert executor.dropped == 1
+
+    def test_less_important_job_dropped(self, executor):
+        """Test that a rotation does not displace a queued user fetch."""
+        release, _ = block(executor)
+        user = executor.submit("wallpaper", lambda: "user", Priority.USER)
+        rotation = executor.submit("wallpaper", lambda: "rotation", Priority.ROTATION)
+        release.set()
+
+        assert rotation.cancelled()
+        assert user.result(timeout=5) == "user"
+
+    def test_exclusive_dropped_while_running(self, executor):
+        """Test that an exclusive job is ignored while its kind runs."""
+        release, running = block(executor, kind="wallpaper")
+
+        repeat = executor.submit("wallpaper", lambda: None, exclusive=True)
+        release.set()
+
+        assert repeat.cancelled()
+        assert running.result(timeout=5) is None
+
+    def test_running_job_sees_supersession(self):
+        """Test that a running job learns a newer one of its kind arrived."""
+        jobs = JobExecutor(workers=2)
+        started, checked = threading.Event(), threading.Event()
+        seen = []
+
+        def old():
+            started.set()
+            checked.wait(5)
+            seen.append(jobs.cancelled())
+
+        first = jobs.submit("refresh", old)
+        assert started.wait(5)
+        second = jobs.submit("refresh", lambda: jobs.cancelled())
+        assert second.result(timeout=5) is False
+        checked.set()
+        first.result(timeout=5)
+        jobs.shutdown(wait=True)
+
+        assert seen == [True]
+        assert jobs.cancelled() is False
+
+    def test_base_exception_reaches_future(self, executor):
+        """Test that SystemExit fails the job without ending the worker."""
+
+        def leave():
+            raise SystemExit(1)
+
+        with pytest.raises(SystemExit):
+            executor.submit("exit", leave).result(timeout=5)
+        assert executor.submit("next", lambda: "ok").result(timeout=5) == "ok"
+
+    def test_exceptions_and_shutdown(self, executor):
+        """Test that errors reach the future and shutdown stops new jobs."""
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            executor.submit("fail", fail).result(timeout=5)
+
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            executor.submit("late", lambda: None)
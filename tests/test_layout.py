@@ -0,0 +1,116 @@
+"""
+Tests for quote overlay text layout.
+"""
+
+from paprwall.layout import BOX_MARGIN, WordWidths, fit_text, measure, wrap_text
+
+
+class FakeFont:
+    """Font whose glyphs are size/2 wide and size tall."""
+
+    path = "fake.ttf"
+
+    def __init__(self, size):
+        self.size = size
+
+    def getbbox(self, text):
+        return 0, 0, len(text) * self.size // 2, self.size
+
+    def getlength(self, text):
+        return len(text) * self.size / 2
+
+
+class FakeManager:
+    """Font manager that counts how often fonts are requested."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def fonts(self, quote_size, author_size):
+        self.requests += 1
+        return FakeFont(quote_size), FakeFont(author_size)
+
+
+class TestFitText:
+    """Test the binary-search shrink-to-fit."""
+
+    def test_largest_fitting_size(self):
+        """Test that the result is the largest size that fits."""
+        manager = FakeManager()
+        quote = "x" * 100
+
+        result = fit_text(quote, "— A", 1000, 1000, max_size=80, manager=manager)
+
+        assert result.fits
+        assert result.box_width <= 1000
+        bigger = measure(quote, "— A", result.font_size + 1, manager=manager)
+        assert bigger.box_width > 1000
+
+    def test_logarithmic_measurements(self):
+        """Test that shrinking takes O(log n) measurements."""
+        manager = FakeManager()
+
+        result = fit_text("x" * 200, "— A", 2000, 2000, max_size=400, manager=manager)
+
+        assert result.fits
+        assert manager.requests <= 10
+
+    def test_fits_without_shrinking(self):
+        """Test that short text is laid out at the maximum size in one step."""
+        manager = FakeManager()
+
+        result = fit_text("Hi", "— A", 1000, 1000, max_size=40, manager=manager)
+
+        assert result.font_size == 40
+        assert result.author_font_size == 36
+        assert result.box_height == 40 + 36 + BOX_MARGIN
+        assert manager.requests == 1
+
+    def test_min_size_when_nothing_fits(self):
+        """Test that the minimum size is used when no size fits."""
+        result = fit_text(
+            "x" * 500, "— A", 100, 100, max_size=60, min_size=14, manager=FakeManager()
+        )
+
+        assert not result.fits
+        assert result.font_size == 14
+
+
+class TestWrapText:
+    """Test word wrapping with cached word widths."""
+
+    def test_lines_fit(self):
+        """Test that every wrapped line fits the width."""
+        font = FakeFont(10)
+        text = "the quick brown fox jumps over the lazy dog " * 5
+
+        lines = wrap_text(text, font, 120, WordWidths())
+
+        assert " ".join(lines) == text.strip()
+        assert all(font.getlength(line) <= 120 for line in lines)
+
+    def test_long_word_gets_own_line(self):
+        """Test that a word wider than the line is not split or dropped."""
+        lines = wrap_text("a supercalifragilistic b", FakeFont(10), 50, WordWidths())
+
+        assert lines == ["a", "supercalifragilistic", "b"]
+
+    def test_each_distinct_word_measured_once(self):
+        """Test that words are measured once and reused across renders."""
+        widths = WordWidths()
+        text = "to be or not to be that is the question"
+
+        wrap_text(text, FakeFont(10), 100, widths)
+        assert widths.misses == len(set(text.split())) + 1  # words and space
+
+        wrap_text(text, FakeFont(10), 60, widths)
+        assert widths.misses == len(set(text.split())) + 1
+
+    def test_cache_is_per_font_size(self):
+        """Test that a different size is measured separately."""
+        widths = WordWidths()
+
+        wrap_text("hello", FakeFont(10), 100, widths)
+        wrap_text("hello", FakeFont(20), 100, widths)
+
+        assert widths.misses == 4
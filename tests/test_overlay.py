@@ -0,0 +1,100 @@
+"""
+Tests for cached quote overlay tiles.
+"""
+
+from PIL import Image
+
+from paprwall.overlay import OverlayTile, TileCache
+from paprwall.render import QuoteRenderer
+
+QUOTE = {"text": "Stay hungry, stay foolish.", "author": "Steve Jobs"}
+
+
+def make_tile(color=(0, 0, 0, 128), position=(0, 0)):
+    """Return a 10x10 tile of one RGBA color."""
+    return OverlayTile(Image.new("RGBA", (10, 10), color), position)
+
+
+class TestOverlayTile:
+    """Test the OverlayTile class."""
+
+    def test_apply_blends_alpha(self):
+        """Test that the tile is blended by its alpha at its position."""
+        image = Image.new("RGB", (20, 20), (200, 200, 200))
+
+        result = make_tile(position=(5, 5)).apply(image)
+
+        assert result.getpixel((0, 0)) == (200, 200, 200)
+        assert all(abs(v - 100) <= 1 for v in result.getpixel((10, 10)))
+
+    def test_apply_clips_to_image(self):
+        """Test that a tile partly outside the image is clipped."""
+        image = Image.new("RGB", (8, 8), "white")
+
+        make_tile((0, 0, 0, 255), position=(-5, 4)).apply(image)
+
+        assert image.getpixel((0, 7)) == (0, 0, 0)
+        assert image.getpixel((7, 0)) == (255, 255, 255)
+
+
+class TestTileCache:
+    """Test the TileCache class."""
+
+    def test_created_once_per_key(self):
+        """Test that a tile is drawn once and then reused."""
+        cache = TileCache()
+        calls = []
+
+        def create():
+            calls.append(1)
+            return make_tile()
+
+        first = cache.get("k", create)
+        second = cache.get("k", create)
+
+        assert first is second
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used tile is dropped first."""
+        cache = TileCache(maxsize=2)
+        cache.get("a", make_tile)
+        cache.get("b", make_tile)
+        cache.get("a", make_tile)
+        cache.get("c", make_tile)
+
+        assert cache.cache_size() == 2
+        cache.get("a", make_tile)
+        assert cache.hits == 2
+        cache.get("b", make_tile)
+        assert cache.misses == 4
+
+
+class TestRendererOverlay:
+    """Test overlay reuse by QuoteRenderer."""
+
+    def test_overlay_reused_across_images(self):
+        """Test that one tile serves every image of the same size."""
+        renderer = QuoteRenderer(tiles=TileCache())
+
+        dark = renderer.compose(Image.new("RGB", (800, 600), "navy"), QUOTE)
+        light = renderer.compose(Image.new("RGB", (800, 600), "white"), QUOTE)
+        renderer.compose(Image.new("RGB", (1024, 768), "navy"), QUOTE)
+
+        assert (renderer.tiles.hits, renderer.tiles.misses) == (1, 2)
+        # Backdrop darkens the corner, the rest of the image is untouched
+        assert sum(light.getpixel((765, 15))) < 765
+        assert light.getpixel((10, 590)) == (255, 255, 255)
+        assert dark.getpixel((10, 590)) == (0, 0, 128)
+
+    def test_quote_and_settings_in_key(self):
+        """Test that a different quote or backdrop draws a new tile."""
+        renderer = QuoteRenderer(tiles=TileCache())
+        key = renderer.tile_key((800, 600), QUOTE)
+
+        assert renderer.tile_key((800, 600), dict(QUOTE)) == key
+        assert renderer.tile_key((800, 600), {**QUOTE, "author": "X"}) != key
+        assert renderer.tile_key((600, 800), QUOTE) != key
+        renderer.backdrop_alpha = 50
+        assert renderer.tile_key((800, 600), QUOTE) != key
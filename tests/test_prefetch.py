@@ -0,0 +1,145 @@
+"""
+Tests for the prefetch spool of ready-to-apply wallpapers.
+"""
+
+import time
+
+import pytest
+from pathlib import Path
+
+from paprwall.prefetch import PrefetchQueue
+
+
+def make_producer(size=10, fail=False):
+    """Return a producer writing *size*-byte images and counting its calls."""
+    calls = []
+
+    def produce(spool_dir, tag):
+        calls.append(tag)
+        if fail:
+            return None
+        path = Path(spool_dir) / f"wallpaper_{len(calls)}.jpg"
+        path.write_bytes(b"x" * size)
+        return {"path": str(path), "quote": {"text": f"q{len(calls)}", "author": "A"}}
+
+    produce.calls = calls
+    return produce
+
+
+def wait_for(condition, timeout=5):
+    """Poll *condition* until it holds or *timeout* seconds pass."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestPrefetchQueue:
+    """Test the PrefetchQueue class."""
+
+    def test_fill_to_depth(self, tmp_path):
+        """Test that fill() produces until the queue depth is reached."""
+        queue = PrefetchQueue(tmp_path, make_producer(), depth=3)
+
+        assert queue.fill("science") == 3
+        assert queue.ready("science") == 3
+        assert queue.fill("science") == 0
+
+    def test_pop_oldest_first_and_moves_file(self, tmp_path):
+        """Test that pop() returns the oldest entry and moves it out."""
+        spool = tmp_path / "spool"
+        dest = tmp_path / "dest"
+        dest.mkdir()
+        queue = PrefetchQueue(spool, make_producer(), depth=2)
+        queue.fill("science")
+
+        entry = queue.pop("science", dest_dir=dest)
+
+        assert entry["quote"]["text"] == "q1"
+        assert Path(entry["path"]).parent == dest
+        assert Path(entry["path"]).exists()
+        assert queue.ready("science") == 1
+
+    def test_pop_respects_tag(self, tmp_path):
+        """Test that entries rendered for another tag are not popped."""
+        queue = PrefetchQueue(tmp_path, make_producer(), depth=1)
+        queue.fill("science")
+
+        assert queue.pop("philosophy") is None
+        assert queue.pop("science") is not None
+
+    def test_prune_other_tags(self, tmp_path):
+        """Test that prune() removes entries of other tags and their files."""
+        queue = PrefetchQueue(tmp_path, make_producer(), depth=1)
+        queue.fill("science")
+        queue.fill("philosophy")
+
+        assert queue.prune(keep_tag="philosophy") == 1
+        assert queue.ready() == 1
+        assert not (tmp_path / "wallpaper_1.jpg").exists()
+
+    def test_disk_budget_stops_fill(self, tmp_path):
+        """Test that fill() stops once the disk budget is used up."""
+        queue = PrefetchQueue(tmp_path, make_producer(size=1000), depth=5, max_bytes=1500)
+
+        assert queue.fill("science") == 2
+        assert queue.refill_due("science") is False
+
+    def test_failed_producer(self, tmp_path):
+        """Test that a failing producer ends the fill without entries."""
+        queue = PrefetchQueue(tmp_path, make_producer(fail=True), depth=3)
+
+        assert queue.fill("science") == 0
+        assert queue.ready() == 0
+
+    def test_refill_policies(self, tmp_path):
+        """Test when each refill policy asks for more wallpapers."""
+        queue = PrefetchQueue(tmp_path, make_producer(), depth=3, policy="eager")
+        queue.fill("science")
+        queue.pop("science")
+        assert queue.refill_due("science") is True
+
+        queue.configure(policy="low-water")
+        assert queue.refill_due("science") is False
+        queue.pop("science")
+        assert queue.refill_due("science") is True
+
+        queue.configure(policy="off")
+        assert queue.refill_due("science") is False
+
+    def test_restart_after_stop(self, tmp_path):
+        """Test that the refill thread can be stopped and started again."""
+        queue = PrefetchQueue(tmp_path, make_producer(), depth=2, retry_delay=0.05)
+        queue.start(lambda: "science")
+        assert wait_for(lambda: queue.ready("science") == 2)
+
+        queue.stop()
+        queue.pop("science")
+        time.sleep(0.2)
+        assert queue.ready("science") == 1
+
+        queue.start(lambda: "science")
+        assert wait_for(lambda: queue.ready("science") == 2)
+        queue.stop()
+
+    def test_invalid_policy(self, tmp_path):
+        """Test that unknown refill policies are rejected."""
+        with pytest.raises(ValueError):
+            PrefetchQueue(tmp_path, policy="sometimes")
+
+    def test_settings_round_trip(self, tmp_path):
+        """Test that saved settings are used by from_settings()."""
+        assert PrefetchQueue.is_configured(tmp_path) is False
+        queue = PrefetchQueue(tmp_path, depth=7, max_bytes=1234, policy="low-water")
+        queue.save_settings()
+
+        loaded = PrefetchQueue.from_settings(tmp_path)
+
+        assert PrefetchQueue.is_configured(tmp_path) is True
+        assert (loaded.depth, loaded.max_bytes, loaded.policy) == (7, 1234, "low-water")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
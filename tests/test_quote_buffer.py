@@ -0,0 +1,129 @@
+"""
+Tests for the bulk-refilled quote buffer.
+"""
+
+import threading
+import time
+
+from unittest.mock import Mock
+
+from paprwall.quote_buffer import QuoteBuffer
+
+
+def batch(prefix, count):
+    """Build a batch of distinct quotes."""
+    return [{"text": f"{prefix} {i}", "author": "A"} for i in range(count)]
+
+
+class TestQuoteBuffer:
+    """Test the QuoteBuffer class."""
+
+    def test_one_fetch_serves_many_pops(self):
+        """Test that the network is hit once per batch."""
+        fetcher = Mock(return_value=batch("Q", 50))
+        buffer = QuoteBuffer(fetcher, low_water=5, background=False)
+
+        texts = [buffer.pop("science")["text"] for _ in range(40)]
+
+        assert texts == [f"Q {i}" for i in range(40)]
+        fetcher.assert_called_once_with("science")
+
+    def test_low_water_triggers_refill(self):
+        """Test that a refill happens once the buffer runs low."""
+        fetcher = Mock(side_effect=[batch("A", 10), batch("B", 10)])
+        buffer = QuoteBuffer(fetcher, low_water=5, background=False)
+
+        for _ in range(5):
+            buffer.pop("science")
+        assert fetcher.call_count == 1
+
+        buffer.pop("science")
+        assert fetcher.call_count == 2
+        assert buffer.size("science") == 14
+
+    def test_categories_are_separate(self):
+        """Test that each category has its own buffer."""
+        buffer = QuoteBuffer(lambda category: batch(category, 10), background=False)
+
+        assert buffer.pop("science")["text"] == "science 0"
+        assert buffer.pop("philosophy")["text"] == "philosophy 0"
+
+    def test_failed_fetch_returns_none(self):
+        """Test that pop returns None when nothing can be fetched."""
+        buffer = QuoteBuffer(Mock(side_effect=Exception("offline")), background=False)
+
+        assert buffer.pop("science") is None
+
+    def test_pop_without_waiting(self):
+        """Test that a non-waiting pop refills in the background."""
+        refilled = threading.Event()
+
+        def fetcher(category):
+            refilled.set()
+            return batch("Q", 10)
+
+        buffer = QuoteBuffer(fetcher)
+
+        assert buffer.pop("science", wait=False) is None
+        assert refilled.wait(2)
+        for _ in range(100):
+            if buffer.size("science"):
+                break
+            time.sleep(0.01)
+        assert buffer.pop("science", wait=False)["text"] == "Q 0"
+
+    def test_duplicates_and_capacity(self):
+        """Test that repeated quotes are dropped and capacity is respected."""
+        buffer = QuoteBuffer(
+            lambda category: batch("Q", 10) + batch("Q", 10),
+            capacity=8,
+            background=False,
+        )
+
+        assert buffer.refill("science") == 8
+        assert buffer.refill("science") == 0
+
+    def test_background_refill(self):
+        """Test that a low buffer is refilled on a background thread."""
+        refilled = threading.Event()
+
+        def fetcher(category):
+            if fetcher.calls:
+                refilled.set()
+            fetcher.calls += 1
+            return batch(f"B{fetcher.calls}", 3)
+
+        fetcher.calls = 0
+        buffer = QuoteBuffer(fetcher, low_water=3)
+
+        buffer.pop("science")
+
+        assert refilled.wait(2)
+
+    def test_persists_across_restarts(self, tmp_path):
+        """Test that unused quotes survive a restart."""
+        path = tmp_path / "buffer.json"
+        buffer = QuoteBuffer(lambda c: batch("Q", 10), path, background=False)
+        buffer.pop("science")
+        buffer.save()
+
+        fetcher = Mock(return_value=[])
+        reloaded = QuoteBuffer(fetcher, path, low_water=0, background=False)
+
+        assert reloaded.pop("science")["text"] == "Q 1"
+        fetcher.assert_not_called()
+
+    def test_pop_does_not_rewrite_file(self, tmp_path):
+        """Test that handing out quotes only writes on refill or save()."""
+        path = tmp_path / "buffer.json"
+        buffer = QuoteBuffer(
+            lambda c: batch("Q", 10), path, low_water=0, background=False
+        )
+        buffer.pop("science")
+        path.write_text("{}")
+
+        buffer.pop("science")
+        assert path.read_text() == "{}"
+
+        buffer.save()
+        assert QuoteBuffer(Mock(), path).size("science") == 8
@@ -0,0 +1,112 @@
+"""
+Tests for the local SQLite quote corpus.
+"""
+
+import json
+
+import pytest
+
+from paprwall.quote_store import QuoteStore
+
+
+class TestQuoteStore:
+    """Test the QuoteStore class."""
+
+    def test_bundled_corpus_covers_categories(self):
+        """Test that the bundled corpus seeds every GUI/CLI category."""
+        store = QuoteStore(":memory:")
+
+        counts = store.categories()
+        for category in [
+            "motivational",
+            "mathematics",
+            "science",
+            "famous",
+            "technology",
+            "philosophy",
+        ]:
+            assert counts.get(category, 0) >= 10
+            quote = store.random_quote(category)
+            assert quote["text"] and quote["author"]
+
+    def test_random_quote_per_category(self):
+        """Test that random selection stays inside the category."""
+        store = QuoteStore(":memory:", seed=False)
+        store.add("Alpha", "A", "one")
+        store.add("Beta", "B", "one")
+        store.add("Gamma", "C", "two")
+
+        seen = {store.random_quote("one")["text"] for _ in range(50)}
+
+        assert seen == {"Alpha", "Beta"}
+        assert store.random_quote("two") == {"text": "Gamma", "author": "C"}
+        assert store.random_quote("missing") is None
+
+    def test_duplicates_are_ignored(self):
+        """Test that re-adding a quote keeps the category count dense."""
+        store = QuoteStore(":memory:", seed=False)
+
+        assert store.add("Same", "A", "one")
+        assert not store.add("Same", "A", "one")
+        assert not store.add("   ", "A", "one")
+        assert store.count("one") == 1
+
+    def test_max_length(self):
+        """Test filtering by quote length."""
+        store = QuoteStore(":memory:", seed=False)
+        store.add("Short", "A", "one")
+        store.add("A much longer quote than the other", "B", "one")
+
+        for _ in range(20):
+            assert store.random_quote("one", max_length=10)["text"] == "Short"
+        assert store.random_quote("one", max_length=3) is None
+
+    def test_import_csv(self, tmp_path):
+        """Test importing a CSV collection with and without categories."""
+        path = tmp_path / "quotes.csv"
+        path.write_text(
+            "quote,author,category\n"
+            "First,Ann,science\n"
+            "Second,,\n",
+            encoding="utf-8",
+        )
+        store = QuoteStore(":memory:", seed=False)
+
+        assert store.import_file(path, category="famous") == 2
+        assert store.random_quote("science")["text"] == "First"
+        assert store.random_quote("famous") == {"text": "Second", "author": "Unknown"}
+
+    def test_import_json(self, tmp_path):
+        """Test importing a JSON collection."""
+        path = tmp_path / "quotes.json"
+        path.write_text(
+            json.dumps({"quotes": [{"text": "One", "author": "X", "category": "Tech"}]}),
+            encoding="utf-8",
+        )
+        store = QuoteStore(":memory:", seed=False)
+
+        assert store.import_file(path) == 1
+        assert store.count("tech") == 1
+        assert store.by_author("X")[0]["category"] == "tech"
+
+    def test_source_setting_persists(self, tmp_path):
+        """Test that the quote source mode is saved with the store."""
+        db_path = tmp_path / "quotes.db"
+        store = QuoteStore(db_path, seed=False)
+        assert store.source() == "auto"
+
+        store.set_source("local")
+        store.close()
+
+        assert QuoteStore(db_path, seed=False).source() == "local"
+        with pytest.raises(ValueError):
+            store.set_source("bogus")
+
+    def test_seed_runs_once(self, tmp_path):
+        """Test that reopening a seeded store does not import again."""
+        db_path = tmp_path / "quotes.db"
+        store = QuoteStore(db_path)
+        total = store.count()
+        store.close()
+
+        assert QuoteStore(db_path).count() == total
@@ -0,0 +1,142 @@
+"""
+Tests for the shared quote renderer and its encoders.
+"""
+
+import pytest
+from PIL import Image, features
+
+from paprwall import layout
+from paprwall.thumbnails import ThumbnailCache
+from paprwall.render import (
+    JpegEncoder,
+    PngEncoder,
+    QuoteRenderer,
+    WebPEncoder,
+    encode_timings,
+    make_encoder,
+)
+
+QUOTE = {"text": "The only way to do great work is to love what you do.", "author": "Steve Jobs"}
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A plain JPEG to render onto."""
+    path = tmp_path / "source.jpg"
+    Image.new("RGB", (800, 600), "navy").save(path)
+    return path
+
+
+class TestEncoders:
+    """Test the pluggable encoders."""
+
+    def test_make_encoder(self):
+        """Test building encoders from settings."""
+        encoder = make_encoder("jpeg", quality=80, progressive=True)
+
+        assert isinstance(encoder, JpegEncoder)
+        assert encoder.params()["quality"] == 80
+        assert isinstance(make_encoder("PNG"), PngEncoder)
+
+        with pytest.raises(ValueError):
+            make_encoder("gif")
+        with pytest.raises(ValueError):
+            make_encoder("jpeg", bogus=1)
+
+    @pytest.mark.parametrize(
+        "encoder, fmt",
+        [
+            (JpegEncoder(quality=80, subsampling=0, progressive=True), "JPEG"),
+            (PngEncoder(compress_level=1), "PNG"),
+            (WebPEncoder(quality=70), "WEBP"),
+        ],
+    )
+    def test_encode_formats(self, tmp_path, encoder, fmt):
+        """Test that each encoder writes its format and records a timing."""
+        if fmt == "WEBP" and not features.check("webp"):
+            pytest.skip("Pillow built without WebP")
+        encode_timings.reset()
+        path = tmp_path / f"out{encoder.extension}"
+
+        size = encoder.encode(Image.new("RGB", (64, 48), "red"), path)
+
+        with Image.open(path) as image:
+            assert image.format == fmt
+        stats = encode_timings.summary()[encoder.name]
+        assert stats["count"] == 1
+        assert stats["mean_bytes"] == size > 0
+
+    def test_jpeg_converts_rgba(self, tmp_path):
+        """Test that images JPEG cannot store are converted."""
+        path = tmp_path / "out.jpg"
+
+        JpegEncoder().encode(Image.new("RGBA", (10, 10)), path)
+
+        with Image.open(path) as image:
+            assert image.mode == "RGB"
+
+
+class TestQuoteRenderer:
+    """Test the QuoteRenderer class."""
+
+    def test_render_to_path(self, tmp_path, source):
+        """Test rendering at the requested screen size."""
+        output = tmp_path / "out.png"
+        renderer = QuoteRenderer(PngEncoder())
+
+        result = renderer.render(source, QUOTE, output, size=(1024, 768))
+
+        assert result == str(output)
+        with Image.open(result) as image:
+            assert image.size == (1024, 768)
+            # The backdrop darkens the top-right corner only
+            assert sum(image.getpixel((990, 15))) < sum(image.getpixel((10, 700)))
+
+    def test_render_cache_hit(self, tmp_path, source):
+        """Test that an identical render is reused."""
+        renderer = QuoteRenderer()
+        cache = renderer.cache_for(tmp_path / "out")
+        cache.directory.mkdir()
+
+        first = renderer.render(source, QUOTE, cache=cache, size=(640, 480))
+        second = renderer.render(source, dict(QUOTE), cache=cache, size=(640, 480))
+        other = renderer.render(source, {**QUOTE, "author": "X"}, cache=cache, size=(640, 480))
+
+        assert first == second != other
+        assert first.endswith(".jpg")
+        assert len(list(cache.directory.iterdir())) == 2
+
+    def test_thumbnail_stored_with_render(self, tmp_path, source):
+        """Test that a renderer with a thumbnail cache fills it."""
+        thumbnails = ThumbnailCache(tmp_path / "thumbs")
+        renderer = QuoteRenderer(PngEncoder(), thumbnails=thumbnails)
+
+        result = renderer.render(source, QUOTE, tmp_path / "out.png", size=(960, 540))
+
+        assert thumbnails.lookup(result) is not None
+        assert thumbnails.hits == 1
+
+    def test_output_extension_follows_encoder(self, tmp_path):
+        """Test that cached renders are named for their format."""
+        assert QuoteRenderer(PngEncoder()).cache_for(tmp_path).path_for("k").suffix == ".png"
+
+    def test_long_quotes_wrap(self):
+        """Test that long quotes are wrapped inside the allowed box."""
+        image = Image.new("RGB", (1920, 1080))
+        text_layout = layout.fit_text(
+            "word " * 60,
+            "— A",
+            int(1920 * 0.55),
+            int(1080 * 0.35),
+            max_size=30,
+            wrap_width=int(1920 * 0.55) - layout.BOX_MARGIN,
+        )
+
+        assert len(text_layout.lines) > 1
+        assert text_layout.fits
+        assert QuoteRenderer().compose(image, {"text": "word " * 60, "author": "A"}).size == (1920, 1080)
+
+    def test_render_requires_destination(self, source):
+        """Test that render needs an output path or a cache."""
+        with pytest.raises(ValueError):
+            QuoteRenderer().render(source, QUOTE, size=(100, 100))
@@ -0,0 +1,70 @@
+"""
+Tests for the rendered wallpaper cache.
+"""
+
+from paprwall.render_cache import RenderCache, file_digest, render_key
+
+QUOTE = {"text": "Stay hungry.", "author": "Someone"}
+
+
+class TestRenderKey:
+    """Test render cache keys."""
+
+    def test_same_inputs_same_key(self, tmp_path):
+        """Test that identical content gives the same key at any path."""
+        first = tmp_path / "a.jpg"
+        second = tmp_path / "b.jpg"
+        first.write_bytes(b"image bytes")
+        second.write_bytes(b"image bytes")
+
+        assert render_key(first, QUOTE, {"size": (1920, 1080)}) == render_key(
+            second, dict(QUOTE), {"size": (1920, 1080)}
+        )
+
+    def test_inputs_change_key(self, tmp_path):
+        """Test that image, quote, author and parameters all change the key."""
+        image = tmp_path / "a.jpg"
+        other = tmp_path / "b.jpg"
+        image.write_bytes(b"image bytes")
+        other.write_bytes(b"other bytes")
+        base = render_key(image, QUOTE, {"size": (1920, 1080)})
+
+        assert render_key(other, QUOTE, {"size": (1920, 1080)}) != base
+        assert render_key(image, {**QUOTE, "text": "Else"}, {"size": (1920, 1080)}) != base
+        assert render_key(image, {**QUOTE, "author": "X"}, {"size": (1920, 1080)}) != base
+        assert render_key(image, QUOTE, {"size": (3840, 2160)}) != base
+
+    def test_digest_follows_file_changes(self, tmp_path):
+        """Test that a rewritten file is hashed again."""
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"one")
+        first = file_digest(path)
+
+        path.write_bytes(b"two and more")
+
+        assert file_digest(path) != first
+
+
+class TestRenderCache:
+    """Test the RenderCache class."""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Test that a committed render is returned on the next lookup."""
+        cache = RenderCache(tmp_path)
+
+        assert cache.get("abc") is None
+        temp = cache.temp_path("abc")
+        temp.write_bytes(b"jpeg")
+        path = cache.commit("abc", temp)
+
+        assert cache.get("abc") == path
+        assert path == str(tmp_path / "wallpaper_abc.jpg")
+        assert not temp.exists()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_empty_file_is_a_miss(self, tmp_path):
+        """Test that a truncated render is not reused."""
+        cache = RenderCache(tmp_path)
+        cache.path_for("abc").write_bytes(b"")
+
+        assert cache.get("abc") is None
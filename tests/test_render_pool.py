@@ -0,0 +1,82 @@
+"""
+Tests for the process-pool render backend.
+"""
+
+from concurrent.futures import TimeoutError
+
+import pytest
+from PIL import Image
+
+from paprwall.render import PngEncoder, QuoteRenderer
+from paprwall.render_pool import MAX_WORKERS, RenderPool
+
+QUOTE = {"text": "Simplicity is the ultimate sophistication.", "author": "Leonardo da Vinci"}
+
+
+@pytest.fixture
+def pool():
+    """A one-worker pool, shut down after the test."""
+    render_pool = RenderPool(QuoteRenderer(PngEncoder()), workers=1)
+    yield render_pool
+    render_pool.shutdown()
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A plain JPEG to render onto."""
+    path = tmp_path / "source.jpg"
+    Image.new("RGB", (640, 480), "darkgreen").save(path)
+    return path
+
+
+class TestRenderPool:
+    """Test the RenderPool class."""
+
+    def test_render_in_worker(self, tmp_path, pool, source):
+        """Test that a worker renders to the requested path and size."""
+        output = tmp_path / "out.png"
+
+        result = pool.render(source, QUOTE, output_path=output, size=(800, 600))
+
+        assert result == str(output)
+        with Image.open(result) as image:
+            assert image.format == "PNG"
+            assert image.size == (800, 600)
+
+    def test_cached_renders_reused(self, tmp_path, pool, source):
+        """Test that workers share the on-disk render cache."""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+
+        futures = [
+            pool.submit(source, QUOTE, cache_dir=cache_dir, size=(320, 240))
+            for _ in range(3)
+        ]
+        paths = {future.result(timeout=60) for future in futures}
+
+        assert len(paths) == 1
+        assert paths.pop().endswith(".png")
+
+    def test_restart_after_shutdown(self, tmp_path, pool, source):
+        """Test that a shut down pool starts new workers for the next job."""
+        pool.render(source, QUOTE, output_path=tmp_path / "a.png", size=(320, 240))
+        pool.shutdown()
+
+        result = pool.render(source, QUOTE, output_path=tmp_path / "b.png", size=(320, 240))
+
+        assert result.endswith("b.png")
+
+    def test_timeout_drops_pool(self, tmp_path, pool, source):
+        """Test that a render past its timeout raises and frees the pool."""
+        with pytest.raises(TimeoutError):
+            # Starting a spawned worker alone takes longer than this
+            pool.render(source, QUOTE, output_path=tmp_path / "a.png", timeout=0.001)
+        assert pool._executor is None
+
+        result = pool.render(source, QUOTE, output_path=tmp_path / "b.png", size=(320, 240))
+        assert result.endswith("b.png")
+
+    def test_pool_size_is_bounded(self):
+        """Test that the worker count stays within limits."""
+        assert RenderPool(workers=1000).workers == MAX_WORKERS
+        assert RenderPool(workers=1).workers == 1
@@ -0,0 +1,123 @@
+"""
+Tests for provider health scoring and circuit breakers.
+"""
+
+import threading
+import time
+
+from unittest.mock import patch
+
+from paprwall.sources import SourceHealth, key_for
+
+FAST = "https://fast.example.com/a"
+SLOW = "https://slow.example.com/a"
+
+
+class TestSourceHealth:
+    """Test the SourceHealth class."""
+
+    def test_key_is_host(self):
+        """Test that URLs on the same host share a key."""
+        assert key_for("https://Picsum.photos/1920/1080") == "picsum.photos"
+        assert key_for("https://picsum.photos/200") == "picsum.photos"
+
+    def test_unknown_providers_keep_order(self):
+        """Test that providers without history keep the configured order."""
+        health = SourceHealth()
+
+        assert health.order([SLOW, FAST]) == [SLOW, FAST]
+
+    def test_order_by_score(self):
+        """Test that faster, more reliable providers come first."""
+        health = SourceHealth(failure_threshold=10)
+        health.record_success(SLOW, 3.0)
+        health.record_success(FAST, 0.2)
+
+        assert health.order([SLOW, FAST]) == [FAST, SLOW]
+
+        for _ in range(3):
+            health.record_failure(FAST)
+        assert health.order([SLOW, FAST]) == [SLOW, FAST]
+
+    def test_breaker_opens_after_consecutive_failures(self):
+        """Test that the breaker opens at the threshold and skips the provider."""
+        health = SourceHealth(failure_threshold=3)
+        health.record_failure(FAST)
+        health.record_failure(FAST)
+        assert not health.is_open(FAST)
+
+        health.record_failure(FAST)
+        assert health.is_open(FAST)
+        assert health.order([FAST, SLOW]) == [SLOW]
+
+    def test_success_resets_failures(self):
+        """Test that a success in between keeps the breaker closed."""
+        health = SourceHealth(failure_threshold=2)
+        health.record_failure(FAST)
+        health.record_success(FAST, 0.1)
+        health.record_failure(FAST)
+
+        assert not health.is_open(FAST)
+
+    def test_probe_after_cooldown(self):
+        """Test half-open probing: failure backs off, success closes."""
+        health = SourceHealth(failure_threshold=1, cooldown=10)
+        with patch("paprwall.sources.time.time", return_value=1000.0):
+            health.record_failure(FAST)
+        with patch("paprwall.sources.time.time", return_value=1005.0):
+            assert health.is_open(FAST)
+        with patch("paprwall.sources.time.time", return_value=1011.0):
+            assert not health.is_open(FAST)
+            # Failed probe doubles the cooldown
+            health.record_failure(FAST)
+        with patch("paprwall.sources.time.time", return_value=1025.0):
+            assert health.is_open(FAST)
+        with patch("paprwall.sources.time.time", return_value=1032.0):
+            assert not health.is_open(FAST)
+            health.record_success(FAST, 0.1)
+            assert not health.is_open(FAST)
+
+    def test_state_persists(self, tmp_path):
+        """Test that scores and breaker state survive a restart."""
+        path = tmp_path / "health.json"
+        health = SourceHealth(path, failure_threshold=1)
+        health.record_success(SLOW, 1.0)
+        health.record_failure(FAST)
+        health.save()
+
+        reloaded = SourceHealth(path, failure_threshold=1)
+
+        assert reloaded.is_open(FAST)
+        assert reloaded.score(SLOW) == health.score(SLOW)
+        assert reloaded.snapshot()["fast.example.com"]["success_rate"] == 0.0
+
+    def test_saves_are_batched_and_thread_safe(self, tmp_path):
+        """Test that concurrent results are written once, after a delay."""
+        path = tmp_path / "health.json"
+        health = SourceHealth(path, save_delay=0.2)
+
+        def record(i):
+            for _ in range(50):
+                health.record_success(f"https://host{i}.example.com/", 0.1)
+                health.record_failure(FAST)
+
+        threads = [threading.Thread(target=record, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not path.exists()
+
+        time.sleep(0.5)
+        reloaded = SourceHealth(path)
+        assert len(reloaded.snapshot()) == 5
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["health.json"]
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        """Test that an unreadable state file starts fresh."""
+        path = tmp_path / "health.json"
+        path.write_text("not json")
+
+        health = SourceHealth(path)
+
+        assert health.order([FAST]) == [FAST]
@@ -0,0 +1,84 @@
+"""
+Tests for the on-disk thumbnail cache.
+"""
+
+import os
+
+from PIL import Image
+
+from paprwall.thumbnails import ThumbnailCache
+
+
+def make_image(path, size=(1200, 800), color="teal"):
+    """Write a plain image to *path* and return it."""
+    Image.new("RGB", size, color).save(path)
+    return path
+
+
+class TestThumbnailCache:
+    """Test the ThumbnailCache class."""
+
+    def test_generated_once(self, tmp_path):
+        """Test that a thumbnail is made on first use and then served."""
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        source = make_image(tmp_path / "wall.jpg")
+
+        first = cache.get(source)
+        second = cache.get(source)
+
+        assert first == second
+        assert (cache.hits, cache.misses) == (1, 1)
+        with Image.open(first) as thumb:
+            assert thumb.format == "PNG"
+            assert thumb.size == (120, 80)
+
+    def test_put_from_decoded_image(self, tmp_path):
+        """Test storing a thumbnail from an image already in memory."""
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        source = make_image(tmp_path / "wall.jpg", size=(1600, 900))
+
+        stored = cache.put(source, Image.new("RGB", (1600, 900), "red"))
+
+        assert cache.lookup(source) == stored
+        with Image.open(stored) as thumb:
+            assert thumb.size == (120, 68)
+            assert thumb.getpixel((5, 5))[0] > 200
+
+    def test_changed_file_gets_new_thumbnail(self, tmp_path):
+        """Test that the key follows the file's content."""
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        source = make_image(tmp_path / "wall.png")
+        old = cache.get(source)
+
+        make_image(source, size=(300, 300), color="red")
+
+        assert cache.lookup(source) is None
+        assert cache.get(source) != old
+
+    def test_moved_file_keeps_thumbnail(self, tmp_path):
+        """Test that a render moved out of the spool still hits the cache."""
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        spool = tmp_path / "spool"
+        spool.mkdir()
+        source = make_image(spool / "wall.jpg")
+        stored = cache.put(source, Image.new("RGB", (1200, 800), "teal"))
+
+        moved = tmp_path / "wallpapers" / "wall.jpg"
+        moved.parent.mkdir()
+        os.replace(source, moved)
+        os.utime(moved, ns=(1, 1))
+
+        assert cache.lookup(moved) == stored
+
+    def test_prune_keeps_newest(self, tmp_path):
+        """Test that pruning removes the oldest thumbnails."""
+        cache = ThumbnailCache(tmp_path / "thumbs")
+        for i in range(4):
+            source = make_image(tmp_path / f"w{i}.png", (60, 40), (i * 60, 0, 0))
+            thumb = cache.get(source)
+            os.utime(thumb, (i, i))
+
+        assert cache.prune(max_entries=2) == 2
+        assert len(list(cache.directory.glob("*.png"))) == 2
+        assert cache.lookup(tmp_path / "w3.png") is not None
+        assert ThumbnailCache(tmp_path / "missing").prune() == 0